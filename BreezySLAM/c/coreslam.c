@@ -355,7 +355,9 @@ void
 
     int k = 0;
     
-    map->pixels = (pixel_t *)safe_malloc(npix * sizeof(pixel_t));
+    /* One spare pixel lets vector gathers read 32 bits at the last pixel */
+    map->pixels = (pixel_t *)safe_malloc((npix + 1) * sizeof(pixel_t));
+    map->pixels[npix] = 0;
     
     for (k=0; k<npix; ++k)
     {
@@ -384,6 +386,39 @@ void map_string(
             map.size_pixels, map.size_pixels, map.size_meters);
 }
 
+/* Scan point i (xp, yp) and the end of its ray (x2, y2) in map pixels; the ray runs
+   hole_width_mm / 2 past the point. map_update() and map_update_extent() both use
+   this, so an end point on a rounding boundary lands on the same pixel in each. */
+static inline void
+        ray_end_points(
+        map_t * map,
+        scan_t * scan,
+        int i,
+        position_t position,
+        double costheta,
+        double sintheta,
+        double hole_width_mm,
+        int * xp,
+        int * yp,
+        int * x2,
+        int * y2)
+{
+    double x2p = costheta * scan->x_mm[i] - sintheta * scan->y_mm[i];
+    double y2p = sintheta * scan->x_mm[i] + costheta * scan->y_mm[i];
+    
+    double dist = sqrt(x2p * x2p + y2p * y2p);
+    double add = hole_width_mm / 2 / dist;
+    
+    *xp = roundup((position.x_mm + x2p) * map->scale_pixels_per_mm);
+    *yp = roundup((position.y_mm + y2p) * map->scale_pixels_per_mm);
+    
+    x2p *= map->scale_pixels_per_mm * (1 + add);
+    y2p *= map->scale_pixels_per_mm * (1 + add);
+    
+    *x2 = roundup(position.x_mm * map->scale_pixels_per_mm + x2p);
+    *y2 = roundup(position.y_mm * map->scale_pixels_per_mm + y2p);
+}
+
 void
         map_update(
         map_t * map,
@@ -403,22 +438,10 @@ void
     int i = 0;
     for (i = 0; i != scan->npoints; i++)
     {        
-        double x2p = costheta * scan->x_mm[i] - sintheta * scan->y_mm[i];
-        double y2p = sintheta * scan->x_mm[i] + costheta * scan->y_mm[i];
-        
-        int xp = roundup((position.x_mm + x2p) * map->scale_pixels_per_mm);
-        int yp = roundup((position.y_mm + y2p) * map->scale_pixels_per_mm);
-        
-        double dist = sqrt(x2p * x2p + y2p * y2p);
-        double add = hole_width_mm / 2 / dist;
-        
-        x2p *= map->scale_pixels_per_mm * (1 + add);
-        y2p *= map->scale_pixels_per_mm * (1 + add);
+        int xp, yp, x2, y2;
+        ray_end_points(map, scan, i, position, costheta, sintheta, hole_width_mm, &xp, &yp, &x2, &y2);
         
         {  
-            int x2 = roundup(position.x_mm * map->scale_pixels_per_mm + x2p);
-            int y2 = roundup(position.y_mm * map->scale_pixels_per_mm + y2p);
-            
             int value = OBSTACLE;
             int q = map_quality;
             
@@ -433,6 +456,42 @@ void
     }
 }
 
+void
+        map_update_extent(
+        map_t * map,
+        scan_t * scan,
+        position_t position,
+        double hole_width_mm,
+        int extent[4])
+{
+    /* Same ray end points as map_update(); every ray pixel lies in their box */
+    double position_theta_radians = radians(position.theta_degrees);
+    double costheta = cos(position_theta_radians);
+    double sintheta = sin(position_theta_radians);
+    
+    int x1 = roundup(position.x_mm * map->scale_pixels_per_mm);
+    int y1 = roundup(position.y_mm * map->scale_pixels_per_mm);
+    
+    int xmin = x1, ymin = y1, xmax = x1, ymax = y1;
+    
+    int i = 0;
+    for (i = 0; i != scan->npoints; i++)
+    {        
+        int xp, yp, x2, y2;
+        ray_end_points(map, scan, i, position, costheta, sintheta, hole_width_mm, &xp, &yp, &x2, &y2);
+        
+        if (x2 < xmin) xmin = x2;
+        if (x2 > xmax) xmax = x2;
+        if (y2 < ymin) ymin = y2;
+        if (y2 > ymax) ymax = y2;
+    }
+    
+    extent[0] = xmin < 0 ? 0 : xmin;
+    extent[1] = ymin < 0 ? 0 : ymin;
+    extent[2] = xmax >= map->size_pixels ? map->size_pixels - 1 : xmax;
+    extent[3] = ymax >= map->size_pixels ? map->size_pixels - 1 : ymax;
+}
+
 void
         map_get(
         map_t * map,
@@ -459,6 +518,226 @@ void
     }
 }
 
+void
+        map_pyramid_init(
+        map_pyramid_t * pyramid,
+        map_t * map,
+        int nlevels)
+{
+    int size_pixels = map->size_pixels;
+    double scale_pixels_per_mm = map->scale_pixels_per_mm;
+    
+    int k = 0;
+    
+    pyramid->levels = (map_t *)safe_malloc(nlevels * sizeof(map_t));
+    pyramid->nlevels = nlevels;
+    
+    for (k=0; k<nlevels; ++k)
+    {
+        /* Halve the scale exactly, even when the finer size is odd */
+        size_pixels /= 2;
+        scale_pixels_per_mm /= 2;
+        
+        map_init(&pyramid->levels[k], size_pixels, size_pixels / (scale_pixels_per_mm * 1000));
+    }
+    
+    map_pyramid_update(pyramid, map, NULL);
+}
+
+void
+        map_pyramid_free(
+        map_pyramid_t * pyramid)
+{
+    int k = 0;
+    
+    for (k=0; k<pyramid->nlevels; ++k)
+    {
+        map_free(&pyramid->levels[k]);
+    }
+    
+    free(pyramid->levels);
+}
+
+void
+        map_pyramid_update(
+        map_pyramid_t * pyramid,
+        map_t * map,
+        int * extent)
+{
+    int xmin = 0;
+    int ymin = 0;
+    int xmax = map->size_pixels - 1;
+    int ymax = map->size_pixels - 1;
+    
+    map_t * fine = map;
+    
+    int k = 0;
+    
+    if (extent)
+    {
+        xmin = extent[0];
+        ymin = extent[1];
+        xmax = extent[2];
+        ymax = extent[3];
+    }
+    
+    for (k=0; k<pyramid->nlevels; ++k)
+    {
+        map_t * coarse = &pyramid->levels[k];
+        
+        int x = 0;
+        int y = 0;
+        
+        xmin /= 2;
+        ymin /= 2;
+        xmax = xmax / 2 < coarse->size_pixels ? xmax / 2 : coarse->size_pixels - 1;
+        ymax = ymax / 2 < coarse->size_pixels ? ymax / 2 : coarse->size_pixels - 1;
+        
+        /* Minimum of each 2x2 block of the finer level */
+        for (y=ymin; y<=ymax; ++y)
+        {
+            pixel_t * row0 = fine->pixels + 2 * y * fine->size_pixels;
+            pixel_t * row1 = row0 + fine->size_pixels;
+            pixel_t * out = coarse->pixels + y * coarse->size_pixels;
+            
+            for (x=xmin; x<=xmax; ++x)
+            {
+                pixel_t a = row0[2*x] < row0[2*x+1] ? row0[2*x] : row0[2*x+1];
+                pixel_t b = row1[2*x] < row1[2*x+1] ? row1[2*x] : row1[2*x+1];
+                
+                out[x] = a < b ? a : b;
+            }
+        }
+        
+        fine = coarse;
+    }
+}
+
+void
+        map_distance_field(
+        map_t * field,
+        map_t * map,
+        double falloff_mm,
+        int * extent)
+{
+    int size = map->size_pixels;
+    
+    /* Cost of one straight and one diagonal step away from a pixel */
+    int straight = (int)(NO_OBSTACLE / (falloff_mm * map->scale_pixels_per_mm) + 0.5);
+    int diagonal = 0;
+    int reach = 0;
+    
+    int xmin = 0;
+    int ymin = 0;
+    int xmax = size - 1;
+    int ymax = size - 1;
+    
+    int wxmin, wymin, wxmax, wymax, width, height;
+    int * cost = NULL;
+    int x = 0;
+    int y = 0;
+    
+    if (straight < 1)
+    {
+        straight = 1;
+    }
+    diagonal = (int)(straight * 1.41421356 + 0.5);
+    
+    /* No pixel's value can come from further away than this */
+    reach = NO_OBSTACLE / straight + 1;
+    
+    if (extent)
+    {
+        /* Pixels within reach of the changed ones may change, and depend on map
+           pixels up to another reach away */
+        xmin = extent[0] - reach < 0 ? 0 : extent[0] - reach;
+        ymin = extent[1] - reach < 0 ? 0 : extent[1] - reach;
+        xmax = extent[2] + reach >= size ? size - 1 : extent[2] + reach;
+        ymax = extent[3] + reach >= size ? size - 1 : extent[3] + reach;
+    }
+    
+    wxmin = xmin - reach < 0 ? 0 : xmin - reach;
+    wymin = ymin - reach < 0 ? 0 : ymin - reach;
+    wxmax = xmax + reach >= size ? size - 1 : xmax + reach;
+    wymax = ymax + reach >= size ? size - 1 : ymax + reach;
+    
+    width = wxmax - wxmin + 1;
+    height = wymax - wymin + 1;
+    
+    cost = (int *)safe_malloc(width * height * sizeof(int));
+    
+    for (y=0; y<height; ++y)
+    {
+        pixel_t * row = map->pixels + (wymin + y) * size + wxmin;
+        
+        for (x=0; x<width; ++x)
+        {
+            cost[y*width+x] = row[x];
+        }
+    }
+    
+    /* Two-pass chamfer transform of the map values: each pixel ends up with the
+       lowest map value plus step costs over the window, so walls keep their value
+       and cost rises linearly away from them */
+    for (y=0; y<height; ++y)
+    {
+        int * row = cost + y * width;
+        int * above = row - width;
+        
+        for (x=0; x<width; ++x)
+        {
+            int c = row[x];
+            
+            if (x > 0 && row[x-1] + straight < c) c = row[x-1] + straight;
+            
+            if (y > 0)
+            {
+                if (above[x] + straight < c) c = above[x] + straight;
+                if (x > 0 && above[x-1] + diagonal < c) c = above[x-1] + diagonal;
+                if (x < width-1 && above[x+1] + diagonal < c) c = above[x+1] + diagonal;
+            }
+            
+            row[x] = c;
+        }
+    }
+    
+    for (y=height-1; y>=0; --y)
+    {
+        int * row = cost + y * width;
+        int * below = row + width;
+        
+        for (x=width-1; x>=0; --x)
+        {
+            int c = row[x];
+            
+            if (x < width-1 && row[x+1] + straight < c) c = row[x+1] + straight;
+            
+            if (y < height-1)
+            {
+                if (below[x] + straight < c) c = below[x] + straight;
+                if (x < width-1 && below[x+1] + diagonal < c) c = below[x+1] + diagonal;
+                if (x > 0 && below[x-1] + diagonal < c) c = below[x-1] + diagonal;
+            }
+            
+            row[x] = c;
+        }
+    }
+    
+    /* Costs never exceed the map value they started from, so they fit a pixel */
+    for (y=ymin; y<=ymax; ++y)
+    {
+        int * row = cost + (y - wymin) * width - wxmin;
+        pixel_t * out = field->pixels + y * size;
+        
+        for (x=xmin; x<=xmax; ++x)
+        {
+            out[x] = (pixel_t)row[x];
+        }
+    }
+    
+    free(cost);
+}
+
 void scan_init(
     scan_t * scan, 
     int span,
@@ -491,9 +770,9 @@ void scan_init(
     interp->angle_distance_pairs = (angle_distance_pair_t *)safe_malloc(size*sizeof(angle_distance_pair_t));
     scan->interpolation = interp;
     
-    /* assure size multiple of 4 for SSE */
-    scan->obst_x_mm = float_alloc(size*span+4);
-    scan->obst_y_mm = float_alloc(size*span+4);
+    /* pad to a multiple of 8 for SSE, NEON and AVX2 */
+    scan->obst_x_mm = float_alloc(size*span+8);
+    scan->obst_y_mm = float_alloc(size*span+8);
 }
 
 
@@ -640,3 +919,49 @@ position_t
     
     return bestpos;
 }
+
+position_t
+        rmhc_position_search_multires(
+        position_t start_pos,
+        map_t * map,
+        map_pyramid_t * pyramid,
+        scan_t * scan,
+        double sigma_xy_mm,
+        double sigma_theta_degrees,
+        int * max_search_iters,
+        void * randomizer)
+{
+    position_t bestpos = start_pos;
+    
+    int start_distance = 0;
+    int best_distance = 0;
+    
+    int k = 0;
+    
+    /* Coarsest level first; each finer level refines the previous result with
+       half the search spread, matching its halved pixel size */
+    for (k=pyramid->nlevels-1; k>=0; --k)
+    {
+        bestpos = rmhc_position_search(bestpos, &pyramid->levels[k], scan,
+            sigma_xy_mm, sigma_theta_degrees, max_search_iters[pyramid->nlevels-1-k], randomizer);
+        
+        sigma_xy_mm *= 0.5;
+        sigma_theta_degrees *= 0.5;
+    }
+    
+    bestpos = rmhc_position_search(bestpos, map, scan,
+        sigma_xy_mm, sigma_theta_degrees, max_search_iters[pyramid->nlevels], randomizer);
+    
+    /* A coarse match can pull the search away from a start position that fits
+       the full map better; never return something worse than the start.
+       -1 indicates infinity. */
+    start_distance = distance_scan_to_map(map, scan, start_pos);
+    best_distance = distance_scan_to_map(map, scan, bestpos);
+    
+    if (start_distance > -1 && (best_distance < 0 || start_distance < best_distance))
+    {
+        return start_pos;
+    }
+    
+    return bestpos;
+}
@@ -52,6 +52,16 @@ typedef struct map_t {
     
 } map_t;
 
+/* Coarse copies of a map for multi-resolution search.  levels[k] has half the
+   resolution of levels[k-1] (levels[0] half that of the full map) and holds the
+   minimum of each 2x2 block, so obstacles (low values) survive downsampling. */
+typedef struct map_pyramid_t {
+
+    map_t * levels;
+    int nlevels;
+
+} map_pyramid_t;
+
 
 typedef struct scan_t
 {
@@ -152,6 +162,47 @@ void
 map_set(
     map_t * map, 
     char * bytes);
+
+/* Computes the rectangle of pixels (xmin, ymin, xmax, ymax, inclusive) that
+   map_update() can touch for this scan and position */
+void
+map_update_extent(
+    map_t * map,
+    scan_t * scan,
+    position_t position,
+    double hole_width_mm,
+    int extent[4]);
+
+void
+map_pyramid_init(
+    map_pyramid_t * pyramid,
+    map_t * map,
+    int nlevels);
+
+void
+map_pyramid_free(
+    map_pyramid_t * pyramid);
+
+/* Recomputes the coarse pixels covering extent (full-resolution pixels, as from
+   map_update_extent); pass NULL to rebuild the whole pyramid */
+void
+map_pyramid_update(
+    map_pyramid_t * pyramid,
+    map_t * map,
+    int * extent);
+
+/* Distance-transform field of a map, for smoother scan matching: each pixel gets
+   the lowest value of map pixel + cost of the distance to it, where the cost
+   rises from OBSTACLE to NO_OBSTACLE over falloff_mm.  Walls keep their value and
+   cost rises linearly away from them.  field must be the same size as map.
+   Recomputes what changed inside extent (as from map_update_extent); pass NULL to
+   recompute the whole field.  Two passes, linear in the pixels covered. */
+void
+map_distance_field(
+    map_t * field,
+    map_t * map,
+    double falloff_mm,
+    int * extent);
     
 /* Returns -1 for infinity */
 int 
@@ -160,6 +211,23 @@ distance_scan_to_map(
     scan_t * scan,
     position_t position);
 
+/* Name of the distance_scan_to_map() implementation in use, e.g. "avx2", "sse3",
+   "scalar", or "neon".  x86 builds pick the fastest one the CPU supports. */
+const char *
+distance_scan_to_map_backend(void);
+
+/* Fills names with up to max_names implementations usable on this CPU, fastest
+   first, and returns how many there are */
+int 
+distance_scan_to_map_backends(
+    const char ** names,
+    int max_names);
+
+/* Switches to the named implementation; returns 0 if it is not available */
+int 
+distance_scan_to_map_use_backend(
+    const char * name);
+
 
 /* Random-Mutation Hill-Climbing search */
 position_t 
@@ -172,6 +240,59 @@ rmhc_position_search(
 	int max_search_iter,
 	void * randomizer);
 
+/* Coarse-to-fine RMHC: searches the coarsest pyramid level first and refines the
+   result on each finer level, halving the sigmas at each step.  max_search_iters
+   holds nlevels+1 counts, coarsest level first and the full map last. */
+position_t 
+rmhc_position_search_multires(
+    position_t start_pos,
+    map_t * map,
+    map_pyramid_t * pyramid,
+    scan_t * scan,
+    double sigma_xy_mm,
+    double sigma_theta_degrees,
+    int * max_search_iters,
+    void * randomizer);
+
+/* Multi-start RMHC: runs nchains independent searches from start_pos, one per
+   randomizer, on native threads and returns the position with the lowest
+   distance.  Implemented in coreslam_parallel.c. */
+position_t 
+rmhc_position_search_parallel(
+    position_t start_pos,
+    map_t * map,
+    scan_t * scan,
+    double sigma_xy_mm,
+    double sigma_theta_degrees,
+    int max_search_iter,
+    void ** randomizers,
+    int nchains);
+
+/* Scores nposes poses, stored as consecutive (x_mm, y_mm, theta_degrees)
+   triples, writing distance_scan_to_map() of each to distances.  Splits the
+   poses across nthreads native threads.  Implemented in coreslam_parallel.c. */
+void
+distance_scan_to_map_batch(
+    map_t * map,
+    scan_t * scan,
+    const double * poses,
+    int nposes,
+    int * distances,
+    int nthreads);
+
+/* Deterministic correlative matching: scores every heading in start +/-
+   window_theta_degrees at step_theta_degrees and every whole-pixel translation
+   within window_xy_mm, then refines around the winner at a quarter of the step.
+   Implemented in coreslam_correlative.c. */
+position_t 
+correlative_position_search(
+    position_t start_pos,
+    map_t * map,
+    scan_t * scan,
+    double window_xy_mm,
+    double window_theta_degrees,
+    double step_theta_degrees);
+
 #ifdef __cplusplus 
 }
 #endif
@@ -26,6 +26,7 @@ typedef __int64 int64_t;       /* Define it from MSVC's internal type */
 
 #include <math.h>
 #include <stdio.h>
+#include <string.h>
 
 #include <arm_neon.h>
 
@@ -115,3 +116,32 @@ distance_scan_to_map(
 
     return npoints ? (int)(sum * 1024 / npoints) : -1;  
 }
+
+/* Single implementation: no run-time choice to make */
+
+const char *
+distance_scan_to_map_backend(void)
+{
+    return "neon";
+}
+
+int 
+distance_scan_to_map_backends(
+    const char ** names,
+    int max_names)
+{
+    if (max_names < 1)
+    {
+        return 0;
+    }
+
+    names[0] = "neon";
+    return 1;
+}
+
+int 
+distance_scan_to_map_use_backend(
+    const char * name)
+{
+    return !strcmp(name, "neon");
+}
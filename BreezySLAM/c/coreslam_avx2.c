@@ -0,0 +1,128 @@
+/*
+coreslam_avx2.c Intel AVX2 / FMA distance_scan_to_map for CoreSLAM
+
+Rotates and translates eight obstacle points per iteration with fused
+multiply-adds and fetches their map pixels with one masked gather.  Compiled
+into the x86 build with a function-level target, and only called by the
+dispatcher in coreslam_i686.c after the CPU reports AVX2 and FMA.
+
+Copyright (C) 2014 Simon D. Levy
+
+This code is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as 
+published by the Free Software Foundation, either version 3 of the 
+License, or (at your option) any later version.
+
+This code is distributed in the hope that it will be useful,     
+but WITHOUT ANY WARRANTY without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License 
+along with this code.  If not, see <http:#www.gnu.org/licenses/>.
+
+*/
+
+
+#ifdef _MSC_VER
+typedef __int64 int64_t;       /* Define it from MSVC's internal type */
+#else
+#include <stdint.h>            /* Use the C99 official header */
+#endif
+
+#include <math.h>
+
+#include "coreslam.h"
+#include "coreslam_internals.h"
+
+#if defined(__GNUC__) && (defined(__x86_64__) || defined(__i386__))
+
+#include <immintrin.h>
+
+__attribute__((target("avx2,fma")))
+int 
+distance_scan_to_map_avx2(
+    map_t *  map,
+    scan_t * scan,
+    position_t position)
+{    
+    /* Pre-compute sine and cosine of angle for rotation */
+    double position_theta_radians = radians(position.theta_degrees);
+    double costheta = cos(position_theta_radians) * map->scale_pixels_per_mm;
+    double sintheta = sin(position_theta_radians) * map->scale_pixels_per_mm;
+    
+    /* Pre-compute pixel offset for translation, with the 0.5 for rounding folded in */
+    double pos_x_pix = position.x_mm * map->scale_pixels_per_mm + 0.5;
+    double pos_y_pix = position.y_mm * map->scale_pixels_per_mm + 0.5;
+
+    __m256 costheta_8  = _mm256_set1_ps((float)costheta);
+    __m256 sintheta_8  = _mm256_set1_ps((float)sintheta);
+    __m256 nsintheta_8 = _mm256_set1_ps((float)-sintheta);
+    __m256 pos_x_8     = _mm256_set1_ps((float)pos_x_pix);
+    __m256 pos_y_8     = _mm256_set1_ps((float)pos_y_pix);
+
+    __m256i size_8     = _mm256_set1_epi32(map->size_pixels);
+    __m256i minus1_8   = _mm256_set1_epi32(-1);
+    __m256i lowhalf_8  = _mm256_set1_epi32(0xFFFF);
+    __m256i lane_8     = _mm256_setr_epi32(0, 1, 2, 3, 4, 5, 6, 7);
+    __m256i npoints_8  = _mm256_set1_epi32(scan->obst_npoints);
+
+    /* Per-lane sums stay below 2^32 for any scan of fewer than 500k points */
+    __m256i sum_8      = _mm256_setzero_si256();
+    __m256i count_8    = _mm256_setzero_si256();
+
+    /* Stride by 8 over obstacle points in scan; the arrays are padded so the
+       last load stays in bounds, and lanes past the end are masked off */
+    int i = 0;
+    for (i=0; i<scan->obst_npoints; i+=8) 
+    {        
+        __m256 scan_x_8 = _mm256_loadu_ps(&scan->obst_x_mm[i]); 
+        __m256 scan_y_8 = _mm256_loadu_ps(&scan->obst_y_mm[i]); 
+
+        /* Rotate and translate: x' = cos*x - sin*y + px, y' = sin*x + cos*y + py */
+        __m256 x_8 = _mm256_fmadd_ps(costheta_8, scan_x_8, _mm256_fmadd_ps(nsintheta_8, scan_y_8, pos_x_8));
+        __m256 y_8 = _mm256_fmadd_ps(sintheta_8, scan_x_8, _mm256_fmadd_ps(costheta_8, scan_y_8, pos_y_8));
+
+        __m256i ix_8 = _mm256_cvttps_epi32(_mm256_floor_ps(x_8));
+        __m256i iy_8 = _mm256_cvttps_epi32(_mm256_floor_ps(y_8));
+
+        /* Keep lanes that are real points and fall inside the map */
+        __m256i valid_8 = _mm256_cmpgt_epi32(npoints_8, _mm256_add_epi32(lane_8, _mm256_set1_epi32(i)));
+        valid_8 = _mm256_and_si256(valid_8, _mm256_cmpgt_epi32(ix_8, minus1_8));
+        valid_8 = _mm256_and_si256(valid_8, _mm256_cmpgt_epi32(iy_8, minus1_8));
+        valid_8 = _mm256_and_si256(valid_8, _mm256_cmpgt_epi32(size_8, ix_8));
+        valid_8 = _mm256_and_si256(valid_8, _mm256_cmpgt_epi32(size_8, iy_8));
+
+        /* Gather 32 bits at each 16-bit pixel and keep the low half; map_init()
+           pads the pixels so the last one can be read this way */
+        __m256i index_8 = _mm256_add_epi32(_mm256_mullo_epi32(iy_8, size_8), ix_8);
+        index_8 = _mm256_and_si256(index_8, valid_8);
+
+        __m256i pixels_8 = _mm256_mask_i32gather_epi32(
+            _mm256_setzero_si256(), (const int *)map->pixels, index_8, valid_8, sizeof(pixel_t));
+        pixels_8 = _mm256_and_si256(pixels_8, lowhalf_8);
+
+        sum_8 = _mm256_add_epi32(sum_8, pixels_8);
+        count_8 = _mm256_sub_epi32(count_8, valid_8);
+    }
+
+    uint32_t sums[8];
+    int counts[8];
+    _mm256_storeu_si256((__m256i *)sums, sum_8);
+    _mm256_storeu_si256((__m256i *)counts, count_8);
+
+    int64_t sum = 0;  /* sum of map values at those points */
+    int npoints = 0;  /* number of points where scan matches map */
+
+    int k = 0;
+    for (k=0; k<8; ++k)
+    {
+        sum += sums[k];
+        npoints += counts[k];
+    }
+
+    /* Return sum scaled by number of points, or -1 if none */
+    return npoints ? (int)(sum * 1024 / npoints) : -1;  
+}
+
+#endif
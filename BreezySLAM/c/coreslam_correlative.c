@@ -0,0 +1,259 @@
+/*
+coreslam_correlative.c Deterministic correlative scan matching
+
+Scores every pose on a regular grid around a start position and returns the best
+one.  For each candidate heading the obstacle points of the scan are rotated and
+rounded to pixel offsets once; every translation in the window then costs one
+table lookup per point.  Same score as distance_scan_to_map(): mean map value
+under the obstacle points, lower is better.
+
+Copyright (C) 2014 Simon D. Levy
+
+This code is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+This code is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this code.  If not, see <http:#www.gnu.org/licenses/>.
+*/
+
+#include <math.h>
+#include <stdlib.h>
+#include <stdio.h>
+
+#include "coreslam.h"
+#include "coreslam_internals.h"
+
+#ifndef INT64_MAX
+#define INT64_MAX 0x7FFFFFFFFFFFFFFFLL
+#endif
+
+typedef struct correlative_best_t
+{
+    int64_t sum;
+    int npoints;
+    int dx;
+    int dy;
+    double theta_degrees;
+
+} correlative_best_t;
+
+/* Is sum/npoints lower than the best so far?  Cross-multiplied to stay exact. */
+static int better(int64_t sum, int npoints, correlative_best_t * best)
+{
+    return npoints && (!best->npoints || sum * best->npoints < best->sum * npoints);
+}
+
+/* Rotates the obstacle points by theta and rounds them to map pixels around the
+   start position; returns how many points were written */
+static int rotate_points(
+    map_t * map,
+    scan_t * scan,
+    position_t start_pos,
+    double theta_degrees,
+    int * px,
+    int * py,
+    int * bounds)
+{
+    double theta_radians = radians(theta_degrees);
+    double costheta = cos(theta_radians) * map->scale_pixels_per_mm;
+    double sintheta = sin(theta_radians) * map->scale_pixels_per_mm;
+
+    double pos_x_pix = start_pos.x_mm * map->scale_pixels_per_mm;
+    double pos_y_pix = start_pos.y_mm * map->scale_pixels_per_mm;
+
+    int n = 0;
+    int i = 0;
+
+    for (i=0; i<scan->npoints; ++i)
+    {
+        if (scan->value[i] == OBSTACLE)
+        {
+            int x = (int)floor(pos_x_pix + costheta * scan->x_mm[i] - sintheta * scan->y_mm[i] + 0.5);
+            int y = (int)floor(pos_y_pix + sintheta * scan->x_mm[i] + costheta * scan->y_mm[i] + 0.5);
+
+            if (!n || x < bounds[0]) bounds[0] = x;
+            if (!n || y < bounds[1]) bounds[1] = y;
+            if (!n || x > bounds[2]) bounds[2] = x;
+            if (!n || y > bounds[3]) bounds[3] = y;
+
+            px[n] = x;
+            py[n] = y;
+            n++;
+        }
+    }
+
+    return n;
+}
+
+/* Scores every translation in [-window, window]^2 pixels for one rotated point set */
+static void search_translations(
+    map_t * map,
+    int * px,
+    int * py,
+    int n,
+    int * bounds,
+    int window,
+    double theta_degrees,
+    correlative_best_t * best)
+{
+    int size = map->size_pixels;
+    int dx = 0;
+    int dy = 0;
+    int i = 0;
+
+    /* When the whole window keeps every point on the map, the point count is
+       fixed and a candidate can be dropped as soon as its partial sum reaches
+       the best full sum */
+    int inside = bounds[0] - window >= 0 && bounds[1] - window >= 0 &&
+                 bounds[2] + window < size && bounds[3] + window < size;
+
+    for (dy=-window; dy<=window; ++dy)
+    {
+        for (dx=-window; dx<=window; ++dx)
+        {
+            int64_t sum = 0;
+            int npoints = 0;
+
+            if (inside)
+            {
+                int64_t limit = (best->npoints == n) ? best->sum : INT64_MAX;
+
+                pixel_t * origin = map->pixels + dy * size + dx;
+
+                for (i=0; i<n && sum<limit; ++i)
+                {
+                    sum += origin[py[i] * size + px[i]];
+                }
+
+                if (i < n)
+                {
+                    continue;
+                }
+
+                npoints = n;
+            }
+            else
+            {
+                for (i=0; i<n; ++i)
+                {
+                    int x = px[i] + dx;
+                    int y = py[i] + dy;
+
+                    if (x >= 0 && x < size && y >= 0 && y < size)
+                    {
+                        sum += map->pixels[y * size + x];
+                        npoints++;
+                    }
+                }
+            }
+
+            if (better(sum, npoints, best))
+            {
+                best->sum = sum;
+                best->npoints = npoints;
+                best->dx = dx;
+                best->dy = dy;
+                best->theta_degrees = theta_degrees;
+            }
+        }
+    }
+}
+
+static void search_angles(
+    map_t * map,
+    scan_t * scan,
+    position_t start_pos,
+    double theta_min_degrees,
+    double theta_max_degrees,
+    double step_theta_degrees,
+    int window,
+    int * px,
+    int * py,
+    correlative_best_t * best)
+{
+    int nangles = (int)floor((theta_max_degrees - theta_min_degrees) / step_theta_degrees + 1e-9) + 1;
+    int k = 0;
+
+    for (k=0; k<nangles; ++k)
+    {
+        double theta_degrees = theta_min_degrees + k * step_theta_degrees;
+        int bounds[4];
+
+        int n = rotate_points(map, scan, start_pos, theta_degrees, px, py, bounds);
+
+        if (n)
+        {
+            search_translations(map, px, py, n, bounds, window, theta_degrees, best);
+        }
+    }
+}
+
+position_t
+        correlative_position_search(
+        position_t start_pos,
+        map_t * map,
+        scan_t * scan,
+        double window_xy_mm,
+        double window_theta_degrees,
+        double step_theta_degrees)
+{
+    position_t bestpos = start_pos;
+
+    correlative_best_t best = {0, 0, 0, 0, start_pos.theta_degrees};
+
+    int window = (int)floor(window_xy_mm * map->scale_pixels_per_mm + 0.5);
+
+    int * px = NULL;
+    int * py = NULL;
+
+    if (scan->npoints == 0 || step_theta_degrees <= 0)
+    {
+        return start_pos;
+    }
+
+    px = int_alloc(scan->npoints);
+    py = int_alloc(scan->npoints);
+
+    /* Coarse pass over the whole window */
+    search_angles(map, scan, start_pos,
+        start_pos.theta_degrees - window_theta_degrees,
+        start_pos.theta_degrees + window_theta_degrees,
+        step_theta_degrees, window, px, py, &best);
+
+    /* Fine pass: quarter-step headings around the best coarse heading, one pixel
+       of slack around its translation */
+    if (best.npoints)
+    {
+        position_t refine_pos = start_pos;
+        double theta_degrees = best.theta_degrees;
+
+        refine_pos.x_mm += best.dx / map->scale_pixels_per_mm;
+        refine_pos.y_mm += best.dy / map->scale_pixels_per_mm;
+
+        /* Re-score the coarse winner from the refine origin so the passes compare alike */
+        best.npoints = 0;
+        best.dx = 0;
+        best.dy = 0;
+
+        search_angles(map, scan, refine_pos,
+            theta_degrees - step_theta_degrees,
+            theta_degrees + step_theta_degrees,
+            step_theta_degrees / 4, 1, px, py, &best);
+
+        bestpos.x_mm = refine_pos.x_mm + best.dx / map->scale_pixels_per_mm;
+        bestpos.y_mm = refine_pos.y_mm + best.dy / map->scale_pixels_per_mm;
+        bestpos.theta_degrees = best.theta_degrees;
+    }
+
+    free(px);
+    free(py);
+
+    return bestpos;
+}
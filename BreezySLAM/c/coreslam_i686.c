@@ -37,6 +37,7 @@ typedef __int64 int64_t;       /* Define it from MSVC's internal type */
 #endif
 
 #include <math.h>
+#include <string.h>
 
 #include "coreslam.h"
 #include "coreslam_internals.h"
@@ -45,6 +46,17 @@ typedef __int64 int64_t;       /* Define it from MSVC's internal type */
 #include <xmmintrin.h>
 #include <mmintrin.h>
 
+/* The SSE3 and AVX2 versions are compiled for their instruction sets function by
+   function, so the rest of the module runs on any x86 CPU and the best version
+   is chosen at run time */
+#if defined(__GNUC__)
+#define SSE3_TARGET __attribute__((target("sse3")))
+#define HAVE_AVX2_BACKEND
+int distance_scan_to_map_avx2(map_t * map, scan_t * scan, position_t position);
+#else
+#define SSE3_TARGET
+#endif
+
 /* This structure supports extracting two 32-bit integer coordinates from a 64-bit register */
 typedef union 
 {
@@ -60,8 +72,9 @@ typedef union
 } cs_pos_mmx_t;
 
 
-int 
-distance_scan_to_map(
+SSE3_TARGET
+static int 
+distance_scan_to_map_sse3(
     map_t *  map,
     scan_t * scan,
     position_t position)
@@ -115,3 +128,165 @@ distance_scan_to_map(
     return npoints ? (int)(sum * 1024 / npoints) : -1;  
 }
 
+/* Portable fallback, as in coreslam_sisd.c */
+static int 
+distance_scan_to_map_scalar(
+    map_t *  map,
+    scan_t * scan,
+    position_t position)
+{    
+    /* Pre-compute sine and cosine of angle for rotation */
+    double position_theta_radians = radians(position.theta_degrees);
+    double costheta = cos(position_theta_radians) * map->scale_pixels_per_mm;
+    double sintheta = sin(position_theta_radians) * map->scale_pixels_per_mm;
+    
+    /* Pre-compute pixel offset for translation */
+    double pos_x_pix = position.x_mm * map->scale_pixels_per_mm;
+    double pos_y_pix = position.y_mm * map->scale_pixels_per_mm;
+
+    int64_t sum = 0; /* sum of map values at those points */
+    int npoints = 0; /* number of points where scan matches map */
+    
+    int i = 0;
+    for (i=0; i<scan->npoints; i++) 
+    {        
+        /* Consider only scan points representing obstacles */
+        if (scan->value[i] == OBSTACLE)
+        {
+            /* Translate and rotate scan point to robot position */
+            int x = floor(pos_x_pix + costheta * scan->x_mm[i] - sintheta * scan->y_mm[i] + 0.5);
+            int y = floor(pos_y_pix + sintheta * scan->x_mm[i] + costheta * scan->y_mm[i] + 0.5);
+         
+            /* Add point if in map bounds */
+            if (x >= 0 && x < map->size_pixels && y >= 0 && y < map->size_pixels) 
+            {
+                sum += map->pixels[y * map->size_pixels + x];
+                npoints++;
+            } 
+        }
+    } 
+
+    /* Return sum scaled by number of points, or -1 if none */
+    return npoints ? (int)(sum * 1024 / npoints) : -1;  
+}
+
+/* Run-time dispatch ---------------------------------------------------------*/
+
+typedef int (*distance_function_t)(map_t *, scan_t *, position_t);
+
+typedef struct distance_backend_t
+{
+    const char * name;
+    distance_function_t function;
+
+} distance_backend_t;
+
+/* Fastest first */
+static const distance_backend_t BACKENDS[] = 
+{
+#ifdef HAVE_AVX2_BACKEND
+    {"avx2",   distance_scan_to_map_avx2},
+#endif
+    {"sse3",   distance_scan_to_map_sse3},
+    {"scalar", distance_scan_to_map_scalar},
+};
+
+static const int NBACKENDS = sizeof(BACKENDS) / sizeof(BACKENDS[0]);
+
+/* Chosen on first use; a racing first call picks the same entry */
+static const distance_backend_t * active_backend = NULL;
+
+static int cpu_supports(const char * name)
+{
+#if defined(__GNUC__)
+    if (!strcmp(name, "avx2"))
+    {
+        return __builtin_cpu_supports("avx2") && __builtin_cpu_supports("fma");
+    }
+    if (!strcmp(name, "sse3"))
+    {
+        return __builtin_cpu_supports("sse3");
+    }
+#else
+    if (!strcmp(name, "avx2"))
+    {
+        return 0;
+    }
+#endif
+    return 1;
+}
+
+static const distance_backend_t * best_backend(void)
+{
+    int k = 0;
+    for (k=0; k<NBACKENDS; ++k)
+    {
+        if (cpu_supports(BACKENDS[k].name))
+        {
+            return &BACKENDS[k];
+        }
+    }
+    return &BACKENDS[NBACKENDS-1];
+}
+
+int 
+distance_scan_to_map(
+    map_t *  map,
+    scan_t * scan,
+    position_t position)
+{
+    if (!active_backend)
+    {
+        active_backend = best_backend();
+    }
+
+    return active_backend->function(map, scan, position);
+}
+
+const char *
+distance_scan_to_map_backend(void)
+{
+    if (!active_backend)
+    {
+        active_backend = best_backend();
+    }
+
+    return active_backend->name;
+}
+
+int 
+distance_scan_to_map_backends(
+    const char ** names,
+    int max_names)
+{
+    int count = 0;
+    int k = 0;
+
+    for (k=0; k<NBACKENDS && count<max_names; ++k)
+    {
+        if (cpu_supports(BACKENDS[k].name))
+        {
+            names[count++] = BACKENDS[k].name;
+        }
+    }
+
+    return count;
+}
+
+int 
+distance_scan_to_map_use_backend(
+    const char * name)
+{
+    int k = 0;
+
+    for (k=0; k<NBACKENDS; ++k)
+    {
+        if (!strcmp(name, BACKENDS[k].name) && cpu_supports(name))
+        {
+            active_backend = &BACKENDS[k];
+            return 1;
+        }
+    }
+
+    return 0;
+}
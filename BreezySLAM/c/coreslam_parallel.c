@@ -0,0 +1,307 @@
+/*
+coreslam_parallel.c Multi-start Random-Mutation Hill-Climbing search and batch
+pose scoring on native threads
+
+Runs several independent RMHC chains from the same start position, each with its
+own random-number generator, and keeps the position that best matches the map;
+also scores many poses against the map in one call, split across threads.
+The map and scan are only read, so the workers need no locking.
+
+Copyright (C) 2014 Simon D. Levy
+
+This code is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+This code is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this code.  If not, see <http:#www.gnu.org/licenses/>.
+*/
+
+#include <stdlib.h>
+#include <stdio.h>
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <pthread.h>
+#endif
+
+#include "coreslam.h"
+
+typedef struct rmhc_chain_t
+{
+    position_t start_pos;
+    map_t * map;
+    scan_t * scan;
+    double sigma_xy_mm;
+    double sigma_theta_degrees;
+    int max_search_iter;
+    void * randomizer;
+
+    position_t bestpos;
+    int distance;
+
+} rmhc_chain_t;
+
+typedef struct batch_slice_t
+{
+    map_t * map;
+    scan_t * scan;
+    const double * poses;
+    int * distances;
+    int nposes;
+
+} batch_slice_t;
+
+static void run_chain(void * arg)
+{
+    rmhc_chain_t * chain = (rmhc_chain_t *)arg;
+
+    chain->bestpos = rmhc_position_search(
+        chain->start_pos,
+        chain->map,
+        chain->scan,
+        chain->sigma_xy_mm,
+        chain->sigma_theta_degrees,
+        chain->max_search_iter,
+        chain->randomizer);
+
+    chain->distance = distance_scan_to_map(chain->map, chain->scan, chain->bestpos);
+}
+
+static void run_slice(void * arg)
+{
+    batch_slice_t * slice = (batch_slice_t *)arg;
+
+    int k = 0;
+    for (k=0; k<slice->nposes; ++k)
+    {
+        position_t position;
+        position.x_mm = slice->poses[3*k];
+        position.y_mm = slice->poses[3*k+1];
+        position.theta_degrees = slice->poses[3*k+2];
+
+        slice->distances[k] = distance_scan_to_map(slice->map, slice->scan, position);
+    }
+}
+
+/* A unit of work for a native thread */
+typedef struct worker_t
+{
+    void (*run)(void *);
+    void * arg;
+
+} worker_t;
+
+#ifdef _WIN32
+
+typedef HANDLE worker_thread_t;
+
+static DWORD WINAPI worker_thread_main(LPVOID arg)
+{
+    worker_t * worker = (worker_t *)arg;
+    worker->run(worker->arg);
+    return 0;
+}
+
+static int worker_thread_start(worker_thread_t * thread, worker_t * worker)
+{
+    *thread = CreateThread(NULL, 0, worker_thread_main, worker, 0, NULL);
+    return *thread != NULL;
+}
+
+static void worker_thread_join(worker_thread_t thread)
+{
+    WaitForSingleObject(thread, INFINITE);
+    CloseHandle(thread);
+}
+
+#else
+
+typedef pthread_t worker_thread_t;
+
+static void * worker_thread_main(void * arg)
+{
+    worker_t * worker = (worker_t *)arg;
+    worker->run(worker->arg);
+    return NULL;
+}
+
+static int worker_thread_start(worker_thread_t * thread, worker_t * worker)
+{
+    return pthread_create(thread, NULL, worker_thread_main, worker) == 0;
+}
+
+static void worker_thread_join(worker_thread_t thread)
+{
+    pthread_join(thread, NULL);
+}
+
+#endif
+
+/* Runs workers[1..n-1] on their own threads and workers[0] on the calling thread;
+   a worker whose thread can't be started runs there too, so results never depend
+   on thread limits */
+static void run_workers(worker_t * workers, int nworkers)
+{
+    worker_thread_t * threads = (worker_thread_t *)calloc(nworkers, sizeof(worker_thread_t));
+    int * started = (int *)calloc(nworkers, sizeof(int));
+    int k = 0;
+
+    if (!threads || !started)
+    {
+        fprintf(stderr, "run_workers: unable to allocate %d workers\n", nworkers);
+        exit(1);
+    }
+
+    for (k=1; k<nworkers; ++k)
+    {
+        started[k] = worker_thread_start(&threads[k], &workers[k]);
+    }
+
+    workers[0].run(workers[0].arg);
+
+    for (k=1; k<nworkers; ++k)
+    {
+        if (started[k])
+        {
+            worker_thread_join(threads[k]);
+        }
+        else
+        {
+            workers[k].run(workers[k].arg);
+        }
+    }
+
+    free(threads);
+    free(started);
+}
+
+position_t
+        rmhc_position_search_parallel(
+        position_t start_pos,
+        map_t * map,
+        scan_t * scan,
+        double sigma_xy_mm,
+        double sigma_theta_degrees,
+        int max_search_iter,
+        void ** randomizers,
+        int nchains)
+{
+    rmhc_chain_t * chains = NULL;
+    worker_t * workers = NULL;
+    position_t bestpos = start_pos;
+    int lowest_distance = -1;
+    int k = 0;
+
+    if (nchains < 2)
+    {
+        return rmhc_position_search(start_pos, map, scan,
+            sigma_xy_mm, sigma_theta_degrees, max_search_iter, randomizers[0]);
+    }
+
+    chains = (rmhc_chain_t *)calloc(nchains, sizeof(rmhc_chain_t));
+    workers = (worker_t *)calloc(nchains, sizeof(worker_t));
+
+    if (!chains || !workers)
+    {
+        fprintf(stderr, "rmhc_position_search_parallel: unable to allocate %d chains\n", nchains);
+        exit(1);
+    }
+
+    for (k=0; k<nchains; ++k)
+    {
+        chains[k].start_pos = start_pos;
+        chains[k].map = map;
+        chains[k].scan = scan;
+        chains[k].sigma_xy_mm = sigma_xy_mm;
+        chains[k].sigma_theta_degrees = sigma_theta_degrees;
+        chains[k].max_search_iter = max_search_iter;
+        chains[k].randomizer = randomizers[k];
+
+        workers[k].run = run_chain;
+        workers[k].arg = &chains[k];
+    }
+
+    run_workers(workers, nchains);
+
+    /* Lowest distance wins; ties go to the lower chain index so results are
+       reproducible for a given set of seeds. -1 indicates infinity. */
+    for (k=0; k<nchains; ++k)
+    {
+        if (chains[k].distance > -1 && (lowest_distance < 0 || chains[k].distance < lowest_distance))
+        {
+            lowest_distance = chains[k].distance;
+            bestpos = chains[k].bestpos;
+        }
+    }
+
+    free(chains);
+    free(workers);
+
+    return bestpos;
+}
+
+void
+        distance_scan_to_map_batch(
+        map_t * map,
+        scan_t * scan,
+        const double * poses,
+        int nposes,
+        int * distances,
+        int nthreads)
+{
+    batch_slice_t * slices = NULL;
+    worker_t * workers = NULL;
+    int first = 0;
+    int k = 0;
+
+    if (nthreads > nposes)
+    {
+        nthreads = nposes;
+    }
+
+    if (nthreads < 2)
+    {
+        batch_slice_t slice = {map, scan, poses, distances, nposes};
+        run_slice(&slice);
+        return;
+    }
+
+    slices = (batch_slice_t *)calloc(nthreads, sizeof(batch_slice_t));
+    workers = (worker_t *)calloc(nthreads, sizeof(worker_t));
+
+    if (!slices || !workers)
+    {
+        fprintf(stderr, "distance_scan_to_map_batch: unable to allocate %d slices\n", nthreads);
+        exit(1);
+    }
+
+    /* Contiguous slices whose sizes differ by at most one pose */
+    for (k=0; k<nthreads; ++k)
+    {
+        int count = nposes / nthreads + (k < nposes % nthreads);
+
+        slices[k].map = map;
+        slices[k].scan = scan;
+        slices[k].poses = poses + 3 * first;
+        slices[k].distances = distances + first;
+        slices[k].nposes = count;
+
+        workers[k].run = run_slice;
+        workers[k].arg = &slices[k];
+
+        first += count;
+    }
+
+    run_workers(workers, nthreads);
+
+    free(slices);
+    free(workers);
+}
@@ -24,6 +24,7 @@ along with this code.  If not, see <http:#www.gnu.org/licenses/>.
 #include <math.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include <string.h>
 
 #include "coreslam.h"
 #include "coreslam_internals.h"
@@ -68,3 +69,32 @@ distance_scan_to_map(
     /* Return sum scaled by number of points, or -1 if none */
     return npoints ? (int)(sum * 1024 / npoints) : -1;  
 }
+
+/* Single implementation: no run-time choice to make */
+
+const char *
+distance_scan_to_map_backend(void)
+{
+    return "scalar";
+}
+
+int 
+distance_scan_to_map_backends(
+    const char ** names,
+    int max_names)
+{
+    if (max_names < 1)
+    {
+        return 0;
+    }
+
+    names[0] = "scalar";
+    return 1;
+}
+
+int 
+distance_scan_to_map_use_backend(
+    const char * name)
+{
+    return !strcmp(name, "scalar");
+}
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+'''
+bench_correlative.py : Compares RMHC search with the deterministic correlative scan
+                       matcher on the Paris Mines Tech logs, reporting wall time, the
+                       spread of per-scan search time, and how well each chosen
+                       position matches the map.
+
+Usage:   bench_correlative.py [dataset ...]
+Example: bench_correlative.py exp1 exp2
+
+The match score is the mean distanceScanToMap() of the position returned by the
+search, measured before the scan is folded into the map (lower is better).  The
+correlative matcher is run twice to confirm that its trajectory is repeatable.
+
+Copyright (C) 2014 Simon D. Levy
+
+This code is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as 
+published by the Free Software Foundation, either version 3 of the 
+License, or (at your option) any later version.
+
+This code is distributed in the hope that it will be useful,     
+but WITHOUT ANY WARRANTY without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License 
+along with this code.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+MAP_SIZE_PIXELS = 800
+MAP_SIZE_METERS =  32
+RANDOM_SEED     = 9999
+
+from breezyslam.algorithms import RMHC_SLAM, Correlative_SLAM
+from pybreezyslam import distanceScanToMap
+
+from mines import MinesLaser, Rover, load_data
+
+from sys import argv
+from time import time
+
+def timed(cls):
+    '''
+    Returns a subclass of cls that records the time and map distance of every search.
+    '''
+
+    class Timed(cls):
+
+        def _getNewPosition(self, start_position):
+
+            start_sec = time()
+            position = cls._getNewPosition(self, start_position)
+            self.search_times.append(time() - start_sec)
+            distance = distanceScanToMap(self.map, self.scan_for_distance, position)
+            if distance >= 0:
+                self.distances.append(distance)
+            return position
+
+    return Timed
+
+def run(lidars, odometries, cls, **kwargs):
+
+    robot = Rover()
+    slam = timed(cls)(MinesLaser(), MAP_SIZE_PIXELS, MAP_SIZE_METERS, **kwargs)
+    slam.search_times = []
+    slam.distances = []
+
+    trajectory = []
+
+    start_sec = time()
+
+    for lidar, odometry in zip(lidars, odometries):
+        slam.update(lidar, robot.computePoseChange(odometry))
+        trajectory.append(slam.getpos())
+
+    elapsed_sec = time() - start_sec
+
+    # The first scans match an empty map, so score only the rest
+    distances = slam.distances[len(slam.distances) // 10:]
+    search_ms = sorted(t * 1000 for t in slam.search_times)
+
+    return trajectory, elapsed_sec, sum(distances) / float(len(distances)), search_ms
+
+def main():
+
+    datasets = argv[1:] or ['exp1', 'exp2']
+
+    cases = [
+        ('RMHC 1000',              RMHC_SLAM,        dict(random_seed=RANDOM_SEED, sigma_xy_mm=200, 
+                                                          sigma_theta_degrees=30, max_search_iter=1000)),
+        ('RMHC 2000',              RMHC_SLAM,        dict(random_seed=RANDOM_SEED, sigma_xy_mm=200, 
+                                                          sigma_theta_degrees=30, max_search_iter=2000)),
+        ('correlative 200/20/1',   Correlative_SLAM, dict()),
+        ('correlative 200/30/2',   Correlative_SLAM, dict(window_theta_degrees=30, step_theta_degrees=2)),
+        ('correlative 120/10/1',   Correlative_SLAM, dict(window_xy_mm=120, window_theta_degrees=10)),
+    ]
+
+    for dataset in datasets:
+
+        _, lidars, odometries = load_data('.', dataset)
+
+        print('%s: %d scans' % (dataset, len(lidars)))
+        print('  %-22s %8s %9s %20s %12s' % ('', 'sec', 'scans/sec', 'search ms p50/max', 'match'))
+
+        for name, cls, kwargs in cases:
+
+            trajectory, elapsed_sec, mean_distance, search_ms = run(lidars, odometries, cls, **kwargs)
+
+            if cls is Correlative_SLAM:
+                assert run(lidars, odometries, cls, **kwargs)[0] == trajectory, 'trajectory is not repeatable'
+
+            print('  %-22s %8.2f %9.1f %10.2f /%7.2f %12.1f' % 
+                (name, elapsed_sec, len(lidars) / elapsed_sec, 
+                 search_ms[len(search_ms) // 2], search_ms[-1], mean_distance))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+'''
+bench_distance_backends.py : Times each distanceScanToMap implementation available on
+                             this CPU (e.g. avx2, sse3, scalar), per call and per scan of
+                             RMHC SLAM on a Paris Mines Tech log, and checks that they agree.
+
+Usage:   bench_distance_backends.py [dataset] [max_search_iter]
+Example: bench_distance_backends.py exp2 1000
+
+Copyright (C) 2014 Simon D. Levy
+
+This code is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as 
+published by the Free Software Foundation, either version 3 of the 
+License, or (at your option) any later version.
+
+This code is distributed in the hope that it will be useful,     
+but WITHOUT ANY WARRANTY without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License 
+along with this code.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+MAP_SIZE_PIXELS = 800
+MAP_SIZE_METERS =  32
+RANDOM_SEED     = 9999
+
+from breezyslam.algorithms import RMHC_SLAM
+from pybreezyslam import Position, distanceScanToMap, distanceBackend, distanceBackends, useDistanceBackend
+
+from mines import MinesLaser, Rover, load_data
+
+from random import Random
+from sys import argv
+from time import time
+from timeit import repeat
+
+def build_slam(lidars, odometries, max_search_iter):
+
+    robot = Rover()
+    slam = RMHC_SLAM(MinesLaser(), MAP_SIZE_PIXELS, MAP_SIZE_METERS, random_seed=RANDOM_SEED,
+                     max_search_iter=max_search_iter)
+
+    start_sec = time()
+
+    for lidar, odometry in zip(lidars, odometries):
+        slam.update(lidar, robot.computePoseChange(odometry))
+
+    return slam, time() - start_sec
+
+def main():
+
+    dataset = argv[1] if len(argv) > 1 else 'exp2'
+    max_search_iter = int(argv[2]) if len(argv) > 2 else 1000
+
+    _, lidars, odometries = load_data('.', dataset)
+
+    backends = distanceBackends()
+    default = distanceBackend()
+
+    print('%s: %d scans, max_search_iter=%d; backends %s (default %s)' % 
+          (dataset, len(lidars), max_search_iter, ', '.join(backends), default))
+
+    # Poses scattered around the final position, on the final map
+    slam, _ = build_slam(lidars, odometries, max_search_iter)
+    x, y, theta = slam.getpos()
+    rng = Random(0)
+    poses = [Position(rng.gauss(x, 300), rng.gauss(y, 300), rng.gauss(theta, 20)) for _ in range(1000)]
+
+    reference = None
+
+    for name in backends:
+
+        useDistanceBackend(name)
+
+        distances = [distanceScanToMap(slam.map, slam.scan_for_distance, pose) for pose in poses]
+
+        if reference is None:
+            reference = distances
+            agreement = 'reference'
+        else:
+            # Vector backends round float coordinates, so a point can land one pixel over
+            diffs = [abs(a - b) / float(max(b, 1)) for a, b in zip(distances, reference)]
+            agreement = 'max rel diff %.4f, mean %.5f' % (max(diffs), sum(diffs) / len(diffs))
+
+        per_call = min(repeat(lambda: [distanceScanToMap(slam.map, slam.scan_for_distance, pose) for pose in poses],
+                              number=5, repeat=5)) / (5 * len(poses))
+
+        _, elapsed_sec = build_slam(lidars, odometries, max_search_iter)
+
+        print('  %-7s %7.2f us/call  %6.2f ms/scan  %6.1f scans/sec  (%s)' % 
+              (name, per_call * 1e6, elapsed_sec / len(lidars) * 1e3, len(lidars) / elapsed_sec, agreement))
+
+    useDistanceBackend(default)
+
+if __name__ == '__main__':
+    main()
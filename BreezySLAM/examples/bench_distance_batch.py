@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+'''
+bench_distance_batch.py : Compares scoring many candidate poses with a Python loop over
+                          distanceScanToMap against one distanceScanToMapBatch call, on
+                          one and several native threads, for a map built from a Paris
+                          Mines Tech log.  Checks that all methods agree.
+
+Usage:   bench_distance_batch.py [dataset] [num_poses]
+Example: bench_distance_batch.py exp2 20000
+
+Requires NumPy.
+
+Copyright (C) 2014 Simon D. Levy
+
+This code is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as 
+published by the Free Software Foundation, either version 3 of the 
+License, or (at your option) any later version.
+
+This code is distributed in the hope that it will be useful,     
+but WITHOUT ANY WARRANTY without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License 
+along with this code.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+MAP_SIZE_PIXELS = 800
+MAP_SIZE_METERS =  32
+RANDOM_SEED     = 9999
+
+import numpy as np
+
+from breezyslam.algorithms import RMHC_SLAM
+from pybreezyslam import Position, distanceScanToMap, distanceScanToMapBatch
+
+from mines import MinesLaser, Rover, load_data
+
+from os import cpu_count
+from sys import argv
+from timeit import repeat
+
+def python_loop(slam, poses):
+
+    return [distanceScanToMap(slam.map, slam.scan_for_distance, Position(x, y, theta)) for x, y, theta in poses]
+
+def main():
+
+    dataset = argv[1] if len(argv) > 1 else 'exp2'
+    num_poses = int(argv[2]) if len(argv) > 2 else 20000
+
+    _, lidars, odometries = load_data('.', dataset)
+
+    robot = Rover()
+    slam = RMHC_SLAM(MinesLaser(), MAP_SIZE_PIXELS, MAP_SIZE_METERS, random_seed=RANDOM_SEED)
+    for lidar, odometry in zip(lidars, odometries):
+        slam.update(lidar, robot.computePoseChange(odometry))
+
+    # Poses scattered around the final position, on the final map
+    x, y, theta = slam.getpos()
+    rng = np.random.default_rng(0)
+    poses = np.column_stack((rng.normal(x, 300, num_poses),
+                             rng.normal(y, 300, num_poses),
+                             rng.normal(theta, 20, num_poses)))
+
+    reference = python_loop(slam, poses)
+
+    cases = [('python loop', lambda: python_loop(slam, poses))]
+    for threads in sorted({1, 2, 4, cpu_count() or 1}):
+        cases.append(('batch, %d thread%s' % (threads, '' if threads == 1 else 's'),
+                      lambda threads=threads: distanceScanToMapBatch(slam.map, slam.scan_for_distance, poses, threads)))
+
+    print('%s: %d poses, %d CPUs' % (dataset, num_poses, cpu_count() or 1))
+
+    for name, fn in cases:
+        assert list(fn()) == reference, name
+        best = min(repeat(fn, number=1, repeat=5))
+        print('  %-16s %8.2f ms  %7.2f us/pose' % (name, best * 1e3, best / num_poses * 1e6))
+
+if __name__ == '__main__':
+    main()
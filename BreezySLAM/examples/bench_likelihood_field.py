@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+'''
+bench_likelihood_field.py : Compares how well RMHC search converges when matching against the raw map
+                            and against its distance-transform field (pybreezyslam.LikelihoodField),
+                            on a map built from a Paris Mines Tech log.
+
+Reference poses are the ones a long RMHC search found for the last 100 scans, which agree with the
+final map.  Each search starts from a reference pose perturbed by 150 mm and 5 degrees, and the error
+of the pose it returns is reported for several search budgets.  Also times rebuilding the field and
+updating it after one scan.
+
+Usage:   bench_likelihood_field.py [dataset] [falloff_mm]
+Example: bench_likelihood_field.py exp2 300
+
+Copyright (C) 2014 Simon D. Levy
+
+This code is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+
+This code is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License
+along with this code.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+MAP_SIZE_PIXELS = 800
+MAP_SIZE_METERS =  32
+RANDOM_SEED     = 9999
+STARTS_PER_SCAN = 5
+
+from breezyslam.algorithms import RMHC_SLAM
+from pybreezyslam import LikelihoodField, Position, Randomizer, Scan, rmhcPositionSearch
+
+from mines import MinesLaser, Rover, load_data
+
+from math import cos, sin, radians, hypot
+from random import Random
+from sys import argv
+from time import time
+
+def main():
+
+    dataset = argv[1] if len(argv) > 1 else 'exp2'
+    falloff_mm = float(argv[2]) if len(argv) > 2 else 300
+
+    _, lidars, odometries = load_data('.', dataset)
+
+    laser = MinesLaser()
+    robot = Rover()
+    slam = RMHC_SLAM(laser, MAP_SIZE_PIXELS, MAP_SIZE_METERS, random_seed=RANDOM_SEED, max_search_iter=4000)
+
+    # Laser poses for the last 100 scans
+    references = []
+    for k, (lidar, odometry) in enumerate(zip(lidars, odometries)):
+        slam.update(lidar, robot.computePoseChange(odometry))
+        if k >= len(lidars) - 100:
+            x, y, theta = slam.getpos()
+            references.append((lidar,
+                               x + laser.offset_mm * cos(radians(theta)),
+                               y + laser.offset_mm * sin(radians(theta)),
+                               theta))
+
+    start_sec = time()
+    field = LikelihoodField(slam.map, falloff_mm)
+    rebuild_sec = time() - start_sec
+
+    start_sec = time()
+    for _ in range(100):
+        field.update(slam.scan_for_mapbuild, slam.position, slam.hole_width_mm)
+    update_sec = (time() - start_sec) / 100
+
+    print('%s: falloff %d mm, rebuild %.2f ms, update after one scan %.2f ms' %
+          (dataset, falloff_mm, rebuild_sec * 1e3, update_sec * 1e3))
+
+    for max_search_iter in (50, 150, 500):
+
+        for name, match_map in (('raw map', slam.map), ('field', field.map)):
+
+            rng = Random(0)
+            randomizer = Randomizer(RANDOM_SEED)
+            errors = []
+            search_sec = 0
+
+            for lidar, x, y, theta in references:
+
+                scan = Scan(laser, 1)
+                scan.update(scans_mm=lidar, hole_width_mm=slam.hole_width_mm)
+
+                for _ in range(STARTS_PER_SCAN):
+
+                    start = Position(rng.gauss(x, 150), rng.gauss(y, 150), rng.gauss(theta, 5))
+                    start_sec = time()
+                    found = rmhcPositionSearch(start, match_map, scan, laser, 100, 20, max_search_iter, randomizer)
+                    search_sec += time() - start_sec
+                    errors.append(hypot(found.x_mm - x, found.y_mm - y))
+
+            errors.sort()
+            print('  max_search_iter=%-4d %-8s error mean %4.0f mm  p90 %4.0f mm  under 50 mm %3.0f%%  %5.0f us/search' %
+                  (max_search_iter, name,
+                   sum(errors) / len(errors),
+                   errors[int(0.9 * len(errors))],
+                   100. * sum(e < 50 for e in errors) / len(errors),
+                   search_sec / len(errors) * 1e6))
+
+if __name__ == '__main__':
+    main()
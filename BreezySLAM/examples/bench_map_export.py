@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+'''
+bench_map_export.py : Compares ways of getting map pixels out of pybreezyslam.Map
+                      into NumPy, for an 800x800 and a 2000x2000 map.
+
+    copy chain   bytearray + Map.get() + np.frombuffer().copy() + tobytes()
+                 (what the server did before Map exported a buffer)
+    get(ndarray) Map.get() into a preallocated NumPy uint8 array
+    snapshot()   Map.snapshot() into a fresh bytearray
+    view         np.asarray(memoryview(map)) high-byte view, no copy
+    view+copy    the view above copied once into a consistent frame
+
+Requires NumPy.
+'''
+
+import sys
+import timeit
+
+import numpy as np
+
+from pybreezyslam import Map
+
+HIGH_BYTE = 1 if sys.byteorder == 'little' else 0
+
+
+def copy_chain(m, n):
+    mapbytes = bytearray(n * n)
+    m.get(mapbytes)
+    return np.frombuffer(mapbytes, dtype=np.uint8).copy().tobytes()
+
+def get_into(m, out):
+    m.get(out)
+    return out
+
+def view(m):
+    return np.asarray(memoryview(m)).view(np.uint8)[:, HIGH_BYTE::2]
+
+def view_copy(m):
+    return view(m).copy()
+
+
+def main():
+
+    for n in (800, 2000):
+
+        m = Map(n, 20)
+        m.set(bytearray(np.random.default_rng(0).integers(0, 256, n * n, dtype=np.uint8).tobytes()))
+        out = np.empty(n * n, dtype=np.uint8)
+
+        # All methods must agree on the pixels
+        reference = np.frombuffer(m.snapshot(), dtype=np.uint8)
+        assert np.array_equal(reference, np.frombuffer(copy_chain(m, n), dtype=np.uint8))
+        assert np.array_equal(reference, get_into(m, out))
+        assert np.array_equal(reference, view(m).ravel())
+
+        cases = [
+            ('copy chain',   lambda: copy_chain(m, n)),
+            ('get(ndarray)', lambda: get_into(m, out)),
+            ('snapshot()',   lambda: m.snapshot()),
+            ('view',         lambda: view(m)),
+            ('view+copy',    lambda: view_copy(m)),
+        ]
+
+        print('%dx%d map (%d KB of 8-bit pixels)' % (n, n, n * n // 1024))
+        for name, fn in cases:
+            number = 200 if n <= 800 else 40
+            best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+            print('  %-13s %9.1f us' % (name, best * 1e6))
+
+
+if __name__ == '__main__':
+    main()
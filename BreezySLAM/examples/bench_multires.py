@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+'''
+bench_multires.py : Compares full-resolution RMHC search with coarse-to-fine search over
+                    a map pyramid on a Paris Mines Tech log, reporting wall time,
+                    search iterations per scan, and how well each chosen position
+                    matches the map.
+
+Usage:   bench_multires.py [dataset]
+Example: bench_multires.py exp1
+
+The match score is the mean distanceScanToMap() of the position returned by the
+search, measured at full resolution before the scan is folded into the map (lower
+is better).  The script also checks that the incrementally updated pyramid equals
+one rebuilt from scratch.
+
+Copyright (C) 2014 Simon D. Levy
+
+This code is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as 
+published by the Free Software Foundation, either version 3 of the 
+License, or (at your option) any later version.
+
+This code is distributed in the hope that it will be useful,     
+but WITHOUT ANY WARRANTY without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License 
+along with this code.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+MAP_SIZE_PIXELS = 800
+MAP_SIZE_METERS =  32
+RANDOM_SEED     = 9999
+
+# Wide search window, as used by the robot server
+SIGMA_XY_MM         = 200
+SIGMA_THETA_DEGREES = 30
+
+from breezyslam.algorithms import RMHC_SLAM, MultiResolution_SLAM
+from pybreezyslam import MapPyramid, distanceScanToMap
+
+from mines import MinesLaser, Rover, load_data
+
+from sys import argv
+from time import time
+
+def scored(cls):
+    '''
+    Returns a subclass of cls that records the map distance of every position its search returns.
+    '''
+
+    class Scored(cls):
+
+        distances = None
+
+        def _getNewPosition(self, start_position):
+
+            position = cls._getNewPosition(self, start_position)
+            distance = distanceScanToMap(self.map, self.scan_for_distance, position)
+            if self.distances is None:
+                self.distances = []
+            if distance >= 0:
+                self.distances.append(distance)
+            return position
+
+    return Scored
+
+def run(lidars, odometries, cls, **kwargs):
+
+    robot = Rover()
+    slam = scored(cls)(MinesLaser(), MAP_SIZE_PIXELS, MAP_SIZE_METERS, random_seed=RANDOM_SEED,
+                       sigma_xy_mm=SIGMA_XY_MM, sigma_theta_degrees=SIGMA_THETA_DEGREES, **kwargs)
+
+    start_sec = time()
+
+    for lidar, odometry in zip(lidars, odometries):
+        slam.update(lidar, robot.computePoseChange(odometry))
+
+    elapsed_sec = time() - start_sec
+
+    # The first scans match an empty map, so score only the rest
+    distances = slam.distances[len(slam.distances) // 10:]
+
+    return slam, elapsed_sec, sum(distances) / float(len(distances))
+
+def check_pyramid(slam):
+
+    rebuilt = MapPyramid(slam.map, len(slam.level_search_iter) - 1)
+
+    for level in range(1, len(slam.level_search_iter)):
+        assert slam.pyramid.get(level) == rebuilt.get(level), 'pyramid level %d is stale' % level
+
+def main():
+
+    dataset = argv[1] if len(argv) > 1 else 'exp2'
+
+    _, lidars, odometries = load_data('.', dataset)
+
+    cases = [
+        ('RMHC 2000',             RMHC_SLAM,            dict(max_search_iter=2000)),
+        ('RMHC 1000',             RMHC_SLAM,            dict(max_search_iter=1000)),
+        ('RMHC 500',              RMHC_SLAM,            dict(max_search_iter=500)),
+        ('multires 250/250/250',  MultiResolution_SLAM, dict(level_search_iter=(250, 250, 250))),
+        ('multires 150/100/100',  MultiResolution_SLAM, dict()),
+        ('multires 300/200',      MultiResolution_SLAM, dict(pyramid_levels=1, level_search_iter=(300, 200))),
+    ]
+
+    print('%s: %d scans' % (dataset, len(lidars)))
+
+    for name, cls, kwargs in cases:
+
+        slam, elapsed_sec, mean_distance = run(lidars, odometries, cls, **kwargs)
+
+        if cls is MultiResolution_SLAM:
+            check_pyramid(slam)
+
+        print('  %-22s %7.2f sec  %6.1f scans/sec  mean match distance %8.1f' % 
+            (name, elapsed_sec, len(lidars) / elapsed_sec, mean_distance))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+'''
+bench_rmhc_chains.py : Compares single-chain and multi-chain RMHC search on a
+                       Paris Mines Tech log, reporting wall time and how well
+                       each chosen position matches the map.
+
+Usage:   bench_rmhc_chains.py [dataset] [max_search_iter] [chains ...]
+Example: bench_rmhc_chains.py exp2 1000 1 2 4
+
+The match score is the mean distanceScanToMap() of the position returned by the
+search, measured before the scan is folded into the map (lower is better).  Each
+chain count runs twice:
+
+  per chain  every chain runs max_search_iter iterations on its own native thread,
+             so N chains search N times as much; on N cores the wall time stays
+             close to the 1-chain run at best
+  split      the chains share max_search_iter (split_search_iter=True), so every
+             row searches the same total number of iterations; on N cores the wall
+             time drops towards 1/N of the 1-chain run
+
+Wall times only show the threads' benefit on a host with at least as many cores
+as chains.
+
+Copyright (C) 2014 Simon D. Levy
+
+This code is free software: you can redistribute it and/or modify
+it under the terms of the GNU Lesser General Public License as 
+published by the Free Software Foundation, either version 3 of the 
+License, or (at your option) any later version.
+
+This code is distributed in the hope that it will be useful,     
+but WITHOUT ANY WARRANTY without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License 
+along with this code.  If not, see <http://www.gnu.org/licenses/>.
+'''
+
+MAP_SIZE_PIXELS = 800
+MAP_SIZE_METERS =  32
+RANDOM_SEED     = 9999
+
+# Wide search window, as used by the robot server
+SIGMA_XY_MM         = 200
+SIGMA_THETA_DEGREES = 30
+
+from breezyslam.algorithms import RMHC_SLAM
+from pybreezyslam import distanceScanToMap
+
+from mines import MinesLaser, Rover, load_data
+
+from sys import argv
+from time import time
+
+class ScoredSLAM(RMHC_SLAM):
+    '''
+    RMHC_SLAM that records the map distance of every position its search returns.
+    '''
+
+    def __init__(self, *args, **kwargs):
+
+        RMHC_SLAM.__init__(self, *args, **kwargs)
+        self.distances = []
+
+    def _getNewPosition(self, start_position):
+
+        position = RMHC_SLAM._getNewPosition(self, start_position)
+        distance = distanceScanToMap(self.map, self.scan_for_distance, position)
+        if distance >= 0:
+            self.distances.append(distance)
+        return position
+
+def run(lidars, odometries, max_search_iter, num_chains, split_search_iter):
+
+    robot = Rover()
+    slam = ScoredSLAM(MinesLaser(), MAP_SIZE_PIXELS, MAP_SIZE_METERS, random_seed=RANDOM_SEED,
+                      sigma_xy_mm=SIGMA_XY_MM, sigma_theta_degrees=SIGMA_THETA_DEGREES,
+                      max_search_iter=max_search_iter, num_chains=num_chains,
+                      split_search_iter=split_search_iter)
+
+    start_sec = time()
+
+    for lidar, odometry in zip(lidars, odometries):
+        slam.update(lidar, robot.computePoseChange(odometry))
+
+    elapsed_sec = time() - start_sec
+
+    # The first scans match an empty map, so score only the rest
+    scored = slam.distances[len(slam.distances) // 10:]
+
+    return elapsed_sec, sum(scored) / float(len(scored))
+
+def main():
+
+    dataset = argv[1] if len(argv) > 1 else 'exp2'
+    max_search_iter = int(argv[2]) if len(argv) > 2 else 1000
+    chain_counts = [int(arg) for arg in argv[3:]] or [1, 2, 4]
+
+    _, lidars, odometries = load_data('.', dataset)
+
+    print('%s: %d scans, max_search_iter=%d' % (dataset, len(lidars), max_search_iter))
+
+    for split_search_iter in (False, True):
+
+        for num_chains in chain_counts:
+
+            if split_search_iter and num_chains == 1:
+                continue
+
+            elapsed_sec, mean_distance = run(lidars, odometries, max_search_iter, num_chains, split_search_iter)
+
+            total_iter = max_search_iter if split_search_iter else max_search_iter * num_chains
+
+            print('  %-9s %d chain%s  %6d iterations/scan  %7.2f sec  %6.1f scans/sec  mean match distance %8.1f' % 
+                ('split' if split_search_iter else 'per chain', num_chains, ' ' if num_chains == 1 else 's',
+                 total_iter, elapsed_sec, len(lidars) / elapsed_sec, mean_distance))
+
+if __name__ == '__main__':
+    main()
@@ -32,6 +32,20 @@ _DEFAULT_HOLE_WIDTH_MM       = 600
 _DEFAULT_SIGMA_XY_MM         = 100
 _DEFAULT_SIGMA_THETA_DEGREES = 20
 _DEFAULT_MAX_SEARCH_ITER     = 1000
+_DEFAULT_NUM_CHAINS          = 1
+
+# Multi-resolution RMHC params
+_DEFAULT_PYRAMID_LEVELS      = 2
+_DEFAULT_COARSE_SEARCH_ITER  = 150
+_DEFAULT_LEVEL_SEARCH_ITER   = 100
+
+# Likelihood-field params
+_DEFAULT_FIELD_FALLOFF_MM     = 300
+
+# Correlative scan-matching params
+_DEFAULT_WINDOW_XY_MM         = 200
+_DEFAULT_WINDOW_THETA_DEGREES = 20
+_DEFAULT_STEP_THETA_DEGREES   = 1
 
 # CoreSLAM class ------------------------------------------------------------------------------------------------------
 
@@ -57,6 +71,10 @@ class CoreSLAM(object):
       _updateMapAndPointcloud(scan_mm, dxy_mm, dtheta_degrees, should_update_map)
     
     to update the point-cloud (particle cloud) and map (if should_update_map true)
+
+    By default every scan is integrated into the map.  setkeyframes() makes the map integrate only
+    keyframes, scans taken after the robot has moved or turned far enough (or enough time has passed)
+    since the last one; every scan is still used for localization.
     '''
     
     def __init__(self, laser, map_size_pixels, map_size_meters, 
@@ -83,6 +101,9 @@ class CoreSLAM(object):
                 
         # Initialize the map 
         self.map = pybreezyslam.Map(map_size_pixels, map_size_meters)
+
+        # Integrate every scan until setkeyframes() says otherwise
+        self.setkeyframes()
                 
     def update(self, scans_mm, pose_change, scan_angles_degrees=None, should_update_map=True):
         '''
@@ -90,12 +111,16 @@ class CoreSLAM(object):
         the specified pose change.
          
         scan_mm is a list of Lidar scan values, whose count is specified in the scan_size 
-        attribute of the Laser object passed to the CoreSlam constructor
+        attribute of the Laser object passed to the CoreSlam constructor; any object supporting
+        the buffer protocol also works, and a NumPy int32 array is used without copying
         pose_change is a tuple (dxy_mm, dtheta_degrees, dt_seconds) computed from odometry
         scan_angles_degrees is an optional list of angles corresponding to the distances in scans_mm
         should_update_map flags for whether you want to update the map
         '''
 
+        # Time since the last keyframe, for the keyframe policy
+        self._keyframe_elapsed_seconds += pose_change[2]
+
         # Convert pose change (dxy,dtheta,dt) to velocities (dxy/dt, dtheta/dt) for scan update
         velocity_factor = (1 / pose_change[2])  if (pose_change[2] > 0) else 0 # units => units/sec
         dxy_mm_dt = pose_change[0] * velocity_factor  
@@ -115,6 +140,36 @@ class CoreSLAM(object):
         to CoreSLAM.__init__().
         '''
         self.map.get(mapbytes)
+
+    def getmapview(self):
+        '''
+        Returns a read-only, zero-copy memoryview of the live map: a square 2-D array of 16-bit pixels
+        whose high byte is the value getmap() would return.  The view tracks later updates, so take
+        getmapsnapshot() instead when a consistent frame is needed outside the SLAM thread.
+        '''
+        return memoryview(self.map)
+
+    def getmapsnapshot(self):
+        '''
+        Returns a new bytearray holding a copy of the current map pixels.
+        '''
+        return self.map.snapshot()
+
+    def getmapversion(self):
+        '''
+        Returns the map version, which goes up whenever the map changes.
+        '''
+        return self.map.version
+
+    def getmapchanges(self, since_version=0):
+        '''
+        Returns a tuple (version, tiles, tilebytes) describing what changed in the map after since_version:
+        the current version, a list of indices of changed tiles (see pybreezyslam.Map.changed_tiles()),
+        and bytes holding the pixels of those tiles in turn.  Pass the version from the previous call to
+        get only the tiles changed since; 0 returns the whole map.
+        '''
+        version, tiles = self.map.changed_tiles(since_version)
+        return version, tiles, self.map.get_tiles(tiles)
         
         
     def setmap(self, mapbytes):
@@ -124,6 +179,22 @@ class CoreSLAM(object):
         '''
         self.map.set(mapbytes)
 
+    def setkeyframes(self, min_distance_mm=0, min_rotation_degrees=0, max_interval_seconds=None):
+        '''
+        Sets the keyframe policy: after the first scan, a scan is integrated into the map only when the
+        pose has moved at least min_distance_mm or turned at least min_rotation_degrees since the last
+        integrated scan, or when max_interval_seconds (summed from the dt_seconds of each pose change)
+        have passed since it.  Zero thresholds, the default, integrate every scan; max_interval_seconds
+        of None never forces one.  Scans in between still update the position.
+        '''
+        self.keyframe_min_distance_mm = min_distance_mm
+        self.keyframe_min_rotation_degrees = min_rotation_degrees
+        self.keyframe_max_interval_seconds = max_interval_seconds
+        self.map_updates = 0
+        self.map_updates_skipped = 0
+        self._keyframe_pose = None
+        self._keyframe_elapsed_seconds = 0
+
     def __str__(self):
         
         return 'CoreSLAM: %s \n          map quality = %d / 255 \n          hole width = %7.0f mm' % \
@@ -138,6 +209,30 @@ class CoreSLAM(object):
 
         scan.update(scans_mm=scans_distances_mm, hole_width_mm=self.hole_width_mm, 
                 velocities=velocities, scan_angles_degrees=scan_angles_degrees)
+
+    def _isKeyframe(self, x_mm, y_mm, theta_degrees):
+        '''
+        Applies the keyframe policy to a scan matched at the given pose, counting the result; a keyframe
+        becomes the reference for the next scans.
+        '''
+
+        if self._keyframe_pose is not None:
+
+            last_x_mm, last_y_mm, last_theta_degrees = self._keyframe_pose
+
+            moved = math.hypot(x_mm - last_x_mm, y_mm - last_y_mm) >= self.keyframe_min_distance_mm
+            turned = abs(theta_degrees - last_theta_degrees) >= self.keyframe_min_rotation_degrees
+            expired = self.keyframe_max_interval_seconds is not None and \
+                self._keyframe_elapsed_seconds >= self.keyframe_max_interval_seconds
+
+            if not (moved or turned or expired):
+                self.map_updates_skipped += 1
+                return False
+
+        self._keyframe_pose = (x_mm, y_mm, theta_degrees)
+        self._keyframe_elapsed_seconds = 0
+        self.map_updates += 1
+        return True
         
         
 # SinglePositionSLAM class ---------------------------------------------------------------------------------------------
@@ -188,9 +283,9 @@ class SinglePositionSLAM(CoreSLAM):
         self.position.x_mm -= self.laser.offset_mm * self._costheta()
         self.position.y_mm -= self.laser.offset_mm * self._sintheta()
   
-        # Update the map with this new position if indicated
-        if should_update_map:
-            self.map.update(self.scan_for_mapbuild, new_position, self.map_quality, self.hole_width_mm)
+        # Update the map with this new position if indicated and the keyframe policy agrees
+        if should_update_map and self._isKeyframe(new_position.x_mm, new_position.y_mm, new_position.theta_degrees):
+            self._updateMap(new_position)
       
     def getpos(self):
         '''
@@ -198,6 +293,10 @@ class SinglePositionSLAM(CoreSLAM):
         '''
         return (self.position.x_mm, self.position.y_mm, self.position.theta_degrees)
                 
+    def _updateMap(self, position):
+        
+        self.map.update(self.scan_for_mapbuild, position, self.map_quality, self.hole_width_mm)
+                
         
     def _costheta(self):
         
@@ -222,7 +321,7 @@ class RMHC_SLAM(SinglePositionSLAM):
     def __init__(self, laser, map_size_pixels, map_size_meters, 
                 map_quality=_DEFAULT_MAP_QUALITY, hole_width_mm=_DEFAULT_HOLE_WIDTH_MM,
                 random_seed=None, sigma_xy_mm=_DEFAULT_SIGMA_XY_MM, sigma_theta_degrees=_DEFAULT_SIGMA_THETA_DEGREES, 
-                max_search_iter=_DEFAULT_MAX_SEARCH_ITER):
+                max_search_iter=_DEFAULT_MAX_SEARCH_ITER, num_chains=_DEFAULT_NUM_CHAINS, split_search_iter=False):
         '''
         Creates a RMHCSlam object suitable for updating with new Lidar and odometry data.
         laser is a Laser object representing the specifications of your Lidar unit
@@ -236,6 +335,13 @@ class RMHC_SLAM(SinglePositionSLAM):
         sigma_theta_degrees specifies the standard deviation in degrees of the normal distribution of 
            the rotational component of position for RMHC search
         max_search_iter specifies the maximum number of iterations for RMHC search
+        num_chains specifies how many independent RMHC searches to run from the same starting
+           position, each on its own native thread with its own random seed; the best match wins.
+           max_search_iter applies to each chain, so N chains do N times the work of one: on N cores
+           they match better in about the wall time of one chain, never in less.
+        split_search_iter instead divides max_search_iter among the chains, so they do the work of
+           one chain in about 1/N of its wall time on N cores.  Each chain then searches less, and
+           the best of several short searches usually matches a little worse than one long search.
         '''
     
         SinglePositionSLAM.__init__(self, laser, map_size_pixels, map_size_meters, 
@@ -246,9 +352,15 @@ class RMHC_SLAM(SinglePositionSLAM):
             
         self.randomizer = pybreezyslam.Randomizer(random_seed)
         
+        # Extra chains get seeds derived from the first, so results stay reproducible
+        self.randomizers = [self.randomizer] + \
+            [pybreezyslam.Randomizer(((random_seed + k * 7919) & 0x7FFFFFFF) or 1) for k in range(1, max(1, num_chains))]
+        
         self.sigma_xy_mm = sigma_xy_mm
         self.sigma_theta_degrees = sigma_theta_degrees
         self.max_search_iter = max_search_iter
+        self.chain_search_iter = \
+            int(math.ceil(max_search_iter / float(len(self.randomizers)))) if split_search_iter else max_search_iter
         
     def update(self, scans_mm, pose_change=None, scan_angles_degrees=None, should_update_map=True):
 
@@ -265,9 +377,20 @@ class RMHC_SLAM(SinglePositionSLAM):
         '''     
         
         # RMHC search is implemented as a C extension for efficiency
+        if len(self.randomizers) > 1:
+            return pybreezyslam.rmhcPositionSearchParallel(
+                start_position, 
+                self._getMatchMap(), 
+                self.scan_for_distance, 
+                self.laser,
+                self.sigma_xy_mm,
+                self.sigma_theta_degrees,
+                self.chain_search_iter,
+                self.randomizers)
+
         return pybreezyslam.rmhcPositionSearch(
             start_position, 
-            self.map, 
+            self._getMatchMap(), 
             self.scan_for_distance, 
             self.laser,
             self.sigma_xy_mm,
@@ -275,10 +398,195 @@ class RMHC_SLAM(SinglePositionSLAM):
             self.max_search_iter,
             self.randomizer)
                              
+    def _getMatchMap(self):
+        '''
+        Returns the Map that scans are matched against; subclasses may match against a derived map.
+        '''
+        return self.map
+
     def _random_normal(self, mu, sigma):
         
         return mu + self.randomizer.rnor() * sigma
 
+# MultiResolution_SLAM class ----------------------------------------------------------------------------------------
+
+class MultiResolution_SLAM(RMHC_SLAM):
+    '''
+    MultiResolution_SLAM is RMHC_SLAM with a coarse-to-fine search.  It keeps a pyramid of min-pooled,
+    lower-resolution copies of the map, updated incrementally with the map, runs a short RMHC search on the
+    coarsest level and refines the result on each finer level with half the search spread.  The coarse
+    levels smooth the match landscape, so far fewer iterations reach the same quality as a full-resolution
+    search; this also keeps larger maps affordable.
+    '''
+    
+    def __init__(self, laser, map_size_pixels, map_size_meters, 
+                map_quality=_DEFAULT_MAP_QUALITY, hole_width_mm=_DEFAULT_HOLE_WIDTH_MM,
+                random_seed=None, sigma_xy_mm=_DEFAULT_SIGMA_XY_MM, sigma_theta_degrees=_DEFAULT_SIGMA_THETA_DEGREES, 
+                pyramid_levels=_DEFAULT_PYRAMID_LEVELS, level_search_iter=None):
+        '''
+        Creates a MultiResolution_SLAM object suitable for updating with new Lidar and odometry data.
+        laser is a Laser object representing the specifications of your Lidar unit
+        map_size_pixels is the size of the square map in pixels
+        map_size_meters is the size of the square map in meters
+        quality from 0 through 255 determines integration speed of scan into map
+        hole_width_mm determines width of obstacles (walls)
+        random_seed supports reproducible results; defaults to system time if unspecified
+        sigma_xy_mm specifies the standard deviation in millimeters of the normal distribution of 
+           the (X,Y) component of position for the search on the coarsest level; it halves at each finer level
+        sigma_theta_degrees specifies the standard deviation in degrees of the normal distribution of 
+           the rotational component of position for the search on the coarsest level; it halves likewise
+        pyramid_levels is the number of coarse levels, each half the resolution of the one above
+        level_search_iter is a sequence of pyramid_levels+1 maximum RMHC iteration counts, coarsest level
+           first and the full-resolution map last; defaults to 150 on the coarsest level and 100 on each other
+        '''
+    
+        if level_search_iter is None:
+            level_search_iter = [_DEFAULT_COARSE_SEARCH_ITER] + [_DEFAULT_LEVEL_SEARCH_ITER] * pyramid_levels
+
+        if len(level_search_iter) != pyramid_levels + 1:
+            raise ValueError('level_search_iter needs %d entries, one per pyramid level plus the map' % 
+                (pyramid_levels + 1))
+
+        RMHC_SLAM.__init__(self, laser, map_size_pixels, map_size_meters, 
+            map_quality, hole_width_mm, random_seed, sigma_xy_mm, sigma_theta_degrees,
+            sum(level_search_iter))
+        
+        self.level_search_iter = tuple(level_search_iter)
+        self.pyramid = pybreezyslam.MapPyramid(self.map, pyramid_levels)
+        
+    def setmap(self, mapbytes):
+        '''
+        Sets current map pixels to values in bytearray, where bytearray length is square of map size passed
+        to CoreSLAM.__init__(), and rebuilds the map pyramid.
+        '''
+        RMHC_SLAM.setmap(self, mapbytes)
+        self.pyramid.rebuild()
+        
+    def _updateMap(self, position):
+        
+        RMHC_SLAM._updateMap(self, position)
+        self.pyramid.update(self.scan_for_mapbuild, position, self.hole_width_mm)
+    
+    def _getNewPosition(self, start_position):
+        '''
+        Implements the _getNewPosition() method of SinglePositionSLAM. Uses coarse-to-fine Random-Mutation
+        Hill-Climbing search over the map pyramid to look for a better position based on a starting position.
+        '''     
+        
+        return pybreezyslam.rmhcPositionSearchMultiRes(
+            start_position, 
+            self.map, 
+            self.pyramid,
+            self.scan_for_distance, 
+            self.laser,
+            self.sigma_xy_mm,
+            self.sigma_theta_degrees,
+            self.level_search_iter,
+            self.randomizer)
+            
+# LikelihoodField_SLAM class ----------------------------------------------------------------------------------------
+
+class LikelihoodField_SLAM(RMHC_SLAM):
+    '''
+    LikelihoodField_SLAM is RMHC_SLAM matching against a distance-transform field of the map instead of the raw
+    pixels.  Each field pixel holds the lowest map value plus a cost that rises with the distance to it, so walls
+    keep their value and scores fall off smoothly around them: a scan point near a wall still scores better than
+    one in open space, and hill climbing follows the slope instead of searching a plateau.  The field is
+    recomputed around each map update and rebuilt after setmap().
+    '''
+    
+    def __init__(self, laser, map_size_pixels, map_size_meters, 
+                map_quality=_DEFAULT_MAP_QUALITY, hole_width_mm=_DEFAULT_HOLE_WIDTH_MM,
+                random_seed=None, sigma_xy_mm=_DEFAULT_SIGMA_XY_MM, sigma_theta_degrees=_DEFAULT_SIGMA_THETA_DEGREES, 
+                max_search_iter=_DEFAULT_MAX_SEARCH_ITER, num_chains=_DEFAULT_NUM_CHAINS,
+                field_falloff_mm=_DEFAULT_FIELD_FALLOFF_MM, split_search_iter=False):
+        '''
+        Creates a LikelihoodField_SLAM object suitable for updating with new Lidar and odometry data.
+        Arguments are those of RMHC_SLAM, plus:
+        field_falloff_mm is the distance over which matching cost rises from a wall to open space
+        '''
+    
+        RMHC_SLAM.__init__(self, laser, map_size_pixels, map_size_meters, 
+            map_quality, hole_width_mm, random_seed, sigma_xy_mm, sigma_theta_degrees,
+            max_search_iter, num_chains, split_search_iter)
+        
+        self.field = pybreezyslam.LikelihoodField(self.map, field_falloff_mm)
+        
+    def setmap(self, mapbytes):
+        '''
+        Sets current map pixels to values in bytearray, where bytearray length is square of map size passed
+        to CoreSLAM.__init__(), and rebuilds the likelihood field.
+        '''
+        RMHC_SLAM.setmap(self, mapbytes)
+        self.field.rebuild()
+        
+    def _updateMap(self, position):
+        
+        RMHC_SLAM._updateMap(self, position)
+        self.field.update(self.scan_for_mapbuild, position, self.hole_width_mm)
+    
+    def _getMatchMap(self):
+        
+        return self.field.map
+
+# Correlative_SLAM class -------------------------------------------------------------------------------------------
+
+class Correlative_SLAM(SinglePositionSLAM):
+    '''
+    Correlative_SLAM implements the _getNewPosition() method of SinglePositionSLAM with a deterministic
+    correlative scan matcher: every heading within a window around the start position is tried at a fixed
+    step, the scan is rotated once per heading, and every whole-pixel translation in the window is scored by
+    table lookup into the map.  The winner is refined at a quarter of the heading step.  Cost and result
+    depend only on the window, the step, and the data, so repeated runs give identical trajectories.
+    '''
+    
+    def __init__(self, laser, map_size_pixels, map_size_meters, 
+                map_quality=_DEFAULT_MAP_QUALITY, hole_width_mm=_DEFAULT_HOLE_WIDTH_MM,
+                window_xy_mm=_DEFAULT_WINDOW_XY_MM, window_theta_degrees=_DEFAULT_WINDOW_THETA_DEGREES,
+                step_theta_degrees=_DEFAULT_STEP_THETA_DEGREES):
+        '''
+        Creates a Correlative_SLAM object suitable for updating with new Lidar and odometry data.
+        laser is a Laser object representing the specifications of your Lidar unit
+        map_size_pixels is the size of the square map in pixels
+        map_size_meters is the size of the square map in meters
+        quality from 0 through 255 determines integration speed of scan into map
+        hole_width_mm determines width of obstacles (walls)
+        window_xy_mm is the largest (X,Y) correction searched in each direction, in millimeters
+        window_theta_degrees is the largest rotational correction searched in each direction, in degrees
+        step_theta_degrees is the heading step of the search; the best heading is then refined at a quarter of it
+        '''
+    
+        SinglePositionSLAM.__init__(self, laser, map_size_pixels, map_size_meters, 
+            map_quality, hole_width_mm)
+            
+        self.window_xy_mm = window_xy_mm
+        self.window_theta_degrees = window_theta_degrees
+        self.step_theta_degrees = step_theta_degrees
+        
+    def update(self, scans_mm, pose_change=None, scan_angles_degrees=None, should_update_map=True):
+
+        if not pose_change:
+        
+            pose_change = (0, 0, 0)
+    
+        CoreSLAM.update(self, scans_mm, pose_change, scan_angles_degrees, should_update_map)   
+    
+    def _getNewPosition(self, start_position):
+        '''
+        Implements the _getNewPosition() method of SinglePositionSLAM. Uses correlative scan matching
+        to look for a better position based on a starting position.
+        '''     
+        
+        # Correlative search is implemented as a C extension for efficiency
+        return pybreezyslam.correlativePositionSearch(
+            start_position, 
+            self.map, 
+            self.scan_for_distance, 
+            self.laser,
+            self.window_xy_mm,
+            self.window_theta_degrees,
+            self.step_theta_degrees)
+            
  # Deterministic_SLAM class  ------------------------------------------------------------------------------------        
 
 class Deterministic_SLAM(SinglePositionSLAM):
@@ -265,6 +265,23 @@ Scan_str(Scan *self)
 }
 
 
+// Helper for Scan.update(): releases any buffers taken and raises
+static PyObject *
+scan_update_error(Py_buffer * lidar_view, Py_buffer * angles_view, const char * details)
+{
+    if (lidar_view && lidar_view->obj)
+    {
+        PyBuffer_Release(lidar_view);
+    }
+
+    if (angles_view && angles_view->obj)
+    {
+        PyBuffer_Release(angles_view);
+    }
+
+    return null_on_raise_argument_exception_with_details("Scan", "update", details);
+}
+
 static PyObject *
 Scan_update(Scan *self, PyObject *args, PyObject *kwds)
 {
@@ -273,6 +290,10 @@ Scan_update(Scan *self, PyObject *args, PyObject *kwds)
     PyObject * py_velocities = NULL;
     PyObject * py_scan_angles_degrees = NULL;
 
+    // Buffers stay zeroed (obj == NULL) unless taken below
+    Py_buffer lidar_view = {0};
+    Py_buffer angles_view = {0};
+
     static char* argnames[] = {"scans_mm", "hole_width_mm", "velocities", "scan_angles_degrees", NULL};
 
     if (!PyArg_ParseTupleAndKeywords(args, kwds,"Od|OO", argnames,
@@ -284,42 +305,94 @@ Scan_update(Scan *self, PyObject *args, PyObject *kwds)
         return null_on_raise_argument_exception("Scan", "update");
     }
 
-    // Bozo filter on LIDAR argument
-    if (!PyList_Check(py_lidar))
+    int have_angles = py_scan_angles_degrees && py_scan_angles_degrees != Py_None;
+
+    // Bozo filter on LIDAR argument: a list, or anything exporting a 1-D numeric
+    // buffer (NumPy array, array.array, memoryview)
+    Py_ssize_t lidar_count = 0;
+
+    if (PyList_Check(py_lidar))
+    {
+        lidar_count = PyList_Size(py_lidar);
+    }
+    else if (PyObject_CheckBuffer(py_lidar) &&
+             PyObject_GetBuffer(py_lidar, &lidar_view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) == 0)
+    {
+        lidar_count = lidar_view.len / lidar_view.itemsize;
+    }
+    else
+    {
+        PyErr_Clear();
+        return scan_update_error(NULL, NULL, "lidar must be a list or a contiguous numeric buffer");
+    }
+
+    if (lidar_view.obj && lidar_view.ndim != 1)
     {
-        return null_on_raise_argument_exception_with_details("Scan", "update", 
-            "lidar must be a list");
+        return scan_update_error(&lidar_view, NULL, "lidar buffer must be one-dimensional");
     }
 
     // Scan angles provided
-    if (py_scan_angles_degrees != Py_None) 
+    if (have_angles) 
     {
-        // Bozo filter #1: SCAN_ANGLES_DEGREES  must be a list
-        if (!PyList_Check(py_scan_angles_degrees))
+        Py_ssize_t angles_count = 0;
+
+        // Bozo filter #1: SCAN_ANGLES_DEGREES must be a list or buffer
+        if (PyList_Check(py_scan_angles_degrees))
+        {
+            angles_count = PyList_Size(py_scan_angles_degrees);
+        }
+        else if (PyObject_CheckBuffer(py_scan_angles_degrees) &&
+                 PyObject_GetBuffer(py_scan_angles_degrees, &angles_view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) == 0)
+        {
+            angles_count = angles_view.len / angles_view.itemsize;
+        }
+        else
+        {
+            PyErr_Clear();
+            return scan_update_error(&lidar_view, NULL, "scan angles must be a list or a contiguous numeric buffer");
+        }
+
+        if (angles_view.obj && angles_view.ndim != 1)
         {
-            return null_on_raise_argument_exception_with_details("Scan", "update", 
-                    "scan angles must be a list");
+            return scan_update_error(&lidar_view, &angles_view, "scan angles buffer must be one-dimensional");
         }
 
         // Bozo filter #2: must have same number of scan angles as scan distances
-        if (PyList_Size(py_lidar) != PyList_Size(py_scan_angles_degrees))
+        if (lidar_count != angles_count)
         {
-            return null_on_raise_argument_exception_with_details("Scan", "update", 
+            return scan_update_error(&lidar_view, &angles_view,
                     "number of scan angles must equal number of scan distances");
         }
 
+        // Bozo filter #3: interpolation buffers hold one laser scan
+        if (lidar_count > self->scan.size)
+        {
+            return scan_update_error(&lidar_view, &angles_view,
+                    "more scan distances than laser scan size");
+        }
+
         // Extract scan angle values from argument
-        for (int k=0; k<PyList_Size(py_scan_angles_degrees); ++k)
+        if (angles_view.obj)
+        {
+            if (!floats_from_buffer(&angles_view, self->lidar_angles_deg))
+            {
+                return scan_update_error(&lidar_view, &angles_view, "scan angles buffer must be numeric");
+            }
+            PyBuffer_Release(&angles_view);
+        }
+        else
         {
-            self->lidar_angles_deg[k] = (float)PyFloat_AsDouble(PyList_GetItem(py_scan_angles_degrees, k));
+            for (int k=0; k<angles_count; ++k)
+            {
+                self->lidar_angles_deg[k] = (float)PyFloat_AsDouble(PyList_GetItem(py_scan_angles_degrees, k));
+            }
         }
     }
 
-    // No scan angles provided; lidar-list size must match scan size
-    else if (PyList_Size(py_lidar) != self->scan.size)
+    // No scan angles provided; lidar size must match scan size
+    else if (lidar_count != self->scan.size)
     {        
-        return null_on_raise_argument_exception_with_details("Scan", "update", 
-                "lidar size mismatch");
+        return scan_update_error(&lidar_view, NULL, "lidar size mismatch");
     }
 
     // Default to no velocities
@@ -327,39 +400,64 @@ Scan_update(Scan *self, PyObject *args, PyObject *kwds)
     double dtheta_degrees = 0;
 
     // Bozo filter on velocities tuple
-    if (py_velocities != Py_None)
+    if (py_velocities && py_velocities != Py_None)
     {
         if (!PyTuple_Check(py_velocities))
         {
-            return null_on_raise_argument_exception_with_details("Scan", "update", 
-                    "velocities must be a tuple");    
+            return scan_update_error(&lidar_view, NULL, "velocities must be a tuple");
         }
 
         if (!double_from_tuple(py_velocities, 0, &dxy_mm) ||
                 !double_from_tuple(py_velocities, 1, &dtheta_degrees))
         {
-            return null_on_raise_argument_exception_with_details("Scan", "update", 
+            return scan_update_error(&lidar_view, NULL, 
                     "velocities tuple must contain at least two numbers");    
-
         }
     }
 
-    // Extract LIDAR values from argument
-    for (int k=0; k<PyList_Size(py_lidar); ++k)
+    // Extract LIDAR values from argument. A buffer of native ints is read in
+    // place, except when interpolating by angle, which rewrites the distances.
+    int * lidar_distances_mm = self->lidar_distances_mm;
+
+    if (lidar_view.obj)
+    {
+        if (!have_angles && buffer_holds_ints(&lidar_view))
+        {
+            lidar_distances_mm = (int *)lidar_view.buf;
+        }
+        else if (!ints_from_buffer(&lidar_view, self->lidar_distances_mm))
+        {
+            return scan_update_error(&lidar_view, NULL, "lidar buffer must be numeric");
+        }
+    }
+    else
     {
-        self->lidar_distances_mm[k] = (int)PyFloat_AsDouble(PyList_GetItem(py_lidar, k));
+        for (int k=0; k<lidar_count; ++k)
+        {
+            self->lidar_distances_mm[k] = (int)PyFloat_AsDouble(PyList_GetItem(py_lidar, k));
+        }
     }
 
-    // Update the scan
+    // Update the scan without the GIL. Everything it reads was copied into
+    // self above or is held by lidar_view, and the caller holds self.
+    Py_BEGIN_ALLOW_THREADS
+
     scan_update(
             &self->scan, 
-            (py_scan_angles_degrees != Py_None) ? self->lidar_angles_deg :NULL,
-            self->lidar_distances_mm, 
-            PyList_Size(py_lidar),
+            have_angles ? self->lidar_angles_deg : NULL,
+            lidar_distances_mm, 
+            (int)lidar_count,
             hole_width_mm,
             dxy_mm,
             dtheta_degrees);
 
+    Py_END_ALLOW_THREADS
+
+    if (lidar_view.obj)
+    {
+        PyBuffer_Release(&lidar_view);
+    }
+
     Py_RETURN_NONE;
 
 } // Scan_update
@@ -368,8 +466,9 @@ Scan_update(Scan *self, PyObject *args, PyObject *kwds)
 static PyMethodDef Scan_methods[] = 
 {
     {"update", (PyCFunction)Scan_update, METH_VARARGS | METH_KEYWORDS, 
-        "Scan.update(scans_mm, hole_width_mm, velocities=None) updates scan.\n"\
-            "scans_mm is a list of integers representing scanned distances in mm.\n"\
+        "Scan.update(scans_mm, hole_width_mm, velocities=None, scan_angles_degrees=None) updates scan.\n"\
+            "scans_mm is a list of integers representing scanned distances in mm, or any object\n"\
+            "supporting the buffer protocol; a NumPy int32 array is read without copying.\n"\
             "hole_width_mm is the width of holes (obstacles, walls) in millimeters.\n"\
             "velocities is an optional tuple containing (dxy_mm/dt, dtheta_degrees/dt);\n"\
             "i.e., robot's (forward, rotational velocity) for improving the quality of the scan."
@@ -439,9 +538,56 @@ typedef struct
     PyObject_HEAD
     
     map_t map;
+
+    // Shape and strides of the pixel buffer exported through the buffer protocol
+    Py_ssize_t shape[2];
+    Py_ssize_t strides[2];
+
+    // Change tracking: the map version goes up on every change, and each
+    // tile_size x tile_size tile (row-major) remembers the version that last
+    // changed it, so any number of readers can ask what changed since they looked
+    unsigned long long version;
+    int tile_size;
+    int tiles_per_side;
+    unsigned long long * tile_versions;
     
 } Map;
 
+#define DEFAULT_TILE_SIZE 32
+
+// Records a change to the pixels in extent (xmin, ymin, xmax, ymax, inclusive),
+// grown by margin pixels; NULL extent means the whole map
+static void Map_touch(Map * self, const int * extent, int margin)
+{
+    int xmin = 0, ymin = 0;
+    int xmax = self->map.size_pixels - 1, ymax = self->map.size_pixels - 1;
+
+    if (extent)
+    {
+        if (extent[0] - margin > xmin) xmin = extent[0] - margin;
+        if (extent[1] - margin > ymin) ymin = extent[1] - margin;
+        if (extent[2] + margin < xmax) xmax = extent[2] + margin;
+        if (extent[3] + margin < ymax) ymax = extent[3] + margin;
+    }
+
+    // Nothing on the map was touched
+    if (!self->tile_versions || xmin > xmax || ymin > ymax)
+    {
+        return;
+    }
+
+    self->version++;
+
+    int ty, tx;
+    for (ty=ymin/self->tile_size; ty<=ymax/self->tile_size; ++ty)
+    {
+        for (tx=xmin/self->tile_size; tx<=xmax/self->tile_size; ++tx)
+        {
+            self->tile_versions[ty*self->tiles_per_side+tx] = self->version;
+        }
+    }
+}
+
 // Helper for Map.__init__(), Map.set()
 static int bad_mapbytes(PyObject * py_mapbytes, int size_pixels, const char * methodname)
 {    
@@ -464,6 +610,7 @@ static void
 Map_dealloc(Map* self)
 {            
     map_free(&self->map);
+    free(self->tile_versions);
     
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
@@ -484,18 +631,56 @@ Map_init(Map *self, PyObject *args, PyObject *kwds)
 	int size_pixels;
 	double size_meters;
 	PyObject * py_bytes = NULL;
+	int tile_size = DEFAULT_TILE_SIZE;
 	
-    static char * argnames[] = {"size_pixels", "size_meters", "bytes", NULL};
+    static char * argnames[] = {"size_pixels", "size_meters", "bytes", "tile_size", NULL};
 
-    if(!PyArg_ParseTupleAndKeywords(args, kwds,"id|O", argnames, 
+    if(!PyArg_ParseTupleAndKeywords(args, kwds,"id|Oi", argnames, 
         &size_pixels, 
         &size_meters, 
-        &py_bytes))
+        &py_bytes,
+        &tile_size))
     {
         return error_on_raise_argument_exception("Map");
     }
+
+    if (self->tile_versions)
+    {
+        return error_on_raise_argument_exception_with_details("Map", "__init__", 
+            "map is already initialized");
+    }
+
+    if (size_pixels <= 0 || tile_size <= 0)
+    {
+        return error_on_raise_argument_exception_with_details("Map", "__init__", 
+            "size_pixels and tile_size must be positive");
+    }
+
+    int tiles_per_side = (size_pixels + tile_size - 1) / tile_size;
+
+    // Every tile starts at version 1, so changed_tiles(0) lists the whole map
+    self->tile_versions = (unsigned long long *)calloc(tiles_per_side * tiles_per_side, sizeof(unsigned long long));
+    if (!self->tile_versions)
+    {
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    self->version = 1;
+    self->tile_size = tile_size;
+    self->tiles_per_side = tiles_per_side;
+
+    int k;
+    for (k=0; k<tiles_per_side*tiles_per_side; ++k)
+    {
+        self->tile_versions[k] = self->version;
+    }
            
     map_init(&self->map, size_pixels, size_meters);
+
+    self->shape[0] = self->shape[1] = size_pixels;
+    self->strides[0] = size_pixels * sizeof(pixel_t);
+    self->strides[1] = sizeof(pixel_t);
     
     if (py_bytes && !bad_mapbytes(py_bytes, size_pixels, "__init__"))
     {    
@@ -526,6 +711,29 @@ Map_get(Map * self, PyObject * args, PyObject * kwds)
     {
         return null_on_raise_argument_exception("Map", "get");
     }
+
+    // Besides a bytearray, accept any writable contiguous byte buffer
+    // (e.g. a preallocated NumPy uint8 array) so callers can reuse storage
+    if (!PyByteArray_Check(py_mapbytes) && PyObject_CheckBuffer(py_mapbytes))
+    {
+        Py_buffer view;
+
+        if (PyObject_GetBuffer(py_mapbytes, &view, PyBUF_WRITABLE | PyBUF_C_CONTIGUOUS) < 0)
+        {
+            return NULL;
+        }
+
+        if (view.len != (Py_ssize_t)self->map.size_pixels * self->map.size_pixels)
+        {
+            PyBuffer_Release(&view);
+            return null_on_raise_argument_exception_with_details("Map", "get", 
+                "buffer is wrong size");
+        }
+
+        map_get(&self->map, (char *)view.buf);
+        PyBuffer_Release(&view);
+        Py_RETURN_NONE;
+    }
     
     if (bad_mapbytes(py_mapbytes, self->map.size_pixels, "get"))
     {
@@ -537,6 +745,72 @@ Map_get(Map * self, PyObject * args, PyObject * kwds)
     Py_RETURN_NONE;
 }
 
+static PyObject *
+Map_snapshot(Map * self, PyObject * args, PyObject * kwds)
+{
+    PyObject * py_mapbytes = 
+        PyByteArray_FromStringAndSize(NULL, (Py_ssize_t)self->map.size_pixels * self->map.size_pixels);
+
+    if (!py_mapbytes)
+    {
+        return NULL;
+    }
+
+    char * bytes = PyByteArray_AsString(py_mapbytes);
+
+    // Nobody else can see the new bytearray yet, so copy into it without the GIL
+    Py_BEGIN_ALLOW_THREADS
+
+    map_get(&self->map, bytes);
+
+    Py_END_ALLOW_THREADS
+
+    return py_mapbytes;
+}
+
+// Buffer protocol: read-only, zero-copy view of the live 16-bit pixels.
+// The high byte of each pixel is the value returned by Map.get().
+static int
+Map_getbuffer(Map * self, Py_buffer * view, int flags)
+{
+    if (!self->map.pixels)
+    {
+        PyErr_SetString(PyExc_BufferError, "Map is not initialized");
+        view->obj = NULL;
+        return -1;
+    }
+
+    if (flags & PyBUF_WRITABLE)
+    {
+        PyErr_SetString(PyExc_BufferError, "Map pixels are read-only; use Map.set()");
+        view->obj = NULL;
+        return -1;
+    }
+
+    view->obj = (PyObject *)self;
+    Py_INCREF(self);
+    view->buf = self->map.pixels;
+    view->len = (Py_ssize_t)self->map.size_pixels * self->map.size_pixels * sizeof(pixel_t);
+    view->readonly = 1;
+    view->itemsize = sizeof(pixel_t);
+    view->format = (flags & PyBUF_FORMAT) ? "H" : NULL;
+    view->ndim = 2;
+    view->shape = (flags & PyBUF_ND) ? self->shape : NULL;
+    view->strides = ((flags & PyBUF_STRIDES) == PyBUF_STRIDES) ? self->strides : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+
+    return 0;
+}
+
+#if PY_MAJOR_VERSION >= 3
+static PyBufferProcs Map_as_buffer = 
+{
+    (getbufferproc)Map_getbuffer,               // bf_getbuffer
+    0,                                          // bf_releasebuffer
+};
+#endif
+
 static PyObject *
 Map_set(Map * self, PyObject * args, PyObject * kwds)
 {        
@@ -553,6 +827,8 @@ Map_set(Map * self, PyObject * args, PyObject * kwds)
     }
     
     map_set(&self->map, PyByteArray_AsString(py_mapbytes));
+
+    Map_touch(self, NULL, 0);
     
     Py_RETURN_NONE;
 }
@@ -583,7 +859,16 @@ Map_update(Map *self, PyObject *args, PyObject *kwds)
     }
             
     position_t position = pypos2cpos(py_position);
+
+    int extent[4];
     
+    // Pin the scan while the map is updated without the GIL
+    Py_INCREF(py_scan);
+
+    Py_BEGIN_ALLOW_THREADS
+
+    map_update_extent(&self->map, &py_scan->scan, position, hole_width_mm, extent);
+
     map_update(
         &self->map, 
         &py_scan->scan, 
@@ -591,28 +876,189 @@ Map_update(Map *self, PyObject *args, PyObject *kwds)
         map_quality, 
         hole_width_mm);
 
+    Py_END_ALLOW_THREADS
+
+    Py_DECREF(py_scan);
+
+    // Bump the version only once the pixels are in place
+    Map_touch(self, extent, 0);
+
     Py_RETURN_NONE;
 }
 
+static PyObject *
+Map_changed_tiles(Map * self, PyObject * args, PyObject * kwds)
+{
+    unsigned long long since = 0;
+
+    if (!PyArg_ParseTuple(args, "|K", &since))
+    {
+        return null_on_raise_argument_exception("Map", "changed_tiles");
+    }
+
+    PyObject * py_tiles = PyList_New(0);
+    if (!py_tiles)
+    {
+        return NULL;
+    }
+
+    int k;
+    for (k=0; k<self->tiles_per_side*self->tiles_per_side; ++k)
+    {
+        if (self->tile_versions[k] > since)
+        {
+            PyObject * py_tile = PyLong_FromLong(k);
+            if (!py_tile || PyList_Append(py_tiles, py_tile) < 0)
+            {
+                Py_XDECREF(py_tile);
+                Py_DECREF(py_tiles);
+                return NULL;
+            }
+            Py_DECREF(py_tile);
+        }
+    }
+
+    return Py_BuildValue("KN", self->version, py_tiles);
+}
+
+static PyObject *
+Map_get_tiles(Map * self, PyObject * args, PyObject * kwds)
+{
+    PyObject * py_tiles = NULL;
+
+    if (!PyArg_ParseTuple(args, "O", &py_tiles))
+    {
+        return null_on_raise_argument_exception("Map", "get_tiles");
+    }
+
+    PyObject * py_tile_seq = PySequence_Fast(py_tiles, "tiles must be a sequence of tile indices");
+    if (!py_tile_seq)
+    {
+        return NULL;
+    }
+
+    int size_pixels = self->map.size_pixels;
+    int tile_size = self->tile_size;
+    int ntiles = (int)PySequence_Fast_GET_SIZE(py_tile_seq);
+    int * tiles = (int *)PyMem_Malloc((ntiles ? ntiles : 1) * sizeof(int));
+    Py_ssize_t nbytes = 0;
+    int k;
+
+    if (!tiles)
+    {
+        Py_DECREF(py_tile_seq);
+        return PyErr_NoMemory();
+    }
+
+    for (k=0; k<ntiles; ++k)
+    {
+        long tile = PyLong_AsLong(PySequence_Fast_GET_ITEM(py_tile_seq, k));
+
+        if (tile < 0 || tile >= self->tiles_per_side * self->tiles_per_side)
+        {
+            PyMem_Free(tiles);
+            Py_DECREF(py_tile_seq);
+            if (PyErr_Occurred())
+            {
+                return NULL;
+            }
+            return null_on_raise_argument_exception_with_details("Map", "get_tiles", 
+                "tile index out of range");
+        }
+
+        // Tiles on the right and bottom edges may be cut short by the map
+        int x = (tile % self->tiles_per_side) * tile_size;
+        int y = (tile / self->tiles_per_side) * tile_size;
+        int w = size_pixels - x < tile_size ? size_pixels - x : tile_size;
+        int h = size_pixels - y < tile_size ? size_pixels - y : tile_size;
+
+        tiles[k] = (int)tile;
+        nbytes += (Py_ssize_t)w * h;
+    }
+
+    Py_DECREF(py_tile_seq);
+
+    PyObject * py_bytes = PyBytes_FromStringAndSize(NULL, nbytes);
+    if (!py_bytes)
+    {
+        PyMem_Free(tiles);
+        return NULL;
+    }
+
+    char * bytes = PyBytes_AS_STRING(py_bytes);
+
+    for (k=0; k<ntiles; ++k)
+    {
+        int x = (tiles[k] % self->tiles_per_side) * tile_size;
+        int y = (tiles[k] / self->tiles_per_side) * tile_size;
+        int w = size_pixels - x < tile_size ? size_pixels - x : tile_size;
+        int h = size_pixels - y < tile_size ? size_pixels - y : tile_size;
+        int row, col;
+
+        for (row=y; row<y+h; ++row)
+        {
+            pixel_t * pixels = self->map.pixels + row * size_pixels;
+
+            for (col=x; col<x+w; ++col)
+            {
+                *bytes++ = pixels[col] >> 8;
+            }
+        }
+    }
+
+    PyMem_Free(tiles);
+
+    return py_bytes;
+}
+
 static PyMethodDef Map_methods[] = 
 {
     {"update", (PyCFunction)Map_update, METH_VARARGS, 
     "Map.update(Scan, Position, quality, hole_width_mm) updates map based on scan and position.\n"\
     "Quality from 0 through 255 determines integration speed of scan into map.\n"\
-    "Hole width determines width of obstacles (walls)."
+    "Hole width determines width of obstacles (walls).\n"\
+    "Runs without the GIL, so threads sharing a Map must serialize updates and reads themselves."
     },
     {"get", (PyCFunction)Map_get, METH_VARARGS,
-    "Map.get(bytearray) fills byte array with map pixels, where bytearray length is square of size of map."
+    "Map.get(bytearray) fills byte array with map pixels, where bytearray length is square of size of map.\n"\
+    "Any writable contiguous byte buffer of that length (e.g. a NumPy uint8 array) is also accepted."
+    },
+    {"snapshot", (PyCFunction)Map_snapshot, METH_NOARGS,
+    "Map.snapshot() returns a new bytearray holding a consistent copy of the map pixels."
     },
     {"set", (PyCFunction)Map_set, METH_VARARGS,
     "Map.set(bytearray) fills current map with pixels in bytearray, where bytearray length is square of size of map."
     },
+    {"changed_tiles", (PyCFunction)Map_changed_tiles, METH_VARARGS,
+    "Map.changed_tiles(since=0) returns a tuple (version, tiles): the current map version and a list of the\n"\
+    "indices of tiles changed after version since.  Tile k covers columns (k % tiles_per_side) * tile_size and\n"\
+    "rows (k // tiles_per_side) * tile_size onwards.  Pass the version from the previous call to get only what\n"\
+    "changed since; 0 lists every tile."
+    },
+    {"get_tiles", (PyCFunction)Map_get_tiles, METH_VARARGS,
+    "Map.get_tiles(tiles) returns bytes holding the 8-bit pixels of each listed tile in turn, row by row,\n"\
+    "as Map.get() would.  Tiles on the right and bottom edges are cut short when tile_size does not divide\n"\
+    "size_pixels."
+    },
     {NULL}  // Sentinel 
 };
 
+static PyMemberDef Map_members[] = {
+    {"version", T_ULONGLONG, offsetof(Map, version), READONLY,
+     "Map version: starts at 1 and goes up whenever Map.update() or Map.set() changes pixels"},
+    {"tile_size", T_INT, offsetof(Map, tile_size), READONLY,
+     "Side of the square tiles changes are tracked in, in pixels"},
+    {"tiles_per_side", T_INT, offsetof(Map, tiles_per_side), READONLY,
+     "Number of tiles along each side of the map"},
+    {NULL}  // Sentinel
+};
+
 #define TP_DOC_MAP \
 "A class for maps used in SLAM.\n"\
-"Map.__init__(size_pixels, size_meters, bytes=None)"
+"Map.__init__(size_pixels, size_meters, bytes=None, tile_size=32)\n"\
+"Supports the buffer protocol: memoryview(map) is a read-only, zero-copy\n"\
+"size_pixels x size_pixels view of the live 16-bit pixels (format 'H').\n"\
+"Tracks changes per tile_size x tile_size tile; see Map.changed_tiles()."
 
 
 static PyTypeObject pybreezyslam_MapType = 
@@ -640,7 +1086,11 @@ static PyTypeObject pybreezyslam_MapType =
     (reprfunc)Map_str,                          // tp_str
     0,                                          // tp_getattro
     0,                                          // tp_setattro
+#if PY_MAJOR_VERSION >= 3
+    &Map_as_buffer,                             // tp_as_buffer
+#else
     0,                                          // tp_as_buffer
+#endif
     Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,   // tp_flags
     TP_DOC_MAP,                                 // tp_doc 
     0,                                          // tp_traverse 
@@ -650,7 +1100,7 @@ static PyTypeObject pybreezyslam_MapType =
     0,                                          // tp_iter 
     0,                                          // tp_iternext 
     Map_methods,                         		// tp_methods 
-    0,                         					// tp_members 
+    Map_members,               					// tp_members 
     0,                                          // tp_getset 
     0,                                          // tp_base 
     0,                                          // tp_dict 
@@ -662,76 +1112,579 @@ static PyTypeObject pybreezyslam_MapType =
     Map_new,                                    // tp_new 
 };
 
-// Randomizer class ------------------------------------------------------------
+// MapPyramid class ------------------------------------------------------------
 
 typedef struct 
 {
     PyObject_HEAD
     
-    void * randomizer;
-    
-} Randomizer;
+    map_pyramid_t pyramid;
 
+    // The full-resolution map the pyramid was built from
+    Map * py_map;
+    
+} MapPyramid;
 
 static void
-Randomizer_dealloc(Randomizer* self)
+MapPyramid_dealloc(MapPyramid* self)
 {            
-    random_free(self->randomizer);
+    if (self->py_map)
+    {
+        map_pyramid_free(&self->pyramid);
+        Py_DECREF(self->py_map);
+    }
     
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
 static PyObject *
-Randomizer_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+MapPyramid_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 {    
-    Randomizer *self;
+    MapPyramid *self;
     
-    self = (Randomizer *)type->tp_alloc(type, 0);
+    self = (MapPyramid *)type->tp_alloc(type, 0);
     
     return (PyObject *)self;
 }
 
 static int
-Randomizer_init(Randomizer *self, PyObject *args, PyObject *kwds)
+MapPyramid_init(MapPyramid *self, PyObject *args, PyObject *kwds)
 {                    
-	int seed;
-	
-    if (!PyArg_ParseTuple(args, "i", &seed))
+    Map * py_map = NULL;
+    int levels = 0;
+    
+    static char * argnames[] = {"map", "levels", NULL};
+
+    if(!PyArg_ParseTupleAndKeywords(args, kwds,"Oi", argnames, 
+        &py_map, 
+        &levels))
     {
-        return error_on_raise_argument_exception("Randomizer");
+        return error_on_raise_argument_exception("MapPyramid");
     }
-    
-    self->randomizer = random_new(seed);
+
+    if (error_on_check_argument_type((PyObject *)py_map, &pybreezyslam_MapType, 0,
+            "pybreezyslam.Map", "MapPyramid", "__init__"))
+    {
+        return -1;
+    }
+
+    if (self->py_map)
+    {
+        return error_on_raise_argument_exception_with_details("MapPyramid", "__init__", 
+            "pyramid is already initialized");
+    }
+
+    // Keep the coarsest level big enough to match against
+    if (levels < 1 || (py_map->map.size_pixels >> levels) < 8)
+    {
+        return error_on_raise_argument_exception_with_details("MapPyramid", "__init__", 
+            "levels must be at least 1 and leave the coarsest level 8 pixels wide");
+    }
+
+    Py_INCREF(py_map);
+    self->py_map = py_map;
+
+    map_pyramid_init(&self->pyramid, &py_map->map, levels);
     
     return 0;
 }
 
-#define TP_DOC_RANDOMIZER \
-""
+static PyObject *
+MapPyramid_str(MapPyramid * self)
+{            
+    if (!self->py_map)
+    {
+        return PyUnicode_FromString("MapPyramid: uninitialized");
+    }
 
-static PyTypeObject pybreezyslam_RandomizerType = 
-{
-    #if PY_MAJOR_VERSION < 3
-    PyObject_HEAD_INIT(NULL)
-    0,                                          // ob_size
-    #else
-    PyVarObject_HEAD_INIT(NULL, 0)
-    #endif
-    "pybreezyslam.Randomizer",                // tp_name
-    sizeof(Randomizer),                         // tp_basicsize
-    0,                                          // tp_itemsize
-    (destructor)Randomizer_dealloc,             // tp_dealloc
-    0,                                          // tp_print
-    0,                                          // tp_getattr
-    0,                                          // tp_setattr
-    0,                                          // tp_compare
-    0,                                          // tp_repr
-    0,                                          // tp_as_number
-    0,                                          // tp_as_sequence
-    0,                                          // tp_as_positionping
-    0,                                          // tp_hash 
-    0,                                          // tp_call
-    0,                                          // tp_str
+    return PyUnicode_FromFormat("MapPyramid: %d levels below %d x %d pixels, coarsest %d x %d pixels",
+        self->pyramid.nlevels, 
+        self->py_map->map.size_pixels, self->py_map->map.size_pixels,
+        self->pyramid.levels[self->pyramid.nlevels-1].size_pixels,
+        self->pyramid.levels[self->pyramid.nlevels-1].size_pixels);
+}
+
+static PyObject *
+MapPyramid_update(MapPyramid *self, PyObject *args, PyObject *kwds)
+{   
+    Scan * py_scan = NULL;
+    Position * py_position = NULL;
+    double hole_width_mm = 0;
+	
+    if (!PyArg_ParseTuple(args, "OOd",
+        &py_scan,
+        &py_position,
+        &hole_width_mm))
+    {
+        return null_on_raise_argument_exception("MapPyramid", "update");
+    }
+         
+    if (error_on_check_argument_type((PyObject *)py_scan, &pybreezyslam_ScanType, 0,
+            "pybreezyslam.Scan", "MapPyramid", "update") ||
+        error_on_check_argument_type((PyObject *)py_position, &pybreezyslam_PositionType, 1,
+            "pybreezyslam.Position", "MapPyramid", "update"))
+    {
+        return NULL;
+    }
+
+    if (!self->py_map)
+    {
+        return null_on_raise_argument_exception_with_details("MapPyramid", "update", 
+            "pyramid is not initialized");
+    }
+            
+    position_t position = pypos2cpos(py_position);
+
+    int extent[4];
+    
+    // Pin the scan while the pyramid is updated without the GIL
+    Py_INCREF(py_scan);
+
+    Py_BEGIN_ALLOW_THREADS
+
+    map_update_extent(&self->py_map->map, &py_scan->scan, position, hole_width_mm, extent);
+
+    map_pyramid_update(&self->pyramid, &self->py_map->map, extent);
+
+    Py_END_ALLOW_THREADS
+
+    Py_DECREF(py_scan);
+
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+MapPyramid_rebuild(MapPyramid *self, PyObject *args, PyObject *kwds)
+{   
+    if (!self->py_map)
+    {
+        return null_on_raise_argument_exception_with_details("MapPyramid", "rebuild", 
+            "pyramid is not initialized");
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+
+    map_pyramid_update(&self->pyramid, &self->py_map->map, NULL);
+
+    Py_END_ALLOW_THREADS
+
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+MapPyramid_get(MapPyramid * self, PyObject * args, PyObject * kwds)
+{        
+    int level = 0;
+
+    if (!PyArg_ParseTuple(args, "i", &level))
+    {
+        return null_on_raise_argument_exception("MapPyramid", "get");
+    }
+
+    if (!self->py_map || level < 1 || level > self->pyramid.nlevels)
+    {
+        return null_on_raise_argument_exception_with_details("MapPyramid", "get", 
+            "level must be from 1 through the number of levels");
+    }
+
+    map_t * map = &self->pyramid.levels[level-1];
+
+    PyObject * py_mapbytes = 
+        PyByteArray_FromStringAndSize(NULL, (Py_ssize_t)map->size_pixels * map->size_pixels);
+
+    if (!py_mapbytes)
+    {
+        return NULL;
+    }
+
+    map_get(map, PyByteArray_AsString(py_mapbytes));
+
+    return py_mapbytes;
+}
+
+static PyMethodDef MapPyramid_methods[] = 
+{
+    {"update", (PyCFunction)MapPyramid_update, METH_VARARGS, 
+    "MapPyramid.update(Scan, Position, hole_width_mm) refreshes the coarse pixels covering the area\n"\
+    "that Map.update() with the same arguments changed.  Call it right after Map.update()."
+    },
+    {"rebuild", (PyCFunction)MapPyramid_rebuild, METH_NOARGS,
+    "MapPyramid.rebuild() recomputes every level from the map, e.g. after Map.set()."
+    },
+    {"get", (PyCFunction)MapPyramid_get, METH_VARARGS,
+    "MapPyramid.get(level) returns a new bytearray with the pixels of a level, where level 1 is\n"\
+    "half the resolution of the map."
+    },
+    {NULL}  // Sentinel 
+};
+
+#define TP_DOC_MAPPYRAMID \
+"Min-pooled, lower-resolution copies of a Map for coarse-to-fine search.\n"\
+"MapPyramid.__init__(map, levels)\n"\
+"Each level halves the resolution of the one above it and keeps the darkest\n"\
+"(most obstacle-like) pixel of each 2x2 block."
+
+static PyTypeObject pybreezyslam_MapPyramidType = 
+{
+    #if PY_MAJOR_VERSION < 3
+    PyObject_HEAD_INIT(NULL)
+    0,                                          // ob_size
+    #else
+    PyVarObject_HEAD_INIT(NULL, 0)
+    #endif
+    "pybreezyslam.MapPyramid",                // tp_name
+    sizeof(MapPyramid),                         // tp_basicsize
+    0,                                          // tp_itemsize
+    (destructor)MapPyramid_dealloc,             // tp_dealloc
+    0,                                          // tp_print
+    0,                                          // tp_getattr
+    0,                                          // tp_setattr
+    0,                                          // tp_compare
+    (reprfunc)MapPyramid_str,                   // tp_repr
+    0,                                          // tp_as_number
+    0,                                          // tp_as_sequence
+    0,                                          // tp_as_positionping
+    0,                                          // tp_hash 
+    0,                                          // tp_call
+    (reprfunc)MapPyramid_str,                   // tp_str
+    0,                                          // tp_getattro
+    0,                                          // tp_setattro
+    0,                                          // tp_as_buffer
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,   // tp_flags
+    TP_DOC_MAPPYRAMID,                          // tp_doc 
+    0,                                          // tp_traverse 
+    0,                                          // tp_clear 
+    0,                                          // tp_richcompare 
+    0,                                          // tp_weaklistoffset 
+    0,                                          // tp_iter 
+    0,                                          // tp_iternext 
+    MapPyramid_methods,                         // tp_methods 
+    0,                         					// tp_members 
+    0,                                          // tp_getset 
+    0,                                          // tp_base 
+    0,                                          // tp_dict 
+    0,                                          // tp_descr_get 
+    0,                                          // tp_descr_set 
+    0,                                          // tp_dictoffset 
+    (initproc)MapPyramid_init,                  // tp_init 
+    0,                                          // tp_alloc 
+    MapPyramid_new,                             // tp_new 
+};
+
+// LikelihoodField class -------------------------------------------------------
+
+typedef struct 
+{
+    PyObject_HEAD
+    
+    // Map holding the field pixels, matched against in place of the map
+    Map * py_field;
+
+    // The map the field is computed from
+    Map * py_map;
+
+    double falloff_mm;
+    
+} LikelihoodField;
+
+static void
+LikelihoodField_dealloc(LikelihoodField* self)
+{            
+    Py_XDECREF(self->py_field);
+    Py_XDECREF(self->py_map);
+    
+    Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+static PyObject *
+LikelihoodField_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{    
+    LikelihoodField *self;
+    
+    self = (LikelihoodField *)type->tp_alloc(type, 0);
+    
+    return (PyObject *)self;
+}
+
+static int
+LikelihoodField_init(LikelihoodField *self, PyObject *args, PyObject *kwds)
+{                    
+    Map * py_map = NULL;
+    double falloff_mm = 0;
+    
+    static char * argnames[] = {"map", "falloff_mm", NULL};
+
+    if(!PyArg_ParseTupleAndKeywords(args, kwds,"Od", argnames, 
+        &py_map, 
+        &falloff_mm))
+    {
+        return error_on_raise_argument_exception("LikelihoodField");
+    }
+
+    if (error_on_check_argument_type((PyObject *)py_map, &pybreezyslam_MapType, 0,
+            "pybreezyslam.Map", "LikelihoodField", "__init__"))
+    {
+        return -1;
+    }
+
+    if (self->py_map)
+    {
+        return error_on_raise_argument_exception_with_details("LikelihoodField", "__init__", 
+            "field is already initialized");
+    }
+
+    if (falloff_mm <= 0)
+    {
+        return error_on_raise_argument_exception_with_details("LikelihoodField", "__init__", 
+            "falloff_mm must be positive");
+    }
+
+    Map * py_field = (Map *)PyObject_CallFunction((PyObject *)&pybreezyslam_MapType, "id",
+        py_map->map.size_pixels, py_map->map.size_meters);
+
+    if (!py_field)
+    {
+        return -1;
+    }
+
+    Py_INCREF(py_map);
+    self->py_map = py_map;
+    self->py_field = py_field;
+    self->falloff_mm = falloff_mm;
+
+    map_distance_field(&py_field->map, &py_map->map, falloff_mm, NULL);
+    
+    return 0;
+}
+
+static PyObject *
+LikelihoodField_str(LikelihoodField * self)
+{            
+    if (!self->py_map)
+    {
+        return PyUnicode_FromString("LikelihoodField: uninitialized");
+    }
+
+    return PyUnicode_FromFormat("LikelihoodField: %d x %d pixels, cost rises over %d mm from walls",
+        self->py_map->map.size_pixels, self->py_map->map.size_pixels, (int)self->falloff_mm);
+}
+
+static PyObject *
+LikelihoodField_update(LikelihoodField *self, PyObject *args, PyObject *kwds)
+{   
+    Scan * py_scan = NULL;
+    Position * py_position = NULL;
+    double hole_width_mm = 0;
+	
+    if (!PyArg_ParseTuple(args, "OOd",
+        &py_scan,
+        &py_position,
+        &hole_width_mm))
+    {
+        return null_on_raise_argument_exception("LikelihoodField", "update");
+    }
+         
+    if (error_on_check_argument_type((PyObject *)py_scan, &pybreezyslam_ScanType, 0,
+            "pybreezyslam.Scan", "LikelihoodField", "update") ||
+        error_on_check_argument_type((PyObject *)py_position, &pybreezyslam_PositionType, 1,
+            "pybreezyslam.Position", "LikelihoodField", "update"))
+    {
+        return NULL;
+    }
+
+    if (!self->py_map)
+    {
+        return null_on_raise_argument_exception_with_details("LikelihoodField", "update", 
+            "field is not initialized");
+    }
+            
+    position_t position = pypos2cpos(py_position);
+
+    int extent[4];
+    
+    // Pin the scan while the field is updated without the GIL
+    Py_INCREF(py_scan);
+
+    Py_BEGIN_ALLOW_THREADS
+
+    map_update_extent(&self->py_map->map, &py_scan->scan, position, hole_width_mm, extent);
+
+    map_distance_field(&self->py_field->map, &self->py_map->map, self->falloff_mm, extent);
+
+    Py_END_ALLOW_THREADS
+
+    Py_DECREF(py_scan);
+
+    // The field changes up to the falloff distance beyond the map's extent
+    Map_touch(self->py_field, extent, (int)(self->falloff_mm * self->py_field->map.scale_pixels_per_mm) + 2);
+
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+LikelihoodField_rebuild(LikelihoodField *self, PyObject *args, PyObject *kwds)
+{   
+    if (!self->py_map)
+    {
+        return null_on_raise_argument_exception_with_details("LikelihoodField", "rebuild", 
+            "field is not initialized");
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+
+    map_distance_field(&self->py_field->map, &self->py_map->map, self->falloff_mm, NULL);
+
+    Py_END_ALLOW_THREADS
+
+    Map_touch(self->py_field, NULL, 0);
+
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef LikelihoodField_methods[] = 
+{
+    {"update", (PyCFunction)LikelihoodField_update, METH_VARARGS, 
+    "LikelihoodField.update(Scan, Position, hole_width_mm) recomputes the field around the area\n"\
+    "that Map.update() with the same arguments changed.  Call it right after Map.update()."
+    },
+    {"rebuild", (PyCFunction)LikelihoodField_rebuild, METH_NOARGS,
+    "LikelihoodField.rebuild() recomputes the whole field from the map, e.g. after Map.set()."
+    },
+    {NULL}  // Sentinel 
+};
+
+static PyMemberDef LikelihoodField_members[] = {
+    {"map", T_OBJECT_EX, offsetof(LikelihoodField, py_field), READONLY,
+    "Map holding the field; pass it to distanceScanToMap() or a position search in place of the map"},
+    {"falloff_mm", T_DOUBLE, offsetof(LikelihoodField, falloff_mm), READONLY,
+    "Distance over which cost rises from a wall to open space, in millimeters"},
+    {NULL}  /* Sentinel */
+};
+
+#define TP_DOC_LIKELIHOODFIELD \
+"Distance-transform field of a Map for smoother scan matching.\n"\
+"LikelihoodField.__init__(map, falloff_mm)\n"\
+"Each pixel holds the lowest map value plus a cost that rises with distance,\n"\
+"reaching open space falloff_mm from a wall, so walls keep their value and\n"\
+"scores fall off smoothly around them instead of in one-pixel steps."
+
+static PyTypeObject pybreezyslam_LikelihoodFieldType = 
+{
+    #if PY_MAJOR_VERSION < 3
+    PyObject_HEAD_INIT(NULL)
+    0,                                          // ob_size
+    #else
+    PyVarObject_HEAD_INIT(NULL, 0)
+    #endif
+    "pybreezyslam.LikelihoodField",             // tp_name
+    sizeof(LikelihoodField),                    // tp_basicsize
+    0,                                          // tp_itemsize
+    (destructor)LikelihoodField_dealloc,        // tp_dealloc
+    0,                                          // tp_print
+    0,                                          // tp_getattr
+    0,                                          // tp_setattr
+    0,                                          // tp_compare
+    (reprfunc)LikelihoodField_str,              // tp_repr
+    0,                                          // tp_as_number
+    0,                                          // tp_as_sequence
+    0,                                          // tp_as_positionping
+    0,                                          // tp_hash 
+    0,                                          // tp_call
+    (reprfunc)LikelihoodField_str,              // tp_str
+    0,                                          // tp_getattro
+    0,                                          // tp_setattro
+    0,                                          // tp_as_buffer
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,   // tp_flags
+    TP_DOC_LIKELIHOODFIELD,                     // tp_doc 
+    0,                                          // tp_traverse 
+    0,                                          // tp_clear 
+    0,                                          // tp_richcompare 
+    0,                                          // tp_weaklistoffset 
+    0,                                          // tp_iter 
+    0,                                          // tp_iternext 
+    LikelihoodField_methods,                    // tp_methods 
+    LikelihoodField_members,                    // tp_members 
+    0,                                          // tp_getset 
+    0,                                          // tp_base 
+    0,                                          // tp_dict 
+    0,                                          // tp_descr_get 
+    0,                                          // tp_descr_set 
+    0,                                          // tp_dictoffset 
+    (initproc)LikelihoodField_init,             // tp_init 
+    0,                                          // tp_alloc 
+    LikelihoodField_new,                        // tp_new 
+};
+
+// Randomizer class ------------------------------------------------------------
+
+typedef struct 
+{
+    PyObject_HEAD
+    
+    void * randomizer;
+    
+} Randomizer;
+
+
+static void
+Randomizer_dealloc(Randomizer* self)
+{            
+    random_free(self->randomizer);
+    
+    Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+static PyObject *
+Randomizer_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{    
+    Randomizer *self;
+    
+    self = (Randomizer *)type->tp_alloc(type, 0);
+    
+    return (PyObject *)self;
+}
+
+static int
+Randomizer_init(Randomizer *self, PyObject *args, PyObject *kwds)
+{                    
+	int seed;
+	
+    if (!PyArg_ParseTuple(args, "i", &seed))
+    {
+        return error_on_raise_argument_exception("Randomizer");
+    }
+    
+    self->randomizer = random_new(seed);
+    
+    return 0;
+}
+
+#define TP_DOC_RANDOMIZER \
+""
+
+static PyTypeObject pybreezyslam_RandomizerType = 
+{
+    #if PY_MAJOR_VERSION < 3
+    PyObject_HEAD_INIT(NULL)
+    0,                                          // ob_size
+    #else
+    PyVarObject_HEAD_INIT(NULL, 0)
+    #endif
+    "pybreezyslam.Randomizer",                // tp_name
+    sizeof(Randomizer),                         // tp_basicsize
+    0,                                          // tp_itemsize
+    (destructor)Randomizer_dealloc,             // tp_dealloc
+    0,                                          // tp_print
+    0,                                          // tp_getattr
+    0,                                          // tp_setattr
+    0,                                          // tp_compare
+    0,                                          // tp_repr
+    0,                                          // tp_as_number
+    0,                                          // tp_as_sequence
+    0,                                          // tp_as_positionping
+    0,                                          // tp_hash 
+    0,                                          // tp_call
+    0,                                          // tp_str
     0,                                          // tp_getattro
     0,                                          // tp_setattro
     0,                                          // tp_as_buffer
@@ -792,6 +1745,113 @@ distanceScanToMap(PyObject *self, PyObject *args)
     return PyLong_FromLong(distance_scan_to_map(&py_map->map, &py_scan->scan, c_position));
 }
 
+static PyObject *
+distanceScanToMapBatch(PyObject *self, PyObject *args)
+{
+    Map * py_map = NULL;
+    Scan * py_scan = NULL;
+    PyObject * py_poses = NULL;
+    int nthreads = 1;
+
+    // Extract Python objects for map, scan, poses, and optional thread count
+    if (!PyArg_ParseTuple(args, "OOO|i", &py_map, &py_scan, &py_poses, &nthreads))
+    {
+        return null_on_raise_argument_exception("pybreezyslam", "distanceScanToMapBatch");
+    }
+
+    // Check object types
+    if (error_on_check_argument_type((PyObject *)py_map, &pybreezyslam_MapType, 0,
+            "pybreezyslam.Map", "pybreezyslam", "distanceScanToMapBatch") ||
+        error_on_check_argument_type((PyObject *)py_scan, &pybreezyslam_ScanType, 1,
+            "pybreezyslam.Scan", "pybreezyslam", "distanceScanToMapBatch"))
+    {
+            return NULL;
+    }
+
+    // Poses must be a contiguous numeric buffer of (x_mm, y_mm, theta_degrees)
+    // triples: an Nx3 NumPy array, or a flat buffer of 3N values
+    Py_buffer poses_view;
+
+    if (!PyObject_CheckBuffer(py_poses) ||
+        PyObject_GetBuffer(py_poses, &poses_view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0)
+    {
+        PyErr_Clear();
+        return null_on_raise_argument_exception_with_details("pybreezyslam", "distanceScanToMapBatch",
+            "poses must be an Nx3 contiguous numeric buffer");
+    }
+
+    Py_ssize_t nvalues = poses_view.len / (poses_view.itemsize ? poses_view.itemsize : 1);
+
+    if (nvalues % 3 ||
+        !(poses_view.ndim == 1 || (poses_view.ndim == 2 && poses_view.shape[1] == 3)))
+    {
+        PyBuffer_Release(&poses_view);
+        return null_on_raise_argument_exception_with_details("pybreezyslam", "distanceScanToMapBatch",
+            "poses must be an Nx3 contiguous numeric buffer");
+    }
+
+    int nposes = (int)(nvalues / 3);
+    double * poses = (double *)PyMem_Malloc((nvalues ? nvalues : 1) * sizeof(double));
+    if (!poses)
+    {
+        PyBuffer_Release(&poses_view);
+        return PyErr_NoMemory();
+    }
+
+    int converted = doubles_from_buffer(&poses_view, poses);
+    PyBuffer_Release(&poses_view);
+
+    if (!converted)
+    {
+        PyMem_Free(poses);
+        return null_on_raise_argument_exception_with_details("pybreezyslam", "distanceScanToMapBatch",
+            "poses buffer must hold numbers");
+    }
+
+    int * distances = (int *)PyMem_Malloc((nposes ? nposes : 1) * sizeof(int));
+    if (!distances)
+    {
+        PyMem_Free(poses);
+        return PyErr_NoMemory();
+    }
+
+    // Pin the map and scan, since other threads may run while the GIL is released
+    Py_INCREF(py_map);
+    Py_INCREF(py_scan);
+
+    Py_BEGIN_ALLOW_THREADS
+
+    distance_scan_to_map_batch(
+        &py_map->map,
+        &py_scan->scan,
+        poses,
+        nposes,
+        distances,
+        nthreads);
+
+    Py_END_ALLOW_THREADS
+
+    Py_DECREF(py_scan);
+    Py_DECREF(py_map);
+
+    PyMem_Free(poses);
+
+    // Return the scores as an array.array('i'), which NumPy can wrap without copying
+    PyObject * py_distances = NULL;
+    PyObject * py_bytes = PyBytes_FromStringAndSize((const char *)distances, nposes * sizeof(int));
+    PyObject * py_array_module = PyImport_ImportModule("array");
+    if (py_bytes && py_array_module)
+    {
+        py_distances = PyObject_CallMethod(py_array_module, "array", "sO", "i", py_bytes);
+    }
+    Py_XDECREF(py_array_module);
+    Py_XDECREF(py_bytes);
+
+    PyMem_Free(distances);
+
+    return py_distances;
+}
+
 // Called internally, so minimal type-checking on arguments
 static PyObject *
 rmhcPositionSearch(PyObject *self, PyObject *args)
@@ -822,7 +1882,17 @@ rmhcPositionSearch(PyObject *self, PyObject *args)
     // Convert Python objects to C structures
     position_t start_pos = pypos2cpos(py_start_pos);
 
-	position_t likeliest_position = 
+    // Pin every object the search touches, since other threads may run while
+    // the GIL is released
+    Py_INCREF(py_map);
+    Py_INCREF(py_scan);
+    Py_INCREF(py_randomizer);
+
+	position_t likeliest_position;
+
+    Py_BEGIN_ALLOW_THREADS
+
+    likeliest_position =
     rmhc_position_search(
         start_pos,
         &py_map->map,
@@ -831,6 +1901,12 @@ rmhcPositionSearch(PyObject *self, PyObject *args)
         sigma_theta_degrees,
         max_search_iter,
         py_randomizer->randomizer);    
+
+    Py_END_ALLOW_THREADS
+
+    Py_DECREF(py_randomizer);
+    Py_DECREF(py_scan);
+    Py_DECREF(py_map);
     
     
     // Convert C position back to Python object
@@ -846,6 +1922,367 @@ rmhcPositionSearch(PyObject *self, PyObject *args)
     
 }
 
+// Called internally, so minimal type-checking on arguments
+static PyObject *
+rmhcPositionSearchParallel(PyObject *self, PyObject *args)
+{
+    Position * py_start_pos = NULL;
+    Map * py_map = NULL;
+    Scan * py_scan = NULL;
+    PyObject * py_laser = NULL;
+    double sigma_xy_mm = 0;
+    double sigma_theta_degrees = 0;
+    int max_search_iter = 0;
+    PyObject * py_randomizers = NULL;
+
+    // Extract Python objects for map, scan, position, and randomizer sequence
+    if (!PyArg_ParseTuple(args, "OOOOddiO",
+        &py_start_pos,
+        &py_map,
+        &py_scan,
+        &py_laser,
+        &sigma_xy_mm,
+        &sigma_theta_degrees,
+        &max_search_iter,
+        &py_randomizers))
+    {
+        return null_on_raise_argument_exception("breezyslam.algorithms", "rmhcPositionSearchParallel");
+    }
+
+    PyObject * py_randomizer_seq = PySequence_Fast(py_randomizers,
+        "rmhcPositionSearchParallel: randomizers must be a sequence of Randomizer objects");
+    if (!py_randomizer_seq)
+    {
+        return NULL;
+    }
+
+    int nchains = (int)PySequence_Fast_GET_SIZE(py_randomizer_seq);
+
+    if (nchains < 1)
+    {
+        Py_DECREF(py_randomizer_seq);
+        PyErr_SetString(PyExc_ValueError, "rmhcPositionSearchParallel: need at least one randomizer");
+        return NULL;
+    }
+
+    Randomizer ** py_randomizer_list = (Randomizer **)PyMem_Malloc(nchains * sizeof(Randomizer *));
+    void ** randomizers = (void **)PyMem_Malloc(nchains * sizeof(void *));
+    if (!py_randomizer_list || !randomizers)
+    {
+        PyMem_Free(py_randomizer_list);
+        PyMem_Free(randomizers);
+        Py_DECREF(py_randomizer_seq);
+        return PyErr_NoMemory();
+    }
+
+    int k = 0;
+    for (k=0; k<nchains; ++k)
+    {
+        PyObject * py_randomizer = PySequence_Fast_GET_ITEM(py_randomizer_seq, k);
+
+        if (error_on_check_argument_type(py_randomizer, &pybreezyslam_RandomizerType, k,
+                "pybreezyslam.Randomizer", "pybreezyslam", "rmhcPositionSearchParallel"))
+        {
+            PyMem_Free(py_randomizer_list);
+            PyMem_Free(randomizers);
+            Py_DECREF(py_randomizer_seq);
+            return NULL;
+        }
+
+        py_randomizer_list[k] = (Randomizer *)py_randomizer;
+        randomizers[k] = py_randomizer_list[k]->randomizer;
+    }
+
+    // Convert Python objects to C structures
+    position_t start_pos = pypos2cpos(py_start_pos);
+
+    // Pin every object the chains touch, since other threads may run while
+    // the GIL is released
+    Py_INCREF(py_map);
+    Py_INCREF(py_scan);
+    for (k=0; k<nchains; ++k)
+    {
+        Py_INCREF(py_randomizer_list[k]);
+    }
+
+    position_t likeliest_position;
+
+    Py_BEGIN_ALLOW_THREADS
+
+    likeliest_position =
+    rmhc_position_search_parallel(
+        start_pos,
+        &py_map->map,
+        &py_scan->scan,
+        sigma_xy_mm,
+        sigma_theta_degrees,
+        max_search_iter,
+        randomizers,
+        nchains);
+
+    Py_END_ALLOW_THREADS
+
+    for (k=0; k<nchains; ++k)
+    {
+        Py_DECREF(py_randomizer_list[k]);
+    }
+    Py_DECREF(py_scan);
+    Py_DECREF(py_map);
+    PyMem_Free(py_randomizer_list);
+    PyMem_Free(randomizers);
+    Py_DECREF(py_randomizer_seq);
+
+    // Convert C position back to Python object
+    PyObject * argList = Py_BuildValue("ddd",
+        likeliest_position.x_mm,
+        likeliest_position.y_mm,
+        likeliest_position.theta_degrees);
+    PyObject * py_likeliest_position =
+    PyObject_CallObject((PyObject *) &pybreezyslam_PositionType, argList);
+    Py_DECREF(argList);
+
+    return py_likeliest_position;
+}
+
+// Called internally, so minimal type-checking on arguments
+static PyObject *
+rmhcPositionSearchMultiRes(PyObject *self, PyObject *args)
+{
+    Position * py_start_pos = NULL;
+    Map * py_map = NULL;
+    MapPyramid * py_pyramid = NULL;
+    Scan * py_scan = NULL;
+    PyObject * py_laser = NULL;
+    double sigma_xy_mm = 0;
+    double sigma_theta_degrees = 0;
+    PyObject * py_max_search_iters = NULL;
+    Randomizer * py_randomizer = NULL;
+
+    // Extract Python objects for map, pyramid, scan, position, and iteration counts
+    if (!PyArg_ParseTuple(args, "OOOOOddOO",
+        &py_start_pos,
+        &py_map,
+        &py_pyramid,
+        &py_scan,
+        &py_laser,
+        &sigma_xy_mm,
+        &sigma_theta_degrees,
+        &py_max_search_iters,
+        &py_randomizer))
+    {
+        return null_on_raise_argument_exception("breezyslam.algorithms", "rmhcPositionSearchMultiRes");
+    }
+
+    if (error_on_check_argument_type((PyObject *)py_pyramid, &pybreezyslam_MapPyramidType, 2,
+            "pybreezyslam.MapPyramid", "pybreezyslam", "rmhcPositionSearchMultiRes"))
+    {
+        return NULL;
+    }
+
+    if (py_pyramid->py_map != py_map)
+    {
+        return null_on_raise_argument_exception_with_details("pybreezyslam", "rmhcPositionSearchMultiRes",
+            "pyramid was not built from this map");
+    }
+
+    int nlevels = py_pyramid->pyramid.nlevels;
+
+    PyObject * py_iter_seq = PySequence_Fast(py_max_search_iters,
+        "rmhcPositionSearchMultiRes: max_iters must be a sequence of integers");
+    if (!py_iter_seq)
+    {
+        return NULL;
+    }
+
+    if (PySequence_Fast_GET_SIZE(py_iter_seq) != nlevels + 1)
+    {
+        Py_DECREF(py_iter_seq);
+        return null_on_raise_argument_exception_with_details("pybreezyslam", "rmhcPositionSearchMultiRes",
+            "need one iteration count per pyramid level plus one for the full map");
+    }
+
+    int * max_search_iters = (int *)PyMem_Malloc((nlevels + 1) * sizeof(int));
+    if (!max_search_iters)
+    {
+        Py_DECREF(py_iter_seq);
+        return PyErr_NoMemory();
+    }
+
+    int k = 0;
+    for (k=0; k<=nlevels; ++k)
+    {
+        max_search_iters[k] = (int)PyLong_AsLong(PySequence_Fast_GET_ITEM(py_iter_seq, k));
+    }
+
+    Py_DECREF(py_iter_seq);
+
+    if (PyErr_Occurred())
+    {
+        PyMem_Free(max_search_iters);
+        return NULL;
+    }
+
+    // Convert Python objects to C structures
+    position_t start_pos = pypos2cpos(py_start_pos);
+
+    // Pin every object the search touches, since other threads may run while
+    // the GIL is released
+    Py_INCREF(py_map);
+    Py_INCREF(py_pyramid);
+    Py_INCREF(py_scan);
+    Py_INCREF(py_randomizer);
+
+    position_t likeliest_position;
+
+    Py_BEGIN_ALLOW_THREADS
+
+    likeliest_position =
+    rmhc_position_search_multires(
+        start_pos,
+        &py_map->map,
+        &py_pyramid->pyramid,
+        &py_scan->scan,
+        sigma_xy_mm,
+        sigma_theta_degrees,
+        max_search_iters,
+        py_randomizer->randomizer);
+
+    Py_END_ALLOW_THREADS
+
+    Py_DECREF(py_randomizer);
+    Py_DECREF(py_scan);
+    Py_DECREF(py_pyramid);
+    Py_DECREF(py_map);
+    PyMem_Free(max_search_iters);
+
+    // Convert C position back to Python object
+    PyObject * argList = Py_BuildValue("ddd",
+        likeliest_position.x_mm,
+        likeliest_position.y_mm,
+        likeliest_position.theta_degrees);
+    PyObject * py_likeliest_position =
+    PyObject_CallObject((PyObject *) &pybreezyslam_PositionType, argList);
+    Py_DECREF(argList);
+
+    return py_likeliest_position;
+}
+
+// Called internally, so minimal type-checking on arguments
+static PyObject *
+correlativePositionSearch(PyObject *self, PyObject *args)
+{
+    Position * py_start_pos = NULL;
+    Map * py_map = NULL;
+    Scan * py_scan = NULL;
+    PyObject * py_laser = NULL;
+    double window_xy_mm = 0;
+    double window_theta_degrees = 0;
+    double step_theta_degrees = 0;
+
+    // Extract Python objects for map, scan, and position
+    if (!PyArg_ParseTuple(args, "OOOOddd",
+        &py_start_pos,
+        &py_map,
+        &py_scan,
+        &py_laser,
+        &window_xy_mm,
+        &window_theta_degrees,
+        &step_theta_degrees))
+    {
+        return null_on_raise_argument_exception("breezyslam.algorithms", "correlativePositionSearch");
+    }
+
+    if (step_theta_degrees <= 0)
+    {
+        return null_on_raise_argument_exception_with_details("pybreezyslam", "correlativePositionSearch",
+            "step_theta_degrees must be positive");
+    }
+
+    // Convert Python objects to C structures
+    position_t start_pos = pypos2cpos(py_start_pos);
+
+    // Pin every object the search touches, since other threads may run while
+    // the GIL is released
+    Py_INCREF(py_map);
+    Py_INCREF(py_scan);
+
+    position_t likeliest_position;
+
+    Py_BEGIN_ALLOW_THREADS
+
+    likeliest_position =
+    correlative_position_search(
+        start_pos,
+        &py_map->map,
+        &py_scan->scan,
+        window_xy_mm,
+        window_theta_degrees,
+        step_theta_degrees);
+
+    Py_END_ALLOW_THREADS
+
+    Py_DECREF(py_scan);
+    Py_DECREF(py_map);
+
+    // Convert C position back to Python object
+    PyObject * argList = Py_BuildValue("ddd",
+        likeliest_position.x_mm,
+        likeliest_position.y_mm,
+        likeliest_position.theta_degrees);
+    PyObject * py_likeliest_position =
+    PyObject_CallObject((PyObject *) &pybreezyslam_PositionType, argList);
+    Py_DECREF(argList);
+
+    return py_likeliest_position;
+}
+
+static PyObject *
+distanceBackend(PyObject *self, PyObject *args)
+{
+    return PyUnicode_FromString(distance_scan_to_map_backend());
+}
+
+static PyObject *
+distanceBackends(PyObject *self, PyObject *args)
+{
+    const char * names[8];
+
+    int count = distance_scan_to_map_backends(names, 8);
+
+    PyObject * py_names = PyList_New(count);
+    if (!py_names)
+    {
+        return NULL;
+    }
+
+    int k = 0;
+    for (k=0; k<count; ++k)
+    {
+        PyList_SET_ITEM(py_names, k, PyUnicode_FromString(names[k]));
+    }
+
+    return py_names;
+}
+
+static PyObject *
+useDistanceBackend(PyObject *self, PyObject *args)
+{
+    const char * name = NULL;
+
+    if (!PyArg_ParseTuple(args, "s", &name))
+    {
+        return null_on_raise_argument_exception("pybreezyslam", "useDistanceBackend");
+    }
+
+    if (!distance_scan_to_map_use_backend(name))
+    {
+        PyErr_Format(PyExc_ValueError, "distance backend '%s' is not available on this build or CPU", name);
+        return NULL;
+    }
+
+    Py_RETURN_NONE;
+}
+
 
 static PyMethodDef module_methods[] = 
 {
@@ -857,10 +2294,48 @@ static PyMethodDef module_methods[] =
     "scan is a breezyslam.components.Scan object\n"\
     "position is a breezyslam.components.Position object\n"\
     },
+    {"distanceScanToMapBatch", distanceScanToMapBatch, METH_VARARGS,
+        "distanceScanToMapBatch(map, scan, poses, threads=1)\n"
+    "Computes distanceScanToMap for many hypothetical positions in one call, without holding the GIL.\n"
+    "Returns an array.array('i') with one distance per pose; -1 for infinity.\n"
+    "map is a breezyslam.components.Map object\n"
+    "scan is a breezyslam.components.Scan object\n"
+    "poses is an Nx3 NumPy array (or any contiguous numeric buffer) of x_mm, y_mm, theta_degrees rows\n"
+    "threads splits the poses across that many native threads\n"
+    },
+    {"distanceBackend", distanceBackend, METH_NOARGS,
+        "distanceBackend()\n"
+    "Returns the name of the distanceScanToMap implementation in use (e.g. 'avx2', 'sse3', 'scalar').\n"
+    },
+    {"distanceBackends", distanceBackends, METH_NOARGS,
+        "distanceBackends()\n"
+    "Returns the names of the distanceScanToMap implementations this build and CPU support, fastest first.\n"
+    },
+    {"useDistanceBackend", useDistanceBackend, METH_VARARGS,
+        "useDistanceBackend(name)\n"
+    "Switches every scan-matching search to the named distanceScanToMap implementation.\n"
+    "The fastest supported one is chosen automatically; this is mainly for benchmarks and tests.\n"
+    },
     {"rmhcPositionSearch", rmhcPositionSearch, METH_VARARGS,
         "rmhcPositionSearch(startpos, map, scan, laser, sigma_xy_mm, max_iter, randomizer)\n"
     "Internal use only."
     },
+    {"rmhcPositionSearchParallel", rmhcPositionSearchParallel, METH_VARARGS,
+        "rmhcPositionSearchParallel(startpos, map, scan, laser, sigma_xy_mm, max_iter, randomizers)\n"
+    "Runs one search chain per randomizer on native threads and returns the best position.\n"
+    "Internal use only."
+    },
+    {"rmhcPositionSearchMultiRes", rmhcPositionSearchMultiRes, METH_VARARGS,
+        "rmhcPositionSearchMultiRes(startpos, map, pyramid, scan, laser, sigma_xy_mm, sigma_theta_degrees, max_iters, randomizer)\n"
+    "Searches the coarsest pyramid level first and refines on each finer level and the map.\n"
+    "max_iters holds one iteration count per pyramid level, coarsest first, then one for the map.\n"
+    "Internal use only."
+    },
+    {"correlativePositionSearch", correlativePositionSearch, METH_VARARGS,
+        "correlativePositionSearch(startpos, map, scan, laser, window_xy_mm, window_theta_degrees, step_theta_degrees)\n"
+    "Scores every pose on a grid around startpos and returns the best; deterministic.\n"
+    "Internal use only."
+    },
     {NULL, NULL, 0, NULL}        /* Sentinel */
 };
 
@@ -868,6 +2343,8 @@ static void add_classes(PyObject * module)
 {
     add_class(module, &pybreezyslam_ScanType, "Scan");
     add_class(module, &pybreezyslam_MapType, "Map");
+    add_class(module, &pybreezyslam_MapPyramidType, "MapPyramid");
+    add_class(module, &pybreezyslam_LikelihoodFieldType, "LikelihoodField");
     add_class(module, &pybreezyslam_PositionType, "Position");
     add_class(module, &pybreezyslam_RandomizerType, "Randomizer");
 }
@@ -877,6 +2354,8 @@ static int types_are_ready(void)
 return 
     type_is_ready(&pybreezyslam_ScanType) &&
     type_is_ready(&pybreezyslam_MapType) &&
+    type_is_ready(&pybreezyslam_MapPyramidType) &&
+    type_is_ready(&pybreezyslam_LikelihoodFieldType) &&
     type_is_ready(&pybreezyslam_PositionType) &&
     type_is_ready(&pybreezyslam_RandomizerType);
 }
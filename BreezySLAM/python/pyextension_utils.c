@@ -18,6 +18,8 @@ along with this code.  If not, see <http://www.gnu.org/licenses/>.
 */
 
 #include <Python.h>
+#include <stdint.h>
+#include <string.h>
 
 static void raise_argument_exception(const char * classname, const char *  methodname, const char * details)
 {
@@ -136,3 +138,155 @@ error_on_check_argument_type(
     
     return 0;
 }
+
+
+/* Buffer-protocol helpers ------------------------------------------------- */
+
+typedef enum
+{
+    BUFFER_UNSUPPORTED,
+    BUFFER_INT8,   BUFFER_UINT8,
+    BUFFER_INT16,  BUFFER_UINT16,
+    BUFFER_INT32,  BUFFER_UINT32,
+    BUFFER_INT64,  BUFFER_UINT64,
+    BUFFER_FLOAT32,
+    BUFFER_FLOAT64
+
+} buffer_type_t;
+
+static buffer_type_t buffer_type(Py_buffer * view)
+{
+    const char * fmt = view->format ? view->format : "B";
+
+    /* Native or little-endian only; all supported targets are little-endian */
+    if (*fmt == '@' || *fmt == '=' || *fmt == '<')
+    {
+        fmt++;
+    }
+
+    if (!fmt[0] || fmt[1])
+    {
+        return BUFFER_UNSUPPORTED;
+    }
+
+    if (fmt[0] == 'f' && view->itemsize == 4)
+    {
+        return BUFFER_FLOAT32;
+    }
+
+    if (fmt[0] == 'd' && view->itemsize == 8)
+    {
+        return BUFFER_FLOAT64;
+    }
+
+    /* Dispatch integers on itemsize, since '<l' and native 'l' differ in width */
+    if (strchr("bhilq", fmt[0]))
+    {
+        switch (view->itemsize)
+        {
+            case 1: return BUFFER_INT8;
+            case 2: return BUFFER_INT16;
+            case 4: return BUFFER_INT32;
+            case 8: return BUFFER_INT64;
+        }
+    }
+
+    if (strchr("BHILQ", fmt[0]))
+    {
+        switch (view->itemsize)
+        {
+            case 1: return BUFFER_UINT8;
+            case 2: return BUFFER_UINT16;
+            case 4: return BUFFER_UINT32;
+            case 8: return BUFFER_UINT64;
+        }
+    }
+
+    return BUFFER_UNSUPPORTED;
+}
+
+static double buffer_item(const void * buf, buffer_type_t type, Py_ssize_t k)
+{
+    switch (type)
+    {
+        case BUFFER_INT8:    return ((const int8_t *)buf)[k];
+        case BUFFER_UINT8:   return ((const uint8_t *)buf)[k];
+        case BUFFER_INT16:   return ((const int16_t *)buf)[k];
+        case BUFFER_UINT16:  return ((const uint16_t *)buf)[k];
+        case BUFFER_INT32:   return ((const int32_t *)buf)[k];
+        case BUFFER_UINT32:  return ((const uint32_t *)buf)[k];
+        case BUFFER_INT64:   return (double)((const int64_t *)buf)[k];
+        case BUFFER_UINT64:  return (double)((const uint64_t *)buf)[k];
+        case BUFFER_FLOAT32: return ((const float *)buf)[k];
+        case BUFFER_FLOAT64: return ((const double *)buf)[k];
+        default:             return 0;
+    }
+}
+
+int buffer_holds_ints(Py_buffer * view)
+{
+    return view->ndim == 1 && sizeof(int) == 4 && buffer_type(view) == BUFFER_INT32;
+}
+
+int ints_from_buffer(Py_buffer * view, int * dst)
+{
+    buffer_type_t type = buffer_type(view);
+    Py_ssize_t count = view->len / (view->itemsize ? view->itemsize : 1);
+    Py_ssize_t k = 0;
+
+    if (view->ndim != 1 || type == BUFFER_UNSUPPORTED)
+    {
+        return 0;
+    }
+
+    if (buffer_holds_ints(view))
+    {
+        memcpy(dst, view->buf, count * sizeof(int));
+        return 1;
+    }
+
+    for (k=0; k<count; ++k)
+    {
+        dst[k] = (int)buffer_item(view->buf, type, k);
+    }
+
+    return 1;
+}
+
+int floats_from_buffer(Py_buffer * view, float * dst)
+{
+    buffer_type_t type = buffer_type(view);
+    Py_ssize_t count = view->len / (view->itemsize ? view->itemsize : 1);
+    Py_ssize_t k = 0;
+
+    if (view->ndim != 1 || type == BUFFER_UNSUPPORTED)
+    {
+        return 0;
+    }
+
+    for (k=0; k<count; ++k)
+    {
+        dst[k] = (float)buffer_item(view->buf, type, k);
+    }
+
+    return 1;
+}
+
+int doubles_from_buffer(Py_buffer * view, double * dst)
+{
+    buffer_type_t type = buffer_type(view);
+    Py_ssize_t count = view->len / (view->itemsize ? view->itemsize : 1);
+    Py_ssize_t k = 0;
+
+    if (type == BUFFER_UNSUPPORTED)
+    {
+        return 0;
+    }
+
+    for (k=0; k<count; ++k)
+    {
+        dst[k] = buffer_item(view->buf, type, k);
+    }
+
+    return 1;
+}
@@ -143,4 +143,41 @@ error_on_check_argument_type(
     const char * classname,
     const char *methodname);
 
+/**
+* Returns 1 if a buffer is a one-dimensional array of native C ints, so its
+* memory can be handed to the C core without copying; 0 otherwise.
+* @param view the buffer, obtained with PyBUF_FORMAT
+*/
+int
+buffer_holds_ints(
+    Py_buffer * view);
+
+/**
+* Copies a one-dimensional numeric buffer (NumPy array, array.array, memoryview)
+* into an int array, truncating floating-point values.
+* @param view the buffer, obtained with PyBUF_FORMAT
+* @param dst gets the values; must hold at least view->len / view->itemsize items
+* @return 1 on success, 0 if the buffer is not one-dimensional or not numeric
+*/
+int
+ints_from_buffer(
+    Py_buffer * view,
+    int * dst);
 
+/**
+* Copies a one-dimensional numeric buffer into a float array.
+* @return 1 on success, 0 if the buffer is not one-dimensional or not numeric
+*/
+int
+floats_from_buffer(
+    Py_buffer * view,
+    float * dst);
+
+/**
+* Copies a numeric buffer of any dimension, in C order, into a double array.
+* @return 1 on success, 0 if the buffer is not numeric
+*/
+int
+doubles_from_buffer(
+    Py_buffer * view,
+    double * dst);
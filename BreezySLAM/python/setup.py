@@ -21,21 +21,29 @@ along with this code.  If not, see <http://www.gnu.org/licenses/>.
 
 # Support streaming SIMD extensions
 
+from os import environ
 from platform import machine
+from sys import platform
 
-OPT_FLAGS  = []
+# Optimized by default; set BREEZYSLAM_DEBUG=1 for an unoptimized build with symbols
+OPT_FLAGS  = ['-O0', '-g'] if environ.get('BREEZYSLAM_DEBUG') else ['-O3']
 SIMD_FLAGS = []
+ARCH_SOURCES = []
+
+# Parallel RMHC search runs chains on native threads (Win32 threads on Windows)
+THREAD_FLAGS = [] if platform == 'win32' else ['-pthread']
 
 arch = machine()
 
 print(arch)
 
+# On x86 the SSE3 and AVX2/FMA code is compiled per function and chosen at run time,
+# so no global SIMD flags are needed
 if  arch in ['i686', 'x86_64']:
-    SIMD_FLAGS = ['-msse3']
     arch = 'i686'
+    ARCH_SOURCES = ['../c/coreslam_avx2.c']
 
 elif arch == 'armv7l':
-    OPT_FLAGS = ['-O3']
     SIMD_FLAGS = ['-mfpu=neon']
 
 else:
@@ -45,7 +53,9 @@ SOURCES = [
     'pybreezyslam.c', 
     'pyextension_utils.c', 
     '../c/coreslam.c', 
-    '../c/coreslam_' + arch + '.c',
+    '../c/coreslam_' + arch + '.c'] + ARCH_SOURCES + [
+    '../c/coreslam_parallel.c',
+    '../c/coreslam_correlative.c',
     '../c/random.c',
     '../c/ziggurat.c']
 
@@ -53,7 +63,8 @@ from distutils.core import setup, Extension
 
 module = Extension('pybreezyslam', 
     sources = SOURCES, 
-    extra_compile_args = ['-std=gnu99'] + SIMD_FLAGS + OPT_FLAGS
+    extra_compile_args = ['-std=gnu99'] + SIMD_FLAGS + OPT_FLAGS + THREAD_FLAGS,
+    extra_link_args = THREAD_FLAGS
     )
 
 
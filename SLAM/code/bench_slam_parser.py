@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Microbenchmark: list-based SCN3 parser vs the NumPy parse path in slam_parser.
+
+    python bench_slam_parser.py [iterations]
+
+The legacy implementation is kept here verbatim so the two can be compared on
+identical payloads; the script also checks that both produce the same scan.
+"""
+from __future__ import annotations
+
+import struct
+import sys
+import timeit
+from typing import List, Optional
+
+import numpy as np
+
+import slam_parser
+from slam_parser import (
+    HARD_MIN_VALID_BINS,
+    MAX_CONSECUTIVE_MISSING,
+    MAX_RANGE_MM,
+    MIN_RANGE_MM,
+    SCAN_BINS,
+    parse_scan,
+)
+
+ZONES = [(45, 5), (150, 6), (238, 5), (344, 5)]
+
+
+# ---- legacy implementation (pre-NumPy parse path) ----
+
+def _legacy_fill_gaps(distances_mm: List[int]) -> Optional[List[int]]:
+    arr = np.array(distances_mm, dtype=float)
+    arr[(arr < MIN_RANGE_MM) | (arr > MAX_RANGE_MM)] = np.nan
+
+    valid = np.isfinite(arr)
+    if int(valid.sum()) < HARD_MIN_VALID_BINS:
+        return None
+
+    missing = (~valid).astype(int)
+    doubled = np.concatenate([missing, missing])
+    best = cur = 0
+    for x in doubled:
+        cur = (cur + 1) if x else 0
+        best = max(best, cur)
+    if min(best, SCAN_BINS) > MAX_CONSECUTIVE_MISSING:
+        return None
+
+    idx = np.arange(SCAN_BINS)
+    valid_idx = idx[valid]
+    valid_vals = arr[valid]
+    wrap_idx = np.concatenate([valid_idx - SCAN_BINS, valid_idx, valid_idx + SCAN_BINS])
+    wrap_vals = np.tile(valid_vals, 3)
+
+    interp = np.interp(idx, wrap_idx, wrap_vals)
+    interp = np.clip(interp, MIN_RANGE_MM, MAX_RANGE_MM)
+    return interp.astype(int).tolist()
+
+
+def _legacy_apply_exclusions(distances: list, zones: list) -> list:
+    out = list(distances)
+    for center, half_width in zones:
+        for offset in range(-half_width, half_width + 1):
+            out[(center + offset) % SCAN_BINS] = 0
+    return out
+
+
+def legacy_parse_scan(payload: bytes, reverse_scan: bool = True, exclusion_zones: list = None):
+    distances = list(struct.unpack_from("<360H", payload, 14))
+    if exclusion_zones:
+        distances = _legacy_apply_exclusions(distances, exclusion_zones)
+    filled = _legacy_fill_gaps(distances)
+    if filled is None:
+        raise ValueError("rejected")
+    if reverse_scan:
+        filled = filled[::-1]
+    valid_bins = sum(1 for d in distances if MIN_RANGE_MM <= d <= MAX_RANGE_MM)
+    return filled, valid_bins
+
+
+# ---- harness ----
+
+def make_payload(rng: np.random.Generator, seq: int) -> bytes:
+    d = rng.integers(400, 6000, SCAN_BINS)
+    d[rng.random(SCAN_BINS) < 0.15] = 0          # sparse dropouts
+    start = int(rng.integers(0, SCAN_BINS))
+    d[(start + np.arange(40)) % SCAN_BINS] = 0   # one wide gap, sometimes wrapping
+    return b"SCN3" + struct.pack("<IIH", seq, seq * 100, SCAN_BINS) + d.astype("<u2").tobytes()
+
+
+def check_equivalent(payloads):
+    for p in payloads:
+        old, old_valid = legacy_parse_scan(p, exclusion_zones=ZONES)
+        new = parse_scan(p, exclusion_zones=ZONES)
+        assert new.distances_mm == old, "distance mismatch"
+        assert new.valid_bins == old_valid, "valid_bins mismatch"
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = np.random.default_rng(0)
+    payloads = [make_payload(rng, i) for i in range(64)]
+    check_equivalent(payloads)
+
+    cases = [
+        ("legacy (list)", lambda p: legacy_parse_scan(p, exclusion_zones=ZONES)),
+        ("numpy  (list)", lambda p: parse_scan(p, exclusion_zones=ZONES)),
+        ("numpy  (int32 array)", lambda p: parse_scan(p, exclusion_zones=ZONES, as_array=True)),
+    ]
+
+    print(f"{iterations} scans, {len(ZONES)} exclusion zones ({slam_parser.__file__})")
+    baseline = None
+    for name, fn in cases:
+        def run():
+            for i in range(iterations):
+                fn(payloads[i % len(payloads)])
+        best = min(timeit.repeat(run, number=1, repeat=5))
+        per_scan_us = best / iterations * 1e6
+        baseline = baseline or per_scan_us
+        print(f"  {name:<22} {per_scan_us:8.1f} us/scan   x{baseline / per_scan_us:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
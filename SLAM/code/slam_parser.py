@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import re
 import struct
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -17,80 +20,145 @@ HARD_MIN_VALID_BINS = 30
 class ParsedScan:
     seq: int
     ts_robot_ms: int
-    distances_mm: List[int]
+    distances_mm: Union[List[int], np.ndarray]
     valid_bins: int
 
 
-def _fill_gaps(distances_mm: List[int]) -> Optional[List[int]]:
-    arr = np.array(distances_mm, dtype=float)
-    arr[(arr < MIN_RANGE_MM) | (arr > MAX_RANGE_MM)] = np.nan
+SCN3_HEADER_BYTES = 4 + 4 + 4 + 2
+SCN3_PAYLOAD_BYTES = SCN3_HEADER_BYTES + SCAN_BINS * 2
+
+_BIN_INDEX = np.arange(SCAN_BINS)
+
+
+def _longest_circular_gap(valid_idx: np.ndarray) -> int:
+    """Longest run of missing bins between sorted valid bin indices, wrapping 359 -> 0."""
+    gaps = np.diff(valid_idx) - 1
+    wrap_gap = int(valid_idx[0]) + SCAN_BINS - int(valid_idx[-1]) - 1
+    return max(int(gaps.max(initial=0)), wrap_gap)
+
+
+ZoneKey = Tuple[Tuple[int, int], ...]
+
+
+@lru_cache(maxsize=8)
+def _compile_exclusion_mask(zones: ZoneKey) -> np.ndarray:
+    if not zones:
+        mask = np.zeros(SCAN_BINS, dtype=bool)
+    else:
+        centers, half_widths = np.array(zones, dtype=int).T
+        # Circular bin distance from every bin to every zone center, in one pass
+        d = (_BIN_INDEX[:, None] - centers[None, :]) % SCAN_BINS
+        d = np.minimum(d, SCAN_BINS - d)
+        mask = (d <= half_widths[None, :]).any(axis=1)
+    mask.setflags(write=False)
+    return mask
+
+
+def exclusion_mask(zones) -> np.ndarray:
+    """Read-only boolean mask over SCAN_BINS, True for bins inside any (center, half_width) zone.
+
+    Masks are compiled once and cached on the zone values, so editing
+    POST_EXCLUSION_ZONES simply compiles a new mask on next use. This is the
+    exact structure parse_scan applies, so calibration output can be checked
+    against it directly (see excluded_bins / exclusion_zones_from_header).
+    """
+    return _compile_exclusion_mask(tuple((int(c), int(hw)) for c, hw in (zones or ())))
 
-    valid = np.isfinite(arr)
-    valid_count = int(valid.sum())
-    if valid_count < HARD_MIN_VALID_BINS:
-        return None
 
-    missing = (~valid).astype(int)
-    doubled = np.concatenate([missing, missing])
-    best = cur = 0
-    for x in doubled:
-        cur = (cur + 1) if x else 0
-        best = max(best, cur)
-    longest_gap = min(best, SCAN_BINS)
+def excluded_bins(zones) -> List[int]:
+    return np.flatnonzero(exclusion_mask(zones)).tolist()
 
-    if longest_gap > MAX_CONSECUTIVE_MISSING:
+
+def exclusion_zones_from_header(path) -> List[Tuple[int, int]]:
+    """Read POST_EXCLUSION_ZONES from an ESP32 config.h, e.g. {{45, 5}, {150, 6}}."""
+    text = Path(path).read_text()
+    m = re.search(r"#define\s+POST_EXCLUSION_ZONES\s+\{(.*)\}\s*$", text, re.MULTILINE)
+    if not m:
+        raise ValueError(f"POST_EXCLUSION_ZONES not defined in {path}")
+    return [(int(c), int(hw)) for c, hw in re.findall(r"\{\s*(\d+)\s*,\s*(\d+)\s*\}", m.group(1))]
+
+
+def _fill_gaps(distances_mm: np.ndarray, valid: np.ndarray) -> Optional[np.ndarray]:
+    valid_idx = np.flatnonzero(valid)
+    if valid_idx.size < HARD_MIN_VALID_BINS:
         return None
 
-    idx = np.arange(SCAN_BINS)
-    valid_idx = idx[valid]
-    valid_vals = arr[valid]
-    wrap_idx = np.concatenate([valid_idx - SCAN_BINS, valid_idx, valid_idx + SCAN_BINS])
-    wrap_vals = np.tile(valid_vals, 3)
+    if _longest_circular_gap(valid_idx) > MAX_CONSECUTIVE_MISSING:
+        return None
 
-    interp = np.interp(idx, wrap_idx, wrap_vals)
+    # One wrapped neighbour on each side lets np.interp fill across bin 359 -> 0
+    valid_vals = distances_mm[valid_idx]
+    xp = np.concatenate(([valid_idx[-1] - SCAN_BINS], valid_idx, [valid_idx[0] + SCAN_BINS]))
+    fp = np.concatenate((valid_vals[-1:], valid_vals, valid_vals[:1]))
+    interp = np.interp(_BIN_INDEX, xp, fp)
     interp = np.clip(interp, MIN_RANGE_MM, MAX_RANGE_MM)
-    return interp.astype(int).tolist()
-
+    return interp.astype(np.int32)
 
-def _apply_exclusions(distances: list, zones: list) -> list:
-    out = list(distances)
-    for center, half_width in zones:
-        for offset in range(-half_width, half_width + 1):
-            out[(center + offset) % SCAN_BINS] = 0
-    return out
 
+def parse_scan(
+    payload: bytes,
+    reverse_scan: bool = True,
+    exclusion_zones: list = None,
+    as_array: bool = False,
+) -> Optional[ParsedScan]:
+    """Decode an SCN3 payload into a gap-filled 360-bin scan.
 
-def parse_scan(payload: bytes, reverse_scan: bool = True, exclusion_zones: list = None) -> Optional[ParsedScan]:
-    if len(payload) != 4 + 4 + 4 + 2 + 360 * 2:
-        raise ValueError(f"SCN3: expected 734 bytes, got {len(payload)}")
+    With as_array=True, distances_mm is a C-contiguous int32 NumPy array that
+    BreezySLAM can read directly; otherwise it is a list of ints.
+    """
+    if len(payload) != SCN3_PAYLOAD_BYTES:
+        raise ValueError(f"SCN3: expected {SCN3_PAYLOAD_BYTES} bytes, got {len(payload)}")
 
     if payload[:4] != b"SCN3":
         raise ValueError(f"Unknown payload magic: {payload[:4]!r}")
 
-    seq = struct.unpack_from("<I", payload, 4)[0]
-    ts_robot_ms = struct.unpack_from("<I", payload, 8)[0]
-    reported_valid = struct.unpack_from("<H", payload, 12)[0]
-    distances = list(struct.unpack_from("<360H", payload, 14))
+    seq, ts_robot_ms, reported_valid = struct.unpack_from("<IIH", payload, 4)
+
+    # Zero-copy view of the 720-byte distance block
+    distances = np.frombuffer(payload, dtype="<u2", count=SCAN_BINS, offset=SCN3_HEADER_BYTES)
 
+    valid = (distances >= MIN_RANGE_MM) & (distances <= MAX_RANGE_MM)
     if exclusion_zones:
-        distances = _apply_exclusions(distances, exclusion_zones)
+        valid &= ~exclusion_mask(exclusion_zones)
 
-    filled = _fill_gaps(distances)
+    filled = _fill_gaps(distances, valid)
     if filled is None:
         raise ValueError(
             f"SCN3 seq={seq}: rejected (valid={reported_valid}, hard_min={HARD_MIN_VALID_BINS})"
         )
 
     if reverse_scan:
-        filled = filled[::-1]
+        filled = np.ascontiguousarray(filled[::-1])
 
-    valid_bins = sum(1 for d in distances if MIN_RANGE_MM <= d <= MAX_RANGE_MM)
     return ParsedScan(
         seq=seq,
         ts_robot_ms=ts_robot_ms,
-        distances_mm=filled,
-        valid_bins=valid_bins,
+        distances_mm=filled if as_array else filled.tolist(),
+        valid_bins=int(valid.sum()),
     )
 
 
-parse_l360 = parse_scan
\ No newline at end of file
+parse_l360 = parse_scan
+
+
+if __name__ == "__main__":
+    # Check the firmware's calibrated exclusion zones against the POST_EXCLUSION_ZONES
+    # SlamService filters scans with, i.e. Server/config (config_local over config_defaults):
+    #   python slam_parser.py ../../Robot/ESP32/full_integration_v1/config.h
+    import sys
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from Server.config import POST_EXCLUSION_ZONES
+
+    firmware_zones = exclusion_zones_from_header(sys.argv[1])
+    firmware = exclusion_mask(firmware_zones)
+    server = exclusion_mask(POST_EXCLUSION_ZONES)
+    print(f"firmware: {excluded_bins(firmware_zones)}")
+    print(f"server:   {excluded_bins(POST_EXCLUSION_ZONES)}")
+
+    only_firmware = np.flatnonzero(firmware & ~server).tolist()
+    only_server = np.flatnonzero(server & ~firmware).tolist()
+    if only_firmware or only_server:
+        print(f"MISMATCH  firmware-only={only_firmware}  server-only={only_server}")
+        sys.exit(1)
+    print("OK — masks match")
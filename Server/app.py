@@ -1,5 +1,7 @@
 from flask import Flask
+from .config import EVENTS_MIN_INTERVAL_S, EVENTS_MAX_CLIENTS
 from .db import init_db
+from .event_stream import EventHub
 from .mqtt_client import MqttBus
 from .slam_service import SlamService
 from .motion_executor import MotionExecutor
@@ -14,18 +16,20 @@ def create_app():
     bus = MqttBus()
     bus.start()
 
-    slam_service = SlamService(bus)
+    events = EventHub(min_interval_s=EVENTS_MIN_INTERVAL_S, max_clients=EVENTS_MAX_CLIENTS)
+
+    slam_service = SlamService(bus, events)
     slam_service.start()
 
     from . import db
-    motion_executor = MotionExecutor(bus, slam_service, db)
+    motion_executor = MotionExecutor(bus, slam_service, db, events)
     motion_executor.start()
 
     app.slam_service = slam_service
     app.motion_executor = motion_executor
 
     app.register_blueprint(pages)
-    app.register_blueprint(bind_api(bus, slam_service, motion_executor))
+    app.register_blueprint(bind_api(bus, slam_service, motion_executor, events))
 
     return app
 
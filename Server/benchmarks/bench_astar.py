@@ -0,0 +1,117 @@
+"""A* search cost over many start/goal pairs: the dict-and-tuple search against the array-backed one.
+
+    python -m Server.benchmarks.bench_astar [pairs] [static_map.npy]
+
+Builds one Costmap with the planner defaults, as SlamService caches it, on a
+saved static map (STATIC_MAP_PATH by default) or bench_planning's synthetic
+warehouse, and plans between pairs of random free points with both searches.
+"before" is the original search: tuple cells, dict g-scores and parents, a
+closed set and a neighbour generator calling back into the grid. Both must
+plan the same paths. Reports ms per plan, time per expanded cell, the Python
+objects a plan holds at once per expanded cell (the peak growth of
+sys.getallocatedblocks(), so boxed floats, ints and tuples but not the
+buffers of arrays), and the peak memory tracemalloc sees during a plan.
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from ..config_defaults import PLANNER_CLEARANCE_MM, PLANNER_CLEARANCE_WEIGHT, ROBOT_RADIUS_MM, STATIC_MAP_PATH
+from ..pathfinder import AStarPathfinder, Costmap
+from .bench_planning import MAP_SIZE_METERS, MAP_SIZE_PIXELS, _LegacyAStarPathfinder, _room_map
+
+
+def _time_plans(pathfinder, pairs):
+    paths, seconds = [], []
+    for start, goal in pairs:
+        t = time.perf_counter()
+        paths.append(pathfinder.plan(start, goal))
+        seconds.append(time.perf_counter() - t)
+    return paths, np.asarray(seconds)
+
+
+def _peak_bytes(pathfinder, pairs) -> int:
+    peak = 0
+    for start, goal in pairs:
+        tracemalloc.start()
+        pathfinder.plan(start, goal)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peak
+
+
+def _peak_blocks(pathfinder, pairs) -> list:
+    """Per pair, the most small-object blocks plan() held beyond those at its start."""
+    peaks = []
+    for start, goal in pairs:
+        base = sys.getallocatedblocks()
+        peak = [base]
+
+        def profile(frame, event, arg):
+            blocks = sys.getallocatedblocks()
+            if blocks > peak[0]:
+                peak[0] = blocks
+
+        sys.setprofile(profile)
+        try:
+            pathfinder.plan(start, goal)
+        finally:
+            sys.setprofile(None)
+        peaks.append(peak[0] - base)
+    return peaks
+
+
+def _costmap_and_pairs(argv) -> tuple:
+    """The planner's Costmap of the map named in argv[2] (else STATIC_MAP_PATH, else the synthetic
+    warehouse) and argv[1] (default 40) pairs of random free points on it, in mm."""
+    n = int(argv[1]) if len(argv) > 1 else 40
+    path = Path(argv[2]) if len(argv) > 2 else STATIC_MAP_PATH
+    if path.exists():
+        mapbytes = bytearray(np.load(str(path)).astype(np.uint8).tobytes())
+        print(f"static map {path}")
+    else:
+        mapbytes = _room_map()
+        print(f"no map at {path}; using bench_planning's synthetic warehouse")
+
+    grid = Costmap(mapbytes, MAP_SIZE_PIXELS, MAP_SIZE_PIXELS, MAP_SIZE_METERS,
+                   robot_radius_mm=ROBOT_RADIUS_MM, clearance_mm=PLANNER_CLEARANCE_MM)
+    free_y, free_x = np.nonzero(grid._free & (np.frombuffer(mapbytes, np.uint8).reshape(grid._free.shape) > 200))
+    picks = np.random.default_rng(2).choice(len(free_x), (n, 2))
+    mm = grid.mm_per_pixel
+    return grid, [((free_x[a] * mm, free_y[a] * mm), (free_x[b] * mm, free_y[b] * mm)) for a, b in picks]
+
+
+def main():
+    grid, pairs = _costmap_and_pairs(sys.argv)
+    n = len(pairs)
+
+    legacy = _LegacyAStarPathfinder(grid, clearance_weight=PLANNER_CLEARANCE_WEIGHT)
+    expanded = []
+    for start, goal in pairs:
+        legacy.plan(start, goal)
+        expanded.append(legacy.expanded)
+    searched = [k for k, e in enumerate(expanded) if e]
+    print(f"{n} start/goal pairs, {len(searched)} needing a search, "
+          f"mean {np.mean([expanded[k] for k in searched]):.0f} cells expanded:")
+
+    results = {}
+    for name, pathfinder in (("before", legacy),
+                             ("after", AStarPathfinder(grid, clearance_weight=PLANNER_CLEARANCE_WEIGHT))):
+        paths, seconds = _time_plans(pathfinder, pairs)
+        results[name] = paths
+        cells = sum(expanded[k] for k in searched)
+        per_cell = sum(seconds[k] for k in searched) / cells
+        blocks = sum(_peak_blocks(pathfinder, [pairs[k] for k in searched])) / cells
+        print(f"  {name:<6} mean {seconds.mean() * 1000:6.2f} ms/plan  max {seconds.max() * 1000:6.2f} ms  "
+              f"{per_cell * 1e6:5.2f} us/expanded cell (whole plan)  {blocks:5.2f} objects held/expanded cell  "
+              f"peak memory {_peak_bytes(pathfinder, [pairs[k] for k in searched]) / 1024:6.0f} KiB")
+    assert results["before"] == results["after"], "array-backed A* planned different paths"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Flask request latency while SLAM runs continuously on its worker thread.
+
+    python -m Server.benchmarks.bench_gil_latency [seconds_per_phase]
+
+Serves the real API blueprint from a threaded werkzeug server, with a
+SlamService fed synthetic SCN3 scans through a stand-in MQTT bus. A client
+thread polls /api/slam/pose and /health for two phases: SLAM idle, then SLAM
+busy (a scan always queued). Run it against a BreezySLAM build that holds the
+GIL inside its C calls and one that releases it to compare the busy phase.
+"""
+from __future__ import annotations
+
+import http.client
+import logging
+import math
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+from flask import Flask
+from werkzeug.serving import make_server
+
+from ..config import TOPIC_LIDAR
+from ..routes_api import bind_api
+from ..slam_service import SlamService
+
+POLL_PATHS = ("/api/slam/pose", "/health")
+POLL_INTERVAL_S = 0.005
+
+
+class _FakeBus:
+    """Just enough of MqttBus for SlamService and the read-only API routes."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def register_handler(self, topic, callback):
+        self.handlers[topic] = callback
+
+
+def _scan_payload(seq: int) -> bytes:
+    d = [int(2500 + 800 * math.sin(i / 17.0 + seq * 0.01)) for i in range(360)]
+    return b"SCN3" + struct.pack("<IIH", seq, seq * 100, 360) + struct.pack("<360H", *d)
+
+
+def _poll(port: int, seconds: float) -> list:
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    k = 0
+    while time.perf_counter() < deadline:
+        path = POLL_PATHS[k % len(POLL_PATHS)]
+        k += 1
+        t0 = time.perf_counter()
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request("GET", path)
+        conn.getresponse().read()
+        conn.close()
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        time.sleep(POLL_INTERVAL_S)
+    return latencies
+
+
+def _report(name: str, latencies: list, slam_updates: int, seconds: float) -> None:
+    a = np.asarray(latencies)
+    p50, p95, p99 = np.percentile(a, [50, 95, 99])
+    print(f"  {name:<10} {len(a):5d} req  p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  "
+          f"p99 {p99:7.2f} ms  max {a.max():7.2f} ms  SLAM {slam_updates / seconds:5.1f} scans/s")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+
+    import pybreezyslam
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    print(f"pybreezyslam: {pybreezyslam.__file__}")
+
+    bus = _FakeBus()
+    slam_service = SlamService(bus)
+    slam_service.start()
+
+    app = Flask(__name__)
+    app.register_blueprint(bind_api(bus, slam_service, None))
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    on_lidar = bus.handlers[TOPIC_LIDAR]
+    feeding = threading.Event()
+    stop = threading.Event()
+
+    def feed():
+        seq = 0
+        while not stop.is_set():
+            if feeding.is_set():
+                on_lidar(_scan_payload(seq), TOPIC_LIDAR)
+                seq += 1
+            time.sleep(0.002)
+
+    threading.Thread(target=feed, daemon=True).start()
+
+    try:
+        # Build a map first so the busy phase measures steady-state updates
+        feeding.set()
+        time.sleep(1.0)
+        feeding.clear()
+        time.sleep(0.5)
+
+        for name, busy in (("idle", False), ("SLAM busy", True)):
+            if busy:
+                feeding.set()
+            before = slam_service.get_stats()["slam_updates"]
+            latencies = _poll(server.server_port, seconds)
+            updates = slam_service.get_stats()["slam_updates"] - before
+            feeding.clear()
+            _report(name, latencies, updates, seconds)
+            time.sleep(0.5)
+    finally:
+        stop.set()
+        server.shutdown()
+        slam_service.stop()
+
+
+if __name__ == "__main__":
+    main()
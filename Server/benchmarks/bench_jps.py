@@ -0,0 +1,65 @@
+"""Jump Point Search against A* on the uniform-cost grid: expansions and wall time per plan.
+
+    python -m Server.benchmarks.bench_jps [pairs] [static_map.npy]
+
+Plans between the same random pairs of free points as bench_astar, on the
+same Costmap, with PLANNER_CLEARANCE_WEIGHT = 0 so that every step costs its
+length, the only case JPS handles. Both searches must find routes of the same
+length. Reports cells expanded, time in the search alone and time for the
+whole plan, including shortcutting and simplification.
+"""
+from __future__ import annotations
+
+import math
+import sys
+import time
+
+import numpy as np
+
+from ..pathfinder import AStarPathfinder, JPSPathfinder
+from .bench_astar import _costmap_and_pairs
+
+
+def _recording(pathfinder_class):
+    """pathfinder_class that also records each search's route and seconds."""
+
+    class Recording(pathfinder_class):
+        def _search(self, start, goal, passable, step_factor, stride, *args):
+            t = time.perf_counter()
+            route = super()._search(start, goal, passable, step_factor, stride, *args)
+            self.search_seconds = time.perf_counter() - t
+            self.route_length = None
+            if route is not None:
+                cells = [divmod(index, stride) for index in route]
+                self.route_length = sum(math.dist(a, b) for a, b in zip(cells, cells[1:]))
+            return route
+
+    return Recording
+
+
+def main():
+    grid, pairs = _costmap_and_pairs(sys.argv)
+    print(f"{len(pairs)} start/goal pairs, uniform cost:")
+
+    lengths = {}
+    for name, pathfinder_class in (("astar", AStarPathfinder), ("jps", JPSPathfinder)):
+        pathfinder = _recording(pathfinder_class)(grid, clearance_weight=0.0)
+        expansions, search, total, lengths[name] = [], [], [], []
+        for start, goal in pairs:
+            pathfinder.search_seconds, pathfinder.route_length, pathfinder.expansions = 0.0, None, 0
+            t = time.perf_counter()
+            pathfinder.plan(start, goal)
+            total.append(time.perf_counter() - t)
+            search.append(pathfinder.search_seconds)
+            expansions.append(pathfinder.expansions)
+            lengths[name].append(pathfinder.route_length)
+        print(f"  {name:<6} expanded mean {np.mean(expansions):6.0f}  max {np.max(expansions):6d}  "
+              f"search {np.mean(search) * 1000:6.2f} ms  plan {np.mean(total) * 1000:6.2f} ms  "
+              f"max {np.max(total) * 1000:6.2f} ms")
+
+    for a, b in zip(lengths["astar"], lengths["jps"]):
+        assert (a is None) == (b is None) and (a is None or abs(a - b) < 1e-6), (a, b)
+
+
+if __name__ == "__main__":
+    main()
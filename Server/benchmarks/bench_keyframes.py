@@ -0,0 +1,87 @@
+"""Per-scan SLAM cost with and without the keyframe policy, driving and parked.
+
+    python -m Server.benchmarks.bench_keyframes [parked_scans] [seeds]
+
+Drives RMHC_SLAM, configured as SlamService configures it, around the
+synthetic room of bench_localization, parks it for parked_scans scans (10 Hz,
+with range noise) and drives another lap. Integrating every scan is compared
+with the SLAM_KEYFRAME_* defaults, when they differ, and with 50 mm / 2 deg /
+10 s. Each policy runs with several RMHC and noise seeds, since one run's error
+mostly reflects its seed. It reports ms per scan while driving and while
+parked, how many scans went into the map, and pose error against ground truth:
+the mean error of each seed and the largest error of any.
+"""
+from __future__ import annotations
+
+import math
+import sys
+import time
+
+import numpy as np
+from breezyslam.algorithms import RMHC_SLAM
+from breezyslam.sensors import Laser
+
+from ..config_defaults import SLAM_KEYFRAME_DISTANCE_MM, SLAM_KEYFRAME_ROTATION_DEG, SLAM_KEYFRAME_INTERVAL_S
+from .bench_localization import MAP_SIZE_METERS, MAP_SIZE_PIXELS, SCAN_SIZE, STEPS_PER_LAP, _WALLS, _cast, _path
+
+
+def _run(slam, path, rng):
+    """Feeds the path to slam; returns per-scan seconds, pose errors and whether each scan was parked."""
+    centre = MAP_SIZE_METERS * 500
+    seconds, errors, parked = [], [], []
+    for k, (x, y, theta) in enumerate(path):
+        scan = _cast(_WALLS, x, y, theta)
+        scan = np.maximum(scan + rng.normal(0, 10, SCAN_SIZE), 0).astype(np.int32)
+        still = k > 0 and path[k - 1] == path[k]
+        if k == 0:
+            pose_change = (0.0, 0.0, 0.1)
+        else:
+            (x0, y0, t0) = path[k - 1]
+            pose_change = (math.hypot(x - x0, y - y0) * (1 + rng.normal(0, 0.02)),
+                           math.degrees(theta - t0) + (0.0 if still else rng.normal(0, 0.3)), 0.1)
+        t = time.perf_counter()
+        slam.update(scan, pose_change)
+        seconds.append(time.perf_counter() - t)
+        sx, sy, _ = slam.getpos()
+        errors.append(math.hypot(sx - centre - x, sy - centre - y))
+        parked.append(still)
+    return np.asarray(seconds), np.asarray(errors), np.asarray(parked)
+
+
+def main():
+    parked_scans = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    seeds = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    laser = Laser(SCAN_SIZE, 10, 360, 0, 0, 0.0)
+    lap = _path(1)
+    path = lap + [lap[-1]] * parked_scans + lap
+    x0, y0, t0 = path[0]
+    centre = MAP_SIZE_METERS * 500
+
+    policies = {"every scan": (0, 0, None)}
+    defaults = (SLAM_KEYFRAME_DISTANCE_MM, SLAM_KEYFRAME_ROTATION_DEG, SLAM_KEYFRAME_INTERVAL_S)
+    if defaults != policies["every scan"]:
+        policies["defaults"] = defaults
+    policies["50/2/10"] = (50, 2, 10)
+    print(f"{STEPS_PER_LAP} scans driving, {parked_scans} parked, {STEPS_PER_LAP} driving, {seeds} seeds:")
+    for name, policy in policies.items():
+        driving, still, updates, means, worst = [], [], [], [], 0.0
+        for seed in range(seeds):
+            slam = RMHC_SLAM(laser, MAP_SIZE_PIXELS, MAP_SIZE_METERS, random_seed=0xAB30 + seed,
+                             sigma_xy_mm=200, sigma_theta_degrees=30, max_search_iter=2000)
+            slam.setkeyframes(*policy)
+            slam.position.x_mm, slam.position.y_mm = centre + x0, centre + y0
+            slam.position.theta_degrees = math.degrees(t0)
+            seconds, errors, parked = _run(slam, path, np.random.default_rng(seed))
+            driving.append(seconds[~parked].mean())
+            still.append(seconds[parked].mean())
+            updates.append(slam.map_updates)
+            means.append(errors.mean())
+            worst = max(worst, errors.max())
+        print(f"  {name:<10} driving {np.mean(driving) * 1000:5.2f} ms/scan  "
+              f"parked {np.mean(still) * 1000:5.2f} ms/scan  "
+              f"map updates {np.mean(updates):6.1f} / {len(path)}  "
+              f"error mean {' '.join(f'{m:4.0f}' for m in means)} mm  max {worst:4.0f} mm")
+
+
+if __name__ == "__main__":
+    main()
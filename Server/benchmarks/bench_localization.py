@@ -0,0 +1,127 @@
+"""Per-scan cost and accuracy of tracking on a saved map: RMHC SLAM vs MCL.
+
+    python -m Server.benchmarks.bench_localization [laps]
+
+Builds a map of a synthetic room with RMHC_SLAM, exactly as SlamService does,
+then drives the same loop again with a person-sized obstacle walking through
+the room. On that second run it compares RMHC_SLAM, which keeps matching and
+updating the map, with MonteCarloLocalization, which only localizes on the
+frozen map. It reports ms per scan, pose error against ground truth, and how
+many map pixels each engine changed.
+"""
+from __future__ import annotations
+
+import math
+import sys
+import time
+
+import numpy as np
+from breezyslam.algorithms import RMHC_SLAM
+from breezyslam.sensors import Laser
+
+from ..localizer import MonteCarloLocalization
+
+MAP_SIZE_PIXELS = 800
+MAP_SIZE_METERS = 20
+SCAN_SIZE = 360
+STEPS_PER_LAP = 200
+
+# Walls of a 10 x 7 m room with a pillar and a cabinet, in mm around the map centre
+_WALLS = [
+    ((-5000, -3500), (5000, -3500)), ((5000, -3500), (5000, 3500)),
+    ((5000, 3500), (-5000, 3500)), ((-5000, 3500), (-5000, -3500)),
+    ((1000, -1000), (1600, -1000)), ((1600, -1000), (1600, -400)),
+    ((1600, -400), (1000, -400)), ((1000, -400), (1000, -1000)),
+    ((-4000, 2000), (-2500, 3000)),
+]
+
+
+def _cast(segments, x_mm, y_mm, theta):
+    """Ray-cast one scan in BreezySLAM's beam order from (x_mm, y_mm) at heading theta."""
+    k = np.arange(SCAN_SIZE) * 360.0 / (SCAN_SIZE - 1)
+    a = theta + np.radians(-180.0 + k)
+    dx, dy = np.cos(a)[:, None], np.sin(a)[:, None]
+    (x1, y1), (x2, y2) = np.array([s[0] for s in segments]).T, np.array([s[1] for s in segments]).T
+    ex, ey = x2 - x1, y2 - y1
+    den = dx * ey - dy * ex
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = ((x1 - x_mm) * ey - (y1 - y_mm) * ex) / den
+        u = ((x1 - x_mm) * dy - (y1 - y_mm) * dx) / den
+    t = np.where((np.abs(den) > 1e-9) & (t > 0) & (u >= 0) & (u <= 1), t, np.inf)
+    return np.minimum(t.min(axis=1), 8000).astype(np.int32)
+
+
+def _path(laps):
+    """Ground-truth poses (x_mm, y_mm, theta) around an ellipse, plus odometry between them."""
+    s = np.linspace(0, 2 * math.pi * laps, STEPS_PER_LAP * laps, endpoint=False)
+    x, y = 3200 * np.cos(s), 2000 * np.sin(s)
+    theta = np.unwrap(np.arctan2(np.gradient(y), np.gradient(x)))
+    return list(zip(x, y, theta))
+
+
+def _odometry(path, k, rng):
+    if k == 0:
+        return (0.0, 0.0, 0.1)
+    (x0, y0, t0), (x1, y1, t1) = path[k - 1], path[k]
+    dxy = math.hypot(x1 - x0, y1 - y0) * (1 + rng.normal(0, 0.02))
+    return (dxy, math.degrees(t1 - t0) + rng.normal(0, 0.3), 0.1)
+
+
+def _run(slam, path, person, rng):
+    centre = MAP_SIZE_METERS * 500
+    errors, seconds = [], 0.0
+    for k, (x, y, theta) in enumerate(path):
+        segments = _WALLS
+        if person:
+            # A 400 mm obstacle crossing the room
+            px = -4000 + 8000 * (k % STEPS_PER_LAP) / STEPS_PER_LAP
+            segments = _WALLS + [((px - 200, 500), (px + 200, 500)), ((px, 300), (px, 700))]
+        scan = _cast(segments, x, y, theta)
+        pose_change = _odometry(path, k, rng)
+        t0 = time.perf_counter()
+        slam.update(scan, pose_change)
+        seconds += time.perf_counter() - t0
+        sx, sy, _ = slam.getpos()
+        errors.append(math.hypot(sx - centre - x, sy - centre - y))
+    return seconds, np.asarray(errors)
+
+
+def main():
+    laps = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    laser = Laser(SCAN_SIZE, 10, 360, 0, 0, 0.0)
+    rng = np.random.default_rng(0)
+    path = _path(laps)
+
+    # Start facing along the path, as SlamService does at the map centre
+    x0, y0, t0 = path[0]
+    centre = MAP_SIZE_METERS * 500
+
+    mapper = RMHC_SLAM(laser, MAP_SIZE_PIXELS, MAP_SIZE_METERS, random_seed=0xAB30,
+                       sigma_xy_mm=200, sigma_theta_degrees=30, max_search_iter=2000)
+    mapper.position.x_mm, mapper.position.y_mm = centre + x0, centre + y0
+    mapper.position.theta_degrees = math.degrees(t0)
+    _, map_errors = _run(mapper, path[:STEPS_PER_LAP], False, rng)
+    static_map = mapper.getmapsnapshot()
+    print(f"map built over one lap: mean error {map_errors.mean():.0f} mm")
+
+    engines = {
+        "rmhc": RMHC_SLAM(laser, MAP_SIZE_PIXELS, MAP_SIZE_METERS, random_seed=0xAB30,
+                          sigma_xy_mm=200, sigma_theta_degrees=30, max_search_iter=2000),
+        "mcl": MonteCarloLocalization(laser, MAP_SIZE_PIXELS, MAP_SIZE_METERS, random_seed=0xAB30),
+    }
+    print(f"{len(path)} scans with a moving obstacle, on the saved map:")
+    for name, slam in engines.items():
+        slam.setmap(static_map)
+        start = slam.position
+        start.x_mm, start.y_mm, start.theta_degrees = centre + x0, centre + y0, math.degrees(t0)
+        slam.position = start
+        seconds, errors = _run(slam, path, True, np.random.default_rng(1))
+        changed = np.count_nonzero(np.frombuffer(slam.getmapsnapshot(), np.uint8)
+                                   != np.frombuffer(static_map, np.uint8))
+        print(f"  {name:<5} {seconds / len(path) * 1000:6.2f} ms/scan  error mean {errors.mean():5.0f} mm  "
+              f"p95 {np.percentile(errors, 95):5.0f} mm  max {errors.max():5.0f} mm  "
+              f"map pixels changed {changed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Bytes and server CPU per /api/slam/map request, base64 JSON against the cached encodings.
+
+    python -m Server.benchmarks.bench_map_snapshot [requests]
+
+Builds a map from synthetic SCN3 scans with a real SlamService and overlays a
+static map, then requests the whole map through the API blueprint with
+Flask's test client. "before" is the original handler: get_map() and base64
+JSON on every request. For each format it reports a request right after the
+map changed (composite and encode), a request for an unchanged map, and a
+conditional request answered with 304.
+"""
+from __future__ import annotations
+
+import base64
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+from flask import Flask, jsonify
+
+from ..routes_api import bind_api
+from ..slam_service import MAP_FORMATS, SlamService
+from .bench_gil_latency import _FakeBus, _scan_payload
+
+
+def _cpu_ms(client, path: str, n: int, headers=None, before_each=None) -> tuple:
+    """(CPU ms per request, response bytes, status) over n requests."""
+    cpu = 0.0
+    for _ in range(n):
+        if before_each:
+            before_each()
+        t = time.process_time()
+        response = client.get(path, headers=headers or {})
+        body = response.get_data()
+        cpu += time.process_time() - t
+    return cpu / n * 1000, len(body), response.status_code
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    slam_service = SlamService(_FakeBus())
+    for seq in range(50):
+        slam_service._process_scan(_scan_payload(seq), time.monotonic())
+    with slam_service._slam_lock:
+        static_map = slam_service.slam.getmapsnapshot()
+    with slam_service._lock:
+        slam_service._static_map = static_map
+        slam_service._static_map_version += 1
+
+    app = Flask(__name__)
+    app.register_blueprint(bind_api(_FakeBus(), slam_service, None))
+
+    @app.get("/before")
+    def before():
+        return jsonify({
+            "ok": True,
+            "width": slam_service.map_pixels,
+            "height": slam_service.map_pixels,
+            "data": base64.b64encode(slam_service.get_map()).decode("utf-8"),
+        })
+
+    client = app.test_client()
+    size = slam_service.map_pixels
+    print(f"{size}x{size} map ({size * size} bytes), {n} requests each:")
+    ms, nbytes, _ = _cpu_ms(client, "/before", n)
+    print(f"  {'before':<6} every request      {ms:7.2f} ms CPU  {nbytes:8d} bytes")
+
+    for fmt in MAP_FORMATS:
+        path = f"/api/slam/map?format={fmt}"
+        # Dropping the cached snapshot costs what a map change does: composite and encode again
+        ms, nbytes, _ = _cpu_ms(client, path, n, before_each=slam_service._map_snapshots.clear)
+        print(f"  {fmt:<6} map changed        {ms:7.2f} ms CPU  {nbytes:8d} bytes")
+        ms, nbytes, _ = _cpu_ms(client, path, n)
+        print(f"  {fmt:<6} map unchanged      {ms:7.2f} ms CPU  {nbytes:8d} bytes")
+        etag = client.get(path).headers["ETag"]
+        ms, nbytes, status = _cpu_ms(client, path, n, headers={"If-None-Match": etag})
+        print(f"  {fmt:<6} If-None-Match      {ms:7.2f} ms CPU  {nbytes:8d} bytes  ({status})")
+
+    # Both binary formats must decode back to get_map(); the PNG has one IDAT chunk after the 25-byte header
+    png = client.get("/api/slam/map?format=png").get_data()
+    (idat_len,) = struct.unpack(">I", png[33:37])
+    rows = np.frombuffer(zlib.decompress(png[41:41 + idat_len]), dtype=np.uint8).reshape(size, size + 1)
+    raw = zlib.decompress(client.get("/api/slam/map?format=zlib").get_data())
+    assert rows[:, 1:].tobytes() == raw == slam_service.get_map()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""Planning latency of MotionExecutor.set_goal(): grid construction plus A*, per goal.
+
+    python -m Server.benchmarks.bench_planning [static_map.npy]
+
+Plans on a saved static map (STATIC_MAP_PATH by default) from the free pixel
+nearest the map centre to goals spread over the free space, building the
+OccupancyGrid for each goal as set_goal() does. Without a saved map it
+rasterizes a cluttered 16 x 12 m warehouse. "before" is the original grid, which
+checked each cell against every inflation offset in Python on first use, and
+the original dict-based A*; it must plan exactly the same paths as "after". "costmap" plans on a Costmap with
+the PLANNER_CLEARANCE_* defaults, as set_goal() does. Each row also reports
+path length and how close paths come to obstacles: the share of the route
+within PLANNER_CLEARANCE_MM of one, where the robot's LiDAR brake may fire.
+
+Also checks the Costmap's distance transform against brute force on a crop of
+the map, and that a Costmap blocks exactly the pixels an OccupancyGrid does,
+whatever its clearance.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from ..config_defaults import PLANNER_CLEARANCE_MM, PLANNER_CLEARANCE_WEIGHT, ROBOT_RADIUS_MM, STATIC_MAP_PATH
+from ..distance_transform import squared_distance
+from ..pathfinder import AStarPathfinder, Costmap, OccupancyGrid
+
+MAP_SIZE_PIXELS = 800
+MAP_SIZE_METERS = 20
+GOALS = 12
+
+
+class _LegacyOccupancyGrid(OccupancyGrid):
+    """The grid before vectorization: a Python bytearray and lazily cached per-cell inflation checks."""
+
+    def __init__(self, mapbytes, width, height, meters, robot_radius_mm=350.0):
+        self.width = width
+        self.height = height
+        self.meters = meters
+        self.mm_per_pixel = (meters * 1000) / width
+        self.inflation_pixels = max(1, int(round(robot_radius_mm / self.mm_per_pixel)))
+        self.planner_step_pixels = max(2, int(round(200.0 / self.mm_per_pixel)))
+        self._occupancy = bytearray(1 if b < 50 else 0 for b in mapbytes)
+        self._inflation_offsets = [
+            (dx, dy)
+            for dy in range(-self.inflation_pixels, self.inflation_pixels + 1)
+            for dx in range(-self.inflation_pixels, self.inflation_pixels + 1)
+            if dx * dx + dy * dy <= self.inflation_pixels * self.inflation_pixels
+        ]
+        self._collision_cache = {}
+
+    def is_collision_free_px(self, x_px, y_px):
+        if not (0 <= x_px < self.width and 0 <= y_px < self.height):
+            return False
+        key = (x_px, y_px)
+        cached = self._collision_cache.get(key)
+        if cached is not None:
+            return cached
+        for dx, dy in self._inflation_offsets:
+            nx, ny = x_px + dx, y_px + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height and self._occupancy[ny * self.width + nx]:
+                self._collision_cache[key] = False
+                return False
+        self._collision_cache[key] = True
+        return True
+
+    def is_line_collision_free(self, start_mm, goal_mm, step_mm=100.0):
+        distance = math.dist(start_mm, goal_mm)
+        steps = max(1, int(math.ceil(distance / step_mm)))
+        for i in range(steps + 1):
+            t = i / steps
+            x = start_mm[0] + (goal_mm[0] - start_mm[0]) * t
+            y = start_mm[1] + (goal_mm[1] - start_mm[1]) * t
+            if not self.is_collision_free(x, y):
+                return False
+        return True
+
+
+class _LegacyAStarPathfinder(AStarPathfinder):
+    """The search before flat indices, kept verbatim apart from counting expanded cells in self.expanded."""
+
+    def plan(
+        self,
+        start_mm: Tuple[float, float],
+        goal_mm: Tuple[float, float],
+        max_iterations: int = 80000,
+    ) -> Optional[List[Tuple[float, float]]]:
+        if self.grid.is_line_collision_free(start_mm, goal_mm) and self._line_clear_enough(
+            start_mm,
+            goal_mm,
+            self.clearance_weight * max(self.grid.clearance_penalty(*start_mm), self.grid.clearance_penalty(*goal_mm)),
+        ):
+            return [start_mm, goal_mm]
+
+        step = self.grid.planner_step_pixels
+        cells_w = math.ceil(self.grid.width / step)
+        cells_h = math.ceil(self.grid.height / step)
+
+        def mm_to_cell(point_mm: Tuple[float, float]) -> Tuple[int, int]:
+            x_px = int(point_mm[0] / self.grid.mm_per_pixel)
+            y_px = int(point_mm[1] / self.grid.mm_per_pixel)
+            return (round(x_px / step), round(y_px / step))
+
+        def cell_to_px(cell: Tuple[int, int]) -> Tuple[int, int]:
+            return (
+                max(0, min(self.grid.width - 1, int(cell[0] * step))),
+                max(0, min(self.grid.height - 1, int(cell[1] * step))),
+            )
+
+        def cell_to_mm(cell: Tuple[int, int]) -> Tuple[float, float]:
+            x_px, y_px = cell_to_px(cell)
+            return (x_px * self.grid.mm_per_pixel, y_px * self.grid.mm_per_pixel)
+
+        def cell_free(cell: Tuple[int, int]) -> bool:
+            if not (0 <= cell[0] < cells_w and 0 <= cell[1] < cells_h):
+                return False
+            return self.grid.is_collision_free_px(*cell_to_px(cell))
+
+        def cell_penalty(cell: Tuple[int, int]) -> float:
+            return self.clearance_weight * self.grid.clearance_penalty_px(*cell_to_px(cell))
+
+        def nearest_free(cell: Tuple[int, int], radius_cells: int = 8) -> Optional[Tuple[int, int]]:
+            if cell_free(cell):
+                return cell
+            for r in range(1, radius_cells + 1):
+                best = None
+                best_dist = float("inf")
+                for dy in range(-r, r + 1):
+                    for dx in range(-r, r + 1):
+                        if max(abs(dx), abs(dy)) != r:
+                            continue
+                        candidate = (cell[0] + dx, cell[1] + dy)
+                        if cell_free(candidate):
+                            dist = dx * dx + dy * dy
+                            if dist < best_dist:
+                                best = candidate
+                                best_dist = dist
+                if best is not None:
+                    return best
+            return None
+
+        start_cell = nearest_free(mm_to_cell(start_mm))
+        goal_cell = nearest_free(mm_to_cell(goal_mm))
+
+        if start_cell is None or goal_cell is None:
+            return None
+        if start_cell == goal_cell:
+            return [start_mm, goal_mm]
+
+        self.expanded = 0
+        open_set = [(0, start_cell)]
+        closed_set = set()
+        g_score = {start_cell: 0}
+        came_from = {}
+        iteration = 0
+
+        while open_set and iteration < max_iterations:
+            iteration += 1
+            _f, current = heapq.heappop(open_set)
+
+            if current in closed_set:
+                continue
+
+            closed_set.add(current)
+            self.expanded += 1
+
+            if current == goal_cell:
+                cell_path = []
+                node = goal_cell
+                while node in came_from:
+                    cell_path.append(node)
+                    node = came_from[node]
+                cell_path.append(start_cell)
+                cell_path.reverse()
+
+                cell_path = self._shortcut_cells(cell_path, cell_to_mm, [cell_penalty(c) for c in cell_path])
+                path = self._simplify_cells(cell_path, cell_to_mm)
+                path[0] = start_mm
+                path[-1] = goal_mm
+                return path
+
+            for neighbor in self._neighbors(current, cells_w, cells_h, cell_free):
+                if neighbor in closed_set:
+                    continue
+
+                tentative_g = g_score[current] + self._get_cost(current, neighbor) * (1 + cell_penalty(neighbor))
+
+                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    h = self._heuristic(neighbor, goal_cell)
+                    f = tentative_g + h
+                    heapq.heappush(open_set, (f, neighbor))
+
+        return None
+
+    def _neighbors(self, cell, cells_w, cells_h, cell_free):
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                neighbor = (cell[0] + dx, cell[1] + dy)
+                if 0 <= neighbor[0] < cells_w and 0 <= neighbor[1] < cells_h and cell_free(neighbor):
+                    yield neighbor
+
+    def _neighbors(self, cell, cells_w, cells_h, cell_free):
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                neighbor = (cell[0] + dx, cell[1] + dy)
+                if 0 <= neighbor[0] < cells_w and 0 <= neighbor[1] < cells_h and cell_free(neighbor):
+                    yield neighbor
+
+    def _heuristic(self, start, goal):
+        dx = goal[0] - start[0]
+        dy = goal[1] - start[1]
+        return math.sqrt(dx**2 + dy**2)
+
+    def _get_cost(self, a, b):
+        dx = abs(b[0] - a[0])
+        dy = abs(b[1] - a[1])
+        return math.sqrt(2) if (dx == 1 and dy == 1) else 1.0
+
+    def _shortcut_cells(self, cells, cell_to_mm, penalties):
+        if len(cells) <= 2:
+            return cells
+
+        shortcut = [cells[0]]
+        anchor = 0
+
+        while anchor < len(cells) - 1:
+            farthest = len(cells) - 1
+            while farthest > anchor + 1:
+                a_mm, b_mm = cell_to_mm(cells[anchor]), cell_to_mm(cells[farthest])
+                if self.grid.is_line_collision_free(a_mm, b_mm) and self._line_clear_enough(
+                    a_mm, b_mm, max(penalties[anchor:farthest + 1])
+                ):
+                    break
+                farthest -= 1
+            shortcut.append(cells[farthest])
+            anchor = farthest
+
+        return shortcut
+
+
+def _room_map() -> bytearray:
+    """A 16 x 12 m warehouse at the map centre with shelving rows and scattered boxes, as SLAM draws it."""
+    mm_per_pixel = MAP_SIZE_METERS * 1000 / MAP_SIZE_PIXELS
+    pixels = np.full((MAP_SIZE_PIXELS, MAP_SIZE_PIXELS), 127, dtype=np.uint8)
+    c = MAP_SIZE_PIXELS // 2
+
+    def px(mm):
+        return int(round(mm / mm_per_pixel))
+
+    x0, x1, y0, y1 = c - px(8000), c + px(8000), c - px(6000), c + px(6000)
+    pixels[y0:y1, x0:x1] = 255
+    pixels[y0:y0 + 2, x0:x1] = pixels[y1 - 2:y1, x0:x1] = 0
+    pixels[y0:y1, x0:x0 + 2] = pixels[y0:y1, x1 - 2:x1] = 0
+    # Shelving rows with gaps wide enough for the robot, alternating ends
+    for k, x_mm in enumerate(range(-6000, 7000, 2000)):
+        gap = slice(y0, y0 + px(1600)) if k % 2 else slice(y1 - px(1600), y1)
+        shelf = np.zeros(MAP_SIZE_PIXELS, dtype=bool)
+        shelf[y0:y1] = True
+        shelf[gap] = False
+        pixels[shelf, c + px(x_mm):c + px(x_mm) + 3] = 0
+    rng = np.random.default_rng(0)
+    for _ in range(25):
+        bx, by = rng.integers(x0 + 10, x1 - 10), rng.integers(y0 + 10, y1 - 10)
+        pixels[by:by + 4, bx:bx + 4] = 0
+    return bytearray(pixels.tobytes())
+
+
+def _plan(make_grid, pathfinder_class, clearance_weight, mapbytes, start, goal):
+    t = time.perf_counter()
+    grid = make_grid(mapbytes, MAP_SIZE_PIXELS, MAP_SIZE_PIXELS, MAP_SIZE_METERS, robot_radius_mm=ROBOT_RADIUS_MM)
+    built = time.perf_counter()
+    path = pathfinder_class(grid, clearance_weight=clearance_weight).plan(start, goal)
+    return path, built - t, time.perf_counter() - built
+
+
+def _clearances(path, ruler: Costmap) -> np.ndarray:
+    """Distance to the nearest obstacle every 20 mm along path."""
+    samples = []
+    for a, b in zip(path, path[1:]):
+        for t in np.linspace(0, 1, max(2, int(math.dist(a, b) / 20)), endpoint=False):
+            samples.append(ruler.distance_mm(a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t))
+    return np.asarray(samples)
+
+
+def main():
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else STATIC_MAP_PATH
+    if path.exists():
+        mapbytes = bytearray(np.load(str(path)).astype(np.uint8).tobytes())
+        print(f"static map {path}")
+    else:
+        mapbytes = _room_map()
+        print(f"no map at {path}; using a synthetic cluttered room")
+
+    grid = OccupancyGrid(mapbytes, MAP_SIZE_PIXELS, MAP_SIZE_PIXELS, MAP_SIZE_METERS, robot_radius_mm=ROBOT_RADIUS_MM)
+    free_y, free_x = np.nonzero(grid._free & (np.frombuffer(mapbytes, np.uint8).reshape(grid._free.shape) > 200))
+    mm = grid.mm_per_pixel
+    centre = np.argmin((free_x - MAP_SIZE_PIXELS / 2) ** 2 + (free_y - MAP_SIZE_PIXELS / 2) ** 2)
+    start = (free_x[centre] * mm, free_y[centre] * mm)
+    picks = np.random.default_rng(1).choice(len(free_x), GOALS, replace=False)
+    goals = [(free_x[k] * mm, free_y[k] * mm) for k in picks]
+
+    # Measures true clearance well beyond PLANNER_CLEARANCE_MM
+    ruler = Costmap(mapbytes, MAP_SIZE_PIXELS, MAP_SIZE_PIXELS, MAP_SIZE_METERS,
+                    robot_radius_mm=ROBOT_RADIUS_MM, clearance_mm=3000)
+
+    def make_costmap(*args, **kwargs):
+        return Costmap(*args, clearance_mm=PLANNER_CLEARANCE_MM, **kwargs)
+
+    print(f"{GOALS} goals, robot radius {ROBOT_RADIUS_MM} mm ({grid.inflation_pixels} px):")
+    results = {}
+    variants = (
+        ("before", _LegacyOccupancyGrid, _LegacyAStarPathfinder, 0.0),
+        ("after", OccupancyGrid, AStarPathfinder, 0.0),
+        ("costmap", make_costmap, AStarPathfinder, PLANNER_CLEARANCE_WEIGHT),
+    )
+    for name, make_grid, pathfinder_class, clearance_weight in variants:
+        paths, build, search = [], [], []
+        for goal in goals:
+            p, b, s = _plan(make_grid, pathfinder_class, clearance_weight, mapbytes, start, goal)
+            paths.append(p)
+            build.append(b)
+            search.append(s)
+        results[name] = paths
+        total = np.add(build, search) * 1000
+        planned = [p for p in paths if p is not None]
+        length = np.mean([sum(math.dist(a, b) for a, b in zip(p, p[1:])) for p in planned]) / 1000
+        clear = np.concatenate([_clearances(p, ruler) for p in planned])
+        print(f"  {name:<7} grid {np.mean(build) * 1000:6.1f} ms  A* {np.mean(search) * 1000:6.1f} ms  "
+              f"per goal mean {total.mean():6.1f} ms  max {total.max():6.1f} ms  "
+              f"planned {len(planned)}/{GOALS}  length {length:5.2f} m  "
+              f"min clearance {clear.min():4.0f} mm  within {PLANNER_CLEARANCE_MM} mm {np.mean(clear < PLANNER_CLEARANCE_MM):4.0%}")
+    assert results["before"] == results["after"], "vectorized grid planned different paths"
+
+    _check_distance_transform(mapbytes, grid)
+
+
+def _check_distance_transform(mapbytes, grid: OccupancyGrid):
+    occupied = grid._occupancy
+    y, x = np.nonzero(occupied)
+    # The crop around the first obstacle keeps brute force (every pixel against every obstacle) small
+    crop = occupied[max(0, y[0] - 20):y[0] + 100, max(0, x[0] - 20):x[0] + 100]
+    oy, ox = np.nonzero(crop)
+    py, px = np.indices(crop.shape)
+    exact = ((py[..., None] - oy) ** 2 + (px[..., None] - ox) ** 2).min(axis=-1)
+    for horizon in (1, 14, 40):
+        assert np.array_equal(squared_distance(crop, horizon), np.minimum(exact, horizon * horizon)), horizon
+
+    for clearance_mm in (0, ROBOT_RADIUS_MM / 2, ROBOT_RADIUS_MM, PLANNER_CLEARANCE_MM):
+        costmap = Costmap(mapbytes, MAP_SIZE_PIXELS, MAP_SIZE_PIXELS, MAP_SIZE_METERS,
+                          robot_radius_mm=ROBOT_RADIUS_MM, clearance_mm=clearance_mm)
+        assert np.array_equal(costmap._free, grid._free), f"Costmap blocks other pixels at clearance {clearance_mm} mm"
+    print("  distance transform matches brute force; Costmap and OccupancyGrid block the same pixels")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,16 @@ POST_EXCLUSION_ZONES = []
 
 ROBOT_RADIUS_MM = 350
 
+# Path planning keeps clear of obstacles: A* steps closer than PLANNER_CLEARANCE_MM
+# to an obstacle cost up to (1 + PLANNER_CLEARANCE_WEIGHT) times their length, so
+# routes keep to the middle of aisles. The default clearance is ROBOT_RADIUS_MM
+# plus the robot's 350 mm LiDAR brake distance. A weight of 0 disables it.
+PLANNER_CLEARANCE_MM = 700
+PLANNER_CLEARANCE_WEIGHT = 2.0
+# "astar" or "jps". Jump Point Search expands far fewer cells but treats every
+# step alike, so PLANNER_CLEARANCE_WEIGHT only shapes its shortcuts, not its route.
+PLANNER_ALGORITHM = "astar"
+
 TICKS_PER_REV     = 760.0
 WHEEL_DIAMETER_MM = 96.0
 AXLE_WIDTH_MM     = 480.0
@@ -38,4 +48,47 @@ ODOM_THETA_SIGN = 1
 
 ODOM_MAX_DELTA_TICKS = 5000
 
+# Raw LiDAR scans waiting for the SLAM worker. Latest-wins: when full, the
+# oldest scan is dropped so SLAM never falls behind real time.
+SCAN_QUEUE_MAXLEN = 2
+
+# Independent RMHC search chains per scan, each on its own native thread.
+# 1 keeps the classic single-chain search. Each chain runs the full iteration
+# budget, so more chains match better but never take less wall time than one.
+# SLAM_RMHC_SPLIT_ITER shares the budget among them instead: less wall time on
+# a multi-core host, slightly worse matches (see the README).
+SLAM_RMHC_CHAINS = 1
+SLAM_RMHC_SPLIT_ITER = False
+
+# Scan matcher: "rmhc" (random-mutation hill climbing), "multires" (RMHC on a
+# coarse-to-fine map pyramid), "correlative" (deterministic grid search), or
+# "mcl" (localization only: a particle filter on the saved static map, which it
+# never updates).
+SLAM_ALGORITHM = "rmhc"
+
+# Particles for SLAM_ALGORITHM = "mcl"; per-scan cost grows linearly with them.
+SLAM_MCL_PARTICLES = 500
+
+# Keyframes: every scan is localized, but it is only integrated into the map once
+# the pose has moved this far or turned this much since the last integrated scan,
+# or this many seconds have passed. A parked robot then costs a scan match only.
+# 0 / 0 / None, the default, integrates every scan: 50 mm / 2 deg / 10 s cut parked
+# CPU by a third in bench_keyframes but raised pose error (see the README).
+SLAM_KEYFRAME_DISTANCE_MM = 0
+SLAM_KEYFRAME_ROTATION_DEG = 0
+SLAM_KEYFRAME_INTERVAL_S = None
+
+# Global relocalization (POST /api/slam/relocalize) against the saved static map:
+# scans captured while the robot stands still, heading step of the global sweep,
+# and how many times the map is halved for it (each level is 2x coarser).
+SLAM_RELOCALIZE_SCANS = 3
+SLAM_RELOCALIZE_THETA_STEP_DEG = 5
+SLAM_RELOCALIZE_LEVELS = 3
+
+# Dashboard push stream (GET /api/events): at most one batch of pose / status /
+# path / map events per client per interval (newer values replace older ones in
+# between), and at most this many open streams.
+EVENTS_MIN_INTERVAL_S = 0.1
+EVENTS_MAX_CLIENTS = 8
+
 NAMED_LOCATIONS: dict = {}
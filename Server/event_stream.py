@@ -0,0 +1,79 @@
+"""Server-Sent Events push channel for the dashboards.
+
+Producers (SlamService, MotionExecutor) publish small JSON events by topic:
+"pose", "robot", "autonomy", "path" and "map". Only the latest event per
+topic is kept, so a client that falls behind skips straight to the newest
+value instead of replaying a backlog, and a client that connects late gets
+the current value of every topic at once. Each client is sent at most one
+batch of events per min_interval_s.
+"""
+import json
+import threading
+import time
+from typing import Iterator
+
+
+class EventHub:
+    def __init__(self, min_interval_s: float = 0.1, keepalive_s: float = 15.0, max_clients: int = 8):
+        self.min_interval_s = min_interval_s
+        self.keepalive_s = keepalive_s
+        self.max_clients = max_clients
+        self._cond = threading.Condition()
+        # topic -> (seq, JSON text); seq is global, so "newer than what a client saw" is one compare
+        self._latest = {}
+        self._seq = 0
+        self._clients = 0
+        self.stats = {"published": 0, "sent": 0, "clients": 0}
+
+    def publish(self, topic: str, data: dict):
+        """Replaces the latest event for topic and wakes the clients; never blocks on them."""
+        text = json.dumps(data, separators=(",", ":"))
+        with self._cond:
+            self._seq += 1
+            self._latest[topic] = (self._seq, text)
+            self.stats["published"] += 1
+            self._cond.notify_all()
+
+    def connect(self) -> bool:
+        """Reserves a client slot, or returns False when all max_clients are taken."""
+        with self._cond:
+            if self._clients >= self.max_clients:
+                return False
+            self._clients += 1
+            self.stats["clients"] = self._clients
+            return True
+
+    def disconnect(self):
+        """Releases a slot taken by connect()."""
+        with self._cond:
+            self._clients -= 1
+            self.stats["clients"] = self._clients
+
+    def stream(self) -> Iterator[str]:
+        """SSE text for one client; runs until the server closes it when the client goes away."""
+        seen = {}
+        # Tell EventSource to reconnect after 2 s rather than its 3 s default
+        yield "retry: 2000\n\n"
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending(seen), timeout=self.keepalive_s)
+                pending = self._pending(seen)
+                for topic, seq, _ in pending:
+                    seen[topic] = seq
+                self.stats["sent"] += len(pending)
+
+            if not pending:
+                # Comment line: keeps proxies from timing out an idle stream
+                yield ": keepalive\n\n"
+                continue
+
+            sent_at = time.monotonic()
+            yield "".join(f"event: {topic}\ndata: {text}\n\n" for topic, _, text in pending)
+
+            # Rate limit: whatever is published meanwhile is coalesced to its latest value
+            delay = self.min_interval_s - (time.monotonic() - sent_at)
+            if delay > 0:
+                time.sleep(delay)
+
+    def _pending(self, seen: dict) -> list:
+        return [(topic, seq, text) for topic, (seq, text) in self._latest.items() if seq > seen.get(topic, 0)]
@@ -0,0 +1,174 @@
+"""Localization-only engine: Monte Carlo localization on a frozen map.
+
+MonteCarloLocalization stands in for the BreezySLAM engines in SlamService
+(SLAM_ALGORITHM = "mcl"). It never calls Map.update: the map given to setmap(),
+normally the saved static map, stays as it is. Each scan only reweighs a
+particle cloud against a likelihood field precomputed from that map, so
+transient obstacles can't corrupt the map, and a scan costs one vectorized
+lookup of particles x beams instead of a hill-climbing search plus a map update.
+"""
+import math
+
+import numpy as np
+from breezyslam.algorithms import CoreSLAM
+from pybreezyslam import Position
+
+from .distance_transform import squared_distance
+
+# Map pixels darker than this are walls, as in SlamService.get_map() and the planner.
+_OBSTACLE_MAX = 50
+
+
+def likelihood_field(
+    mapbytes,
+    map_pixels: int,
+    mm_per_pixel: float,
+    sigma_hit_mm: float = 100.0,
+    max_dist_mm: float = 1000.0,
+    z_rand: float = 0.05,
+) -> np.ndarray:
+    """Per-pixel log-likelihood of a scan endpoint landing there, from its distance to the nearest wall."""
+    walls = np.frombuffer(mapbytes, dtype=np.uint8).reshape(map_pixels, map_pixels) < _OBSTACLE_MAX
+    squared = squared_distance(walls, int(math.ceil(max_dist_mm / mm_per_pixel)))
+    dist_mm = np.sqrt(squared.astype(np.float32)) * mm_per_pixel
+    return np.log(np.exp(-0.5 * (dist_mm / sigma_hit_mm) ** 2) + z_rand).astype(np.float32)
+
+
+class MonteCarloLocalization(CoreSLAM):
+    """Particle filter over (x_mm, y_mm, theta) with the RMHC_SLAM interface; the map is never updated."""
+
+    def __init__(
+        self,
+        laser,
+        map_size_pixels: int,
+        map_size_meters: float,
+        num_particles: int = 500,
+        random_seed=None,
+        sigma_xy_mm: float = 20.0,
+        sigma_theta_degrees: float = 2.0,
+        odometry_noise: float = 0.1,
+        sigma_hit_mm: float = 100.0,
+        max_beams: int = 90,
+    ):
+        CoreSLAM.__init__(self, laser, map_size_pixels, map_size_meters)
+        self.num_particles = num_particles
+        self.sigma_xy_mm = sigma_xy_mm
+        self.sigma_theta_degrees = sigma_theta_degrees
+        self.odometry_noise = odometry_noise
+        self.sigma_hit_mm = sigma_hit_mm
+        self.map_size_pixels = map_size_pixels
+        self.mm_per_pixel = (map_size_meters * 1000) / map_size_pixels
+        self._rng = np.random.default_rng(random_seed)
+
+        # Same beam geometry as BreezySLAM's scan_update(), thinned to max_beams
+        first = laser.detection_margin + 1
+        last = laser.scan_size - laser.detection_margin - 1
+        self._beams = np.unique(np.linspace(first, last, min(max_beams, last - first + 1)).round().astype(int))
+        self._beam_angles = np.radians(
+            -laser.detection_angle_degrees / 2
+            + self._beams * laser.detection_angle_degrees / (laser.scan_size - 1)
+        )
+
+        self._field = None
+        self._rebuild_field()
+
+        # Start where the SLAM engines do, at the centre of the map
+        init_coord_mm = 500 * map_size_meters
+        self.position = Position(init_coord_mm, init_coord_mm, 0)
+
+    @property
+    def position(self) -> Position:
+        return Position(*self.getpos())
+
+    @position.setter
+    def position(self, position: Position):
+        """Re-seeds the particle cloud around position, e.g. after relocalization."""
+        n = self.num_particles
+        self._x = self._rng.normal(position.x_mm, self.sigma_xy_mm, n)
+        self._y = self._rng.normal(position.y_mm, self.sigma_xy_mm, n)
+        self._theta = self._rng.normal(math.radians(position.theta_degrees), math.radians(self.sigma_theta_degrees), n)
+        self._weights = np.full(n, 1.0 / n)
+        self._estimate = (position.x_mm, position.y_mm, position.theta_degrees)
+
+    def update(self, scans_mm, pose_change=None, scan_angles_degrees=None, should_update_map=True):
+        """
+        Moves the particles by pose_change (dxy_mm, dtheta_degrees, dt_seconds) and weighs them
+        against scans_mm. Takes the same arguments as RMHC_SLAM.update(); should_update_map is
+        ignored, since the map is never updated.
+        """
+        dxy_mm, dtheta_degrees = pose_change[:2] if pose_change else (0.0, 0.0)
+        self._predict(dxy_mm, math.radians(dtheta_degrees))
+
+        distances = np.asarray(scans_mm, dtype=np.float64)[self._beams]
+        angles = self._beam_angles
+        if scan_angles_degrees is not None:
+            angles = np.radians(np.asarray(scan_angles_degrees, dtype=np.float64)[self._beams])
+
+        # Zero means no detection; anything inside the hole width is the robot itself
+        hits = distances > self.hole_width_mm / 2
+        if hits.any():
+            self._correct(distances[hits], angles[hits])
+
+        self._update_estimate()
+
+        if 1.0 / np.sum(self._weights ** 2) < self.num_particles / 2:
+            self._resample()
+
+    def getpos(self):
+        """Returns the weighted mean pose as a tuple (x_mm, y_mm, theta_degrees)."""
+        return self._estimate
+
+    def setmap(self, mapbytes):
+        CoreSLAM.setmap(self, mapbytes)
+        self._rebuild_field()
+
+    def _rebuild_field(self):
+        field = likelihood_field(self.map.snapshot(), self.map_size_pixels, self.mm_per_pixel, self.sigma_hit_mm)
+        self._field = np.append(field.ravel(), field.min())
+
+    def _predict(self, dxy_mm: float, dtheta: float):
+        n = self.num_particles
+        step = dxy_mm + self._rng.normal(0.0, self.odometry_noise * abs(dxy_mm), n)
+        self._x += step * np.cos(self._theta) + self._rng.normal(0.0, self.sigma_xy_mm, n)
+        self._y += step * np.sin(self._theta) + self._rng.normal(0.0, self.sigma_xy_mm, n)
+        self._theta += dtheta + self._rng.normal(
+            0.0, self.odometry_noise * abs(dtheta) + math.radians(self.sigma_theta_degrees), n
+        )
+
+    def _correct(self, distances: np.ndarray, angles: np.ndarray):
+        # Scan endpoints in pixels for every particle at once (particles x beams),
+        # rotating the beam offsets with outer products instead of per-point trig
+        cos_theta, sin_theta = np.cos(self._theta), np.sin(self._theta)
+        beam_x = distances * np.cos(angles) / self.mm_per_pixel
+        beam_y = distances * np.sin(angles) / self.mm_per_pixel
+        laser_x = (self._x + self.laser.offset_mm * cos_theta) / self.mm_per_pixel + 0.5
+        laser_y = (self._y + self.laser.offset_mm * sin_theta) / self.mm_per_pixel + 0.5
+        px = np.floor(laser_x[:, None] + np.outer(cos_theta, beam_x) - np.outer(sin_theta, beam_y)).astype(np.intp)
+        py = np.floor(laser_y[:, None] + np.outer(sin_theta, beam_x) + np.outer(cos_theta, beam_y)).astype(np.intp)
+
+        # Endpoints off the map read the spare last entry, which holds the floor likelihood
+        size = self.map_size_pixels
+        inside = (px >= 0) & (px < size) & (py >= 0) & (py < size)
+        log_likelihood = self._field[np.where(inside, py * size + px, size * size)].sum(axis=1, dtype=np.float64)
+
+        weights = self._weights * np.exp(log_likelihood - log_likelihood.max())
+        total = weights.sum()
+        self._weights = weights / total if total > 0 else np.full(self.num_particles, 1.0 / self.num_particles)
+
+    def _update_estimate(self):
+        w = self._weights
+        mean_theta = math.atan2(np.dot(w, np.sin(self._theta)), np.dot(w, np.cos(self._theta)))
+        # Keep heading continuous, like the SLAM engines, rather than wrapping it
+        last_theta = math.radians(self._estimate[2])
+        theta = last_theta + (mean_theta - last_theta + math.pi) % (2 * math.pi) - math.pi
+        self._estimate = (float(np.dot(w, self._x)), float(np.dot(w, self._y)), math.degrees(theta))
+
+    def _resample(self):
+        # Low-variance (systematic) resampling
+        n = self.num_particles
+        positions = (self._rng.random() + np.arange(n)) / n
+        index = np.minimum(np.searchsorted(np.cumsum(self._weights), positions), n - 1)
+        self._x = self._x[index]
+        self._y = self._y[index]
+        self._theta = self._theta[index]
+        self._weights = np.full(n, 1.0 / n)
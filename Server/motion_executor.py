@@ -3,16 +3,22 @@ import threading
 import time
 from typing import List, Tuple, Optional, Dict
 
-from .pathfinder import OccupancyGrid, AStarPathfinder
+from .pathfinder import AStarPathfinder, JPSPathfinder
 from .motor_commander import MotorCommander
 from . import config
 
+# Path planners selectable through PLANNER_ALGORITHM, with the name used in plan messages
+_PATHFINDERS = {"astar": (AStarPathfinder, "A*"), "jps": (JPSPathfinder, "JPS")}
+
 
 class MotionExecutor:
-    def __init__(self, mqtt_bus, slam_service, db_module):
+    def __init__(self, mqtt_bus, slam_service, db_module, events=None):
         self.mqtt_bus = mqtt_bus
         self.slam_service = slam_service
         self.db = db_module
+        # Optional EventHub: autonomy status and path changes are pushed to it
+        self.events = events
+        self._published_status = None
 
         self._running = False
         self._thread = None
@@ -31,6 +37,10 @@ class MotionExecutor:
         self._distance_to_goal_mm = None
         self.motor_commander = MotorCommander(max_v=0.18, max_w=0.50)
 
+        self.planner = config.PLANNER_ALGORITHM if config.PLANNER_ALGORITHM in _PATHFINDERS else "astar"
+        if self.planner != config.PLANNER_ALGORITHM:
+            print(f"[MOTION] Unknown PLANNER_ALGORITHM {config.PLANNER_ALGORITHM!r} — using 'astar'")
+
         self.stats = {
             "jobs_completed": 0,
             "jobs_failed": 0,
@@ -62,27 +72,22 @@ class MotionExecutor:
 
         current_pose = self.slam_service.get_pose()
 
+        pathfinder_class, planner_name = _PATHFINDERS[self.planner]
         try:
-            # Use static map for planning so dynamic obstacles (people) don't block paths
-            mapbytes = self.slam_service.get_planning_map()
-            grid = OccupancyGrid(
-                mapbytes,
-                self.slam_service.map_pixels,
-                self.slam_service.map_pixels,
-                self.slam_service.map_size_m,
-                robot_radius_mm=config.ROBOT_RADIUS_MM,
-            )
-            path = AStarPathfinder(grid).plan(
+            # Use static map for planning so dynamic obstacles (people) don't block paths.
+            # The costmap is cached until the map changes, so back-to-back goals skip building it.
+            grid = self.slam_service.get_planning_grid(config.ROBOT_RADIUS_MM, config.PLANNER_CLEARANCE_MM)
+            path = pathfinder_class(grid, clearance_weight=config.PLANNER_CLEARANCE_WEIGHT).plan(
                 (current_pose["x_mm"], current_pose["y_mm"]),
                 (goal_x_mm, goal_y_mm),
             )
-            planning_mode = "astar"
-            plan_message = "A* path planned"
+            planning_mode = self.planner
+            plan_message = f"{planner_name} path planned"
         except Exception as e:
             print(f"[MOTION] Path planning error: {e}")
             path = None
             planning_mode = "direct_fallback"
-            plan_message = f"A* error, using direct demo path: {e}"
+            plan_message = f"{planner_name} error, using direct demo path: {e}"
 
         if path is None:
             path = self._direct_path(
@@ -90,7 +95,7 @@ class MotionExecutor:
                 (goal_x_mm, goal_y_mm),
             )
             planning_mode = "direct_fallback"
-            plan_message = "A* could not find a route, using direct demo path"
+            plan_message = f"{planner_name} could not find a route, using direct demo path"
 
         if len(path) < 2:
             self.stats["paths_failed"] += 1
@@ -113,6 +118,8 @@ class MotionExecutor:
             self.motor_commander.reset()
 
         self.stats["paths_planned"] += 1
+        self._publish_path()
+        self._publish_status()
         return {
             "ok": True,
             "goal": (goal_x_mm, goal_y_mm),
@@ -129,6 +136,7 @@ class MotionExecutor:
             self.path_index = max(1, min(self.path_index, len(self.planned_path) - 1))
             self._executing = True
             self.motor_commander.reset()
+        self._publish_status()
         return {"ok": True, "message": "Executing path", "planning_mode": self._planning_mode}
 
     def plan_and_go(self, goal_x_mm: float, goal_y_mm: float, job_id: str = None) -> Dict:
@@ -157,6 +165,8 @@ class MotionExecutor:
             self.motor_commander.reset()
         # Stop the robot immediately (ttl_ms=0 = keep stopped)
         self.mqtt_bus.publish_twist(v=0.0, w=0.0, ttl_ms=0, mode="autonomy")
+        self._publish_path()
+        self._publish_status()
 
     def get_path(self) -> Optional[List[Tuple[float, float]]]:
         with self._lock:
@@ -181,6 +191,19 @@ class MotionExecutor:
                 "distance_to_goal_mm": self._distance_to_goal_mm,
             }
 
+    def _publish_status(self):
+        """Pushes an "autonomy" event when get_status() differs from the last one pushed."""
+        if self.events is None:
+            return
+        status = self.get_status()
+        if status != self._published_status:
+            self._published_status = status
+            self.events.publish("autonomy", status)
+
+    def _publish_path(self):
+        if self.events is not None:
+            self.events.publish("path", {"goal": self.get_goal(), "path": self.get_path()})
+
     def _run(self):
         PUBLISH_INTERVAL_MS = 100   # 10 Hz control loop
         last_publish_ms = 0
@@ -230,8 +253,11 @@ class MotionExecutor:
                         self._blocked_by_obstacle = False
                     self._last_twist = twist
 
+            self._publish_status()
+
             if goal_done:
                 print("[MOTION] Goal reached")
+                self._publish_path()
                 self.mqtt_bus.publish_twist(v=0.0, w=0.0, ttl_ms=0, mode="autonomy")
                 if done_job_id:
                     try:
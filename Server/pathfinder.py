@@ -1,7 +1,45 @@
 import heapq
 import math
+from array import array
 from typing import List, Tuple, Optional
 
+import numpy as np
+
+from .distance_transform import squared_distance
+
+
+def _dilate_disc(occupied: np.ndarray, radius: int) -> np.ndarray:
+    """Binary dilation of occupied by a disc of radius pixels (offsets with dx^2 + dy^2 <= radius^2).
+
+    The disc is a stack of horizontal runs, one per row offset, so this is one sliding-window
+    maximum along x per distinct run width (from a cumulative sum) and one shifted OR per row.
+    Pixels beyond the edges count as free."""
+    height, width = occupied.shape
+    # counts[:, radius + k] = obstacles in columns [0, k), clamped beyond either edge
+    counts = np.zeros((height, width + 2 * radius + 1), dtype=np.int32)
+    np.cumsum(occupied, axis=1, out=counts[:, radius + 1:radius + 1 + width])
+    counts[:, radius + 1 + width:] = counts[:, radius + width, None]
+
+    by_half_width = {}
+    inflated = np.zeros_like(occupied)
+    for dy in range(-radius, radius + 1):
+        w = math.isqrt(radius * radius - dy * dy)
+        row_hit = by_half_width.get(w)
+        if row_hit is None:
+            # Any occupied pixel within [x - w, x + w] on the same row
+            row_hit = counts[:, radius + w + 1:radius + w + 1 + width] > counts[:, radius - w:radius - w + width]
+            by_half_width[w] = row_hit
+        # Pixel (x, y) is hit if row y + dy has an obstacle within w of x
+        if dy >= 0:
+            inflated[:height - dy] |= row_hit[dy:]
+        else:
+            inflated[-dy:] |= row_hit[:height + dy]
+    return inflated
+
+
+# Line samples sample_lines() evaluates in one NumPy pass
+_LINE_SAMPLES_PER_BATCH = 4096
+
 
 class OccupancyGrid:
     def __init__(
@@ -20,75 +58,184 @@ class OccupancyGrid:
         # BreezySLAM map values are low for obstacles and high for free space.
         # Unknown cells sit near the middle, so demo planning treats them as
         # passable and relies on the robot's live LiDAR stop for safety.
-        self._occupancy = bytearray(1 if b < 50 else 0 for b in mapbytes)
+        self._occupancy = np.frombuffer(mapbytes, dtype=np.uint8).reshape(height, width) < 50
 
         self.inflation_pixels = max(1, int(round(robot_radius_mm / self.mm_per_pixel)))
         self.planner_step_pixels = max(2, int(round(200.0 / self.mm_per_pixel)))
-        self._inflation_offsets = [
-            (dx, dy)
-            for dy in range(-self.inflation_pixels, self.inflation_pixels + 1)
-            for dx in range(-self.inflation_pixels, self.inflation_pixels + 1)
-            if dx * dx + dy * dy <= self.inflation_pixels * self.inflation_pixels
-        ]
-        self._collision_cache = {}
+        # Every pixel the robot's centre can occupy without touching an obstacle, built once
+        # for the whole map so each collision check is a single lookup
+        self._free = self._inflate()
+
+    def _inflate(self) -> np.ndarray:
+        return ~_dilate_disc(self._occupancy, self.inflation_pixels)
 
     def _raw_occupied(self, x_px: int, y_px: int) -> bool:
-        return bool(self._occupancy[y_px * self.width + x_px])
+        return bool(self._occupancy[y_px, x_px])
 
     def is_collision_free_px(self, x_px: int, y_px: int) -> bool:
         if not (0 <= x_px < self.width and 0 <= y_px < self.height):
             return False
-
-        key = (x_px, y_px)
-        cached = self._collision_cache.get(key)
-        if cached is not None:
-            return cached
-
-        for dx, dy in self._inflation_offsets:
-            nx, ny = x_px + dx, y_px + dy
-            if 0 <= nx < self.width and 0 <= ny < self.height and self._raw_occupied(nx, ny):
-                self._collision_cache[key] = False
-                return False
-
-        self._collision_cache[key] = True
-        return True
+        return bool(self._free[y_px, x_px])
 
     def is_collision_free(self, x_mm: float, y_mm: float) -> bool:
         x_px = int(x_mm / self.mm_per_pixel)
         y_px = int(y_mm / self.mm_per_pixel)
         return self.is_collision_free_px(x_px, y_px)
 
-    def is_line_collision_free(
+    def clearance_penalty_px(self, x_px: int, y_px: int) -> float:
+        """Extra cost, from 0 to 1, of passing through a free pixel; see Costmap. None here."""
+        return 0.0
+
+    def clearance_penalty(self, x_mm: float, y_mm: float) -> float:
+        return self.clearance_penalty_px(int(x_mm / self.mm_per_pixel), int(y_mm / self.mm_per_pixel))
+
+    def sample_px(self, x_px: np.ndarray, y_px: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """is_collision_free_px() and clearance_penalty_px() for arrays of on-map pixels at once."""
+        free = self._free[y_px, x_px]
+        return free, np.zeros(free.shape, dtype=np.float32)
+
+    def line_clearance_penalty(
         self,
         start_mm: Tuple[float, float],
         goal_mm: Tuple[float, float],
         step_mm: float = 100.0,
-    ) -> bool:
+    ) -> float:
+        """Highest clearance_penalty() sampled along a collision-free line."""
+        return 0.0
+
+    def _line_pixels(self, start_mm, goal_mm, step_mm):
+        """Pixels sampled every step_mm from start to goal, truncated as is_collision_free() does, and
+        whether all of them are on the map."""
         distance = math.dist(start_mm, goal_mm)
         steps = max(1, int(math.ceil(distance / step_mm)))
 
-        for i in range(steps + 1):
-            t = i / steps
-            x = start_mm[0] + (goal_mm[0] - start_mm[0]) * t
-            y = start_mm[1] + (goal_mm[1] - start_mm[1]) * t
-            if not self.is_collision_free(x, y):
-                return False
-        return True
+        t = np.arange(steps + 1) / steps
+        x_px = np.trunc((start_mm[0] + (goal_mm[0] - start_mm[0]) * t) / self.mm_per_pixel).astype(np.int64)
+        y_px = np.trunc((start_mm[1] + (goal_mm[1] - start_mm[1]) * t) / self.mm_per_pixel).astype(np.int64)
+        inside = (x_px >= 0) & (x_px < self.width) & (y_px >= 0) & (y_px < self.height)
+        return x_px, y_px, bool(inside.all())
 
+    def is_line_collision_free(
+        self,
+        start_mm: Tuple[float, float],
+        goal_mm: Tuple[float, float],
+        step_mm: float = 100.0,
+    ) -> bool:
+        x_px, y_px, inside = self._line_pixels(start_mm, goal_mm, step_mm)
+        return inside and bool(self._free[y_px, x_px].all())
 
-class AStarPathfinder:
-    def __init__(self, grid: OccupancyGrid):
-        self.grid = grid
+    def sample_lines(
+        self,
+        start_mm: Tuple[float, float],
+        goals_mm: List[Tuple[float, float]],
+        step_mm: float = 100.0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """is_line_collision_free() and line_clearance_penalty() from start_mm to each of goals_mm,
+        sampled exactly as those are but in a few batched passes."""
+        steps = np.array([max(1, int(math.ceil(math.dist(start_mm, goal) / step_mm))) for goal in goals_mm])
+        # Batches of at most _LINE_SAMPLES_PER_BATCH samples (or a single longer line) bound the
+        # temporaries when a long route tests hundreds of candidate shortcuts at once
+        ends = np.cumsum(steps + 1)
+        if ends[-1] > _LINE_SAMPLES_PER_BATCH:
+            results = []
+            lo = 0
+            while lo < len(steps):
+                batch_start = ends[lo] - steps[lo] - 1
+                hi = max(lo + 1, int(np.searchsorted(ends, batch_start + _LINE_SAMPLES_PER_BATCH, "right")))
+                results.append(self._sample_line_batch(start_mm, goals_mm[lo:hi], steps[lo:hi]))
+                lo = hi
+            return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+        return self._sample_line_batch(start_mm, goals_mm, steps)
+
+    def _sample_line_batch(self, start_mm, goals_mm, steps) -> Tuple[np.ndarray, np.ndarray]:
+        first = np.zeros(len(steps), dtype=np.int64)
+        np.cumsum(steps[:-1] + 1, out=first[1:])
+        line = np.repeat(np.arange(len(steps)), steps + 1)
+
+        goals = np.asarray(goals_mm, dtype=np.float64)
+        t = (np.arange(len(line)) - first[line]) / steps[line]
+        x_px = np.trunc((start_mm[0] + (goals[line, 0] - start_mm[0]) * t) / self.mm_per_pixel).astype(np.int64)
+        y_px = np.trunc((start_mm[1] + (goals[line, 1] - start_mm[1]) * t) / self.mm_per_pixel).astype(np.int64)
+        inside = (x_px >= 0) & (x_px < self.width) & (y_px >= 0) & (y_px < self.height)
+
+        free, penalty = self.sample_px(np.clip(x_px, 0, self.width - 1), np.clip(y_px, 0, self.height - 1))
+        collision_free = np.logical_and.reduceat(free & inside, first)
+        return collision_free, np.maximum.reduceat(penalty, first)
+
+
+class Costmap(OccupancyGrid):
+    """OccupancyGrid that also knows how far each pixel is from the nearest obstacle.
+
+    Collisions are the same as OccupancyGrid's (closer than robot_radius_mm). Between that
+    and clearance_mm, clearance_penalty_px() falls linearly from 1 to 0, so a planner that
+    weighs it keeps to the middle of aisles instead of grazing walls at the robot radius.
+    Both come from one distance transform of the map, built with the grid."""
 
-    def _heuristic(self, start: Tuple[int, int], goal: Tuple[int, int]) -> float:
-        dx = goal[0] - start[0]
-        dy = goal[1] - start[1]
-        return math.sqrt(dx**2 + dy**2)
+    def __init__(
+        self,
+        mapbytes: bytearray,
+        width: int,
+        height: int,
+        meters: float,
+        robot_radius_mm: float = 350.0,
+        clearance_mm: float = 700.0,
+    ):
+        self.clearance_mm = clearance_mm
+        super().__init__(mapbytes, width, height, meters, robot_radius_mm)
+
+    def _inflate(self) -> np.ndarray:
+        clearance_px = self.clearance_mm / self.mm_per_pixel
+        # At least one pixel past the robot radius, so pixels clear of it stay free when
+        # clearance_mm is no larger than the radius
+        squared = squared_distance(self._occupancy, max(self.inflation_pixels + 1, math.ceil(clearance_px)))
+
+        # Pixels to the nearest obstacle, up to clearance_mm (exact to the pixel within it)
+        self.distance_px = np.sqrt(squared.astype(np.float32))
+        if clearance_px > self.inflation_pixels:
+            ramp = (clearance_px - self.distance_px) / (clearance_px - self.inflation_pixels)
+            self._penalty = np.clip(ramp, 0.0, 1.0).astype(np.float32)
+        else:
+            self._penalty = np.zeros_like(self.distance_px)
+        return squared > self.inflation_pixels * self.inflation_pixels
+
+    def distance_mm(self, x_mm: float, y_mm: float) -> float:
+        """Distance to the nearest obstacle, capped at clearance_mm (or one pixel past the robot radius if larger)."""
+        x_px = min(max(int(x_mm / self.mm_per_pixel), 0), self.width - 1)
+        y_px = min(max(int(y_mm / self.mm_per_pixel), 0), self.height - 1)
+        return float(self.distance_px[y_px, x_px]) * self.mm_per_pixel
+
+    def clearance_penalty_px(self, x_px: int, y_px: int) -> float:
+        if not (0 <= x_px < self.width and 0 <= y_px < self.height):
+            return 0.0
+        return float(self._penalty[y_px, x_px])
 
-    def _get_cost(self, a: Tuple[int, int], b: Tuple[int, int]) -> float:
-        dx = abs(b[0] - a[0])
-        dy = abs(b[1] - a[1])
-        return math.sqrt(2) if (dx == 1 and dy == 1) else 1.0
+    def sample_px(self, x_px: np.ndarray, y_px: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self._free[y_px, x_px], self._penalty[y_px, x_px]
+
+    def line_clearance_penalty(
+        self,
+        start_mm: Tuple[float, float],
+        goal_mm: Tuple[float, float],
+        step_mm: float = 100.0,
+    ) -> float:
+        x_px, y_px, inside = self._line_pixels(start_mm, goal_mm, step_mm)
+        if not inside:
+            return 0.0
+        return float(self._penalty[y_px, x_px].max())
+
+
+# The 8 moves between planner cells, in the order A* tries them, with their lengths in cells
+_MOVES = [(dx, dy, math.sqrt(2) if (dx and dy) else 1.0) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+class AStarPathfinder:
+    def __init__(self, grid: OccupancyGrid, clearance_weight: float = 0.0):
+        self.grid = grid
+        # Each step costs its length times (1 + clearance_weight * the grid's clearance penalty at
+        # the cell entered), so with a Costmap a detour through open space can beat hugging a wall
+        self.clearance_weight = clearance_weight
+        # Cells closed by the last search
+        self.expansions = 0
 
     def plan(
         self,
@@ -96,7 +243,11 @@ class AStarPathfinder:
         goal_mm: Tuple[float, float],
         max_iterations: int = 80000,
     ) -> Optional[List[Tuple[float, float]]]:
-        if self.grid.is_line_collision_free(start_mm, goal_mm):
+        if self.grid.is_line_collision_free(start_mm, goal_mm) and self._line_clear_enough(
+            start_mm,
+            goal_mm,
+            self.clearance_weight * max(self.grid.clearance_penalty(*start_mm), self.grid.clearance_penalty(*goal_mm)),
+        ):
             return [start_mm, goal_mm]
 
         step = self.grid.planner_step_pixels
@@ -118,10 +269,22 @@ class AStarPathfinder:
             x_px, y_px = cell_to_px(cell)
             return (x_px * self.grid.mm_per_pixel, y_px * self.grid.mm_per_pixel)
 
+        # The search runs on flat indices into tables over the cells plus a blocked border, so
+        # neighbours need no bounds checks. Indices are x-major, (x + 1) * stride + (y + 1), so
+        # heap ties break in the same (x, y) order as cell tuples would.
+        stride = cells_h + 2
+        passable, step_factor = self._cell_tables(cells_w, cells_h, step)
+
+        def cell_index(cell: Tuple[int, int]) -> int:
+            return (cell[0] + 1) * stride + cell[1] + 1
+
         def cell_free(cell: Tuple[int, int]) -> bool:
             if not (0 <= cell[0] < cells_w and 0 <= cell[1] < cells_h):
                 return False
-            return self.grid.is_collision_free_px(*cell_to_px(cell))
+            return bool(passable[cell_index(cell)])
+
+        def cell_penalty(cell: Tuple[int, int]) -> float:
+            return self.clearance_weight * self.grid.clearance_penalty_px(*cell_to_px(cell))
 
         def nearest_free(cell: Tuple[int, int], radius_cells: int = 8) -> Optional[Tuple[int, int]]:
             if cell_free(cell):
@@ -151,73 +314,111 @@ class AStarPathfinder:
         if start_cell == goal_cell:
             return [start_mm, goal_mm]
 
-        open_set = [(0, start_cell)]
-        closed_set = set()
-        g_score = {start_cell: 0}
-        came_from = {}
+        # Straight-line distance to the goal in cells, for every index
+        dx = np.arange(cells_w + 2)[:, None] - (goal_cell[0] + 1)
+        dy = np.arange(stride)[None, :] - (goal_cell[1] + 1)
+        heuristic = array("d", np.sqrt(dx * dx + dy * dy).ravel().tobytes())
+
+        route = self._search(cell_index(start_cell), cell_index(goal_cell), passable, step_factor, stride,
+                             heuristic, max_iterations)
+        if route is None:
+            return None
+
+        cell_path = [(index // stride - 1, index % stride - 1) for index in route]
+        cell_path = self._shortcut_cells(cell_path, cell_to_mm, [cell_penalty(c) for c in cell_path])
+        path = self._simplify_cells(cell_path, cell_to_mm)
+        path[0] = start_mm
+        path[-1] = goal_mm
+        return path
+
+    def _search(self, start: int, goal: int, passable: bytes, step_factor: array, stride: int,
+                heuristic: array, max_iterations: int) -> Optional[List[int]]:
+        """Indices of every cell from start to goal on a cheapest route, or None. Sets self.expansions."""
+        moves = [(dx * stride + dy, cost) for dx, dy, cost in _MOVES]
+        # Typed tables: a relaxation stores its score and parent unboxed, so the heap entries
+        # are the only objects the search keeps per cell
+        g_score = array("d", [math.inf]) * len(passable)
+        parent = array("l", [-1]) * len(passable)
+        closed = bytearray(len(passable))
+        g_score[start] = 0.0
+        open_set = [(0.0, start)]
+        heappush, heappop = heapq.heappush, heapq.heappop
         iteration = 0
 
         while open_set and iteration < max_iterations:
             iteration += 1
-            _f, current = heapq.heappop(open_set)
+            _f, current = heappop(open_set)
 
-            if current in closed_set:
+            if closed[current]:
                 continue
 
-            closed_set.add(current)
-
-            if current == goal_cell:
-                cell_path = []
-                node = goal_cell
-                while node in came_from:
-                    cell_path.append(node)
-                    node = came_from[node]
-                cell_path.append(start_cell)
-                cell_path.reverse()
-
-                cell_path = self._shortcut_cells(cell_path, cell_to_mm)
-                path = self._simplify_cells(cell_path, cell_to_mm)
-                path[0] = start_mm
-                path[-1] = goal_mm
-                return path
-
-            for neighbor in self._neighbors(current, cells_w, cells_h, cell_free):
-                if neighbor in closed_set:
+            closed[current] = 1
+
+            if current == goal:
+                self.expansions = closed.count(1)
+                route = [goal]
+                while route[-1] != start:
+                    route.append(parent[route[-1]])
+                route.reverse()
+                return route
+
+            g = g_score[current]
+            for offset, cost in moves:
+                neighbor = current + offset
+                if closed[neighbor] or not passable[neighbor]:
                     continue
 
-                tentative_g = g_score[current] + self._get_cost(current, neighbor)
+                tentative_g = g + cost * step_factor[neighbor]
 
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
+                if tentative_g < g_score[neighbor]:
+                    parent[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    h = self._heuristic(neighbor, goal_cell)
-                    f = tentative_g + h
-                    heapq.heappush(open_set, (f, neighbor))
+                    heappush(open_set, (tentative_g + heuristic[neighbor], neighbor))
 
+        self.expansions = closed.count(1)
         return None
 
-    def _neighbors(self, cell, cells_w, cells_h, cell_free):
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                neighbor = (cell[0] + dx, cell[1] + dy)
-                if 0 <= neighbor[0] < cells_w and 0 <= neighbor[1] < cells_h and cell_free(neighbor):
-                    yield neighbor
-
-    def _shortcut_cells(self, cells, cell_to_mm):
+    def _cell_tables(self, cells_w: int, cells_h: int, step: int) -> Tuple[bytes, array]:
+        """Whether each cell of the bordered search grid is passable, and the factor on the length of a
+        step into it (1 + clearance_weight * penalty), flat and x-major in bytes and array("d"), which
+        index faster than NumPy and hold no object per cell."""
+        x_px = np.minimum(np.arange(cells_w) * step, self.grid.width - 1)
+        y_px = np.minimum(np.arange(cells_h) * step, self.grid.height - 1)
+        free, penalty = self.grid.sample_px(x_px[:, None], y_px[None, :])
+
+        passable = np.zeros((cells_w + 2, cells_h + 2), dtype=bool)
+        passable[1:-1, 1:-1] = free
+        step_factor = np.ones(passable.shape)
+        step_factor[1:-1, 1:-1] = 1 + self.clearance_weight * penalty.astype(np.float64)
+        return passable.ravel().tobytes(), array("d", step_factor.ravel().tobytes())
+
+    def _line_clear_enough(self, start_mm, goal_mm, max_penalty: float) -> bool:
+        """Whether a straight move keeps at least the clearance of the route it would replace."""
+        if self.clearance_weight <= 0:
+            return True
+        return self.clearance_weight * self.grid.line_clearance_penalty(start_mm, goal_mm) <= max_penalty + 1e-6
+
+    def _shortcut_cells(self, cells, cell_to_mm, penalties):
         if len(cells) <= 2:
             return cells
 
+        points = [cell_to_mm(c) for c in cells]
+        penalties = np.asarray(penalties, dtype=np.float64)
         shortcut = [cells[0]]
         anchor = 0
 
         while anchor < len(cells) - 1:
-            farthest = len(cells) - 1
-            while farthest > anchor + 1:
-                if self.grid.is_line_collision_free(cell_to_mm(cells[anchor]), cell_to_mm(cells[farthest])):
-                    break
-                farthest -= 1
+            # Jump to the farthest cell reachable in a straight line, testing every candidate at once
+            farthest = anchor + 1
+            if anchor + 2 < len(cells):
+                reachable, line_penalty = self.grid.sample_lines(points[anchor], points[anchor + 2:])
+                if self.clearance_weight > 0:
+                    # Keep at least the clearance of the cells skipped
+                    route_penalty = np.maximum.accumulate(penalties[anchor:])[2:]
+                    reachable &= self.clearance_weight * line_penalty.astype(np.float64) <= route_penalty + 1e-6
+                candidates = np.flatnonzero(reachable)
+                if len(candidates):
+                    farthest = anchor + 2 + int(candidates[-1])
             shortcut.append(cells[farthest])
             anchor = farthest
 
@@ -253,3 +454,129 @@ class AStarPathfinder:
 
         keep.append(cells[-1])
         return [cell_to_mm(c) for c in keep]
+
+
+class JPSPathfinder(AStarPathfinder):
+    """Jump Point Search: A* that, on a uniform-cost 8-connected grid, jumps along straight and
+    diagonal runs and only stops at cells where an obstacle forces a turn, so open space costs a
+    few expansions instead of one per cell. Same plan() contract and post-processing as
+    AStarPathfinder.
+
+    Every step costs its length only: clearance_weight still keeps shortcuts and the direct
+    line off walls, but the search itself cannot weigh clearance."""
+
+    def _search(self, start: int, goal: int, passable: bytes, step_factor: array, stride: int,
+                heuristic: array, max_iterations: int) -> Optional[List[int]]:
+        # Moves allow cutting corners past a blocked orthogonal neighbour, as in
+        # AStarPathfinder, so these are the original pruning rules of Harabor and Grastien.
+        # The blocked border stops every jump at the grid edge.
+        def jump_straight(node: int, step: int, side: int) -> Optional[int]:
+            while True:
+                node += step
+                if not passable[node]:
+                    return None
+                if node == goal:
+                    return node
+                if (not passable[node + side] and passable[node + side + step]) or (
+                    not passable[node - side] and passable[node - side + step]
+                ):
+                    return node
+
+        def jump(node: int, dx: int, dy: int) -> Optional[int]:
+            if not dx:
+                return jump_straight(node, dy, stride)
+            if not dy:
+                return jump_straight(node, dx * stride, 1)
+            ox, oy = dx * stride, dy
+            while True:
+                node += ox + oy
+                if not passable[node]:
+                    return None
+                if node == goal:
+                    return node
+                if (not passable[node - ox] and passable[node - ox + oy]) or (
+                    not passable[node - oy] and passable[node + ox - oy]
+                ):
+                    return node
+                if jump_straight(node, ox, 1) is not None or jump_straight(node, oy, stride) is not None:
+                    return node
+
+        def directions(node: int, parent_node: int) -> List[Tuple[int, int]]:
+            """Moves worth trying from node when it was reached from parent_node."""
+            if parent_node < 0:
+                return [(dx, dy) for dx, dy, _ in _MOVES]
+            dx = (node // stride > parent_node // stride) - (node // stride < parent_node // stride)
+            dy = (node % stride > parent_node % stride) - (node % stride < parent_node % stride)
+            if dx and dy:
+                moves = [(dx, 0), (0, dy), (dx, dy)]
+                if not passable[node - dx * stride]:
+                    moves.append((-dx, dy))
+                if not passable[node - dy]:
+                    moves.append((dx, -dy))
+            elif dx:
+                moves = [(dx, 0)]
+                if not passable[node + 1]:
+                    moves.append((dx, 1))
+                if not passable[node - 1]:
+                    moves.append((dx, -1))
+            else:
+                moves = [(0, dy)]
+                if not passable[node + stride]:
+                    moves.append((1, dy))
+                if not passable[node - stride]:
+                    moves.append((-1, dy))
+            return moves
+
+        g_score = array("d", [math.inf]) * len(passable)
+        parent = array("l", [-1]) * len(passable)
+        closed = bytearray(len(passable))
+        g_score[start] = 0.0
+        open_set = [(0.0, start)]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        iteration = 0
+
+        while open_set and iteration < max_iterations:
+            iteration += 1
+            _f, current = heappop(open_set)
+
+            if closed[current]:
+                continue
+
+            closed[current] = 1
+
+            if current == goal:
+                self.expansions = closed.count(1)
+                return self._fill_route(start, goal, parent, stride)
+
+            g = g_score[current]
+            for dx, dy in directions(current, parent[current]):
+                neighbor = jump(current, dx, dy)
+                if neighbor is None or closed[neighbor]:
+                    continue
+
+                # Jumps run in one direction, so their length is the octile distance
+                run_x = abs(neighbor // stride - current // stride)
+                run_y = abs(neighbor % stride - current % stride)
+                tentative_g = g + math.sqrt(2) * min(run_x, run_y) + abs(run_x - run_y)
+
+                if tentative_g < g_score[neighbor]:
+                    parent[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    heappush(open_set, (tentative_g + heuristic[neighbor], neighbor))
+
+        self.expansions = closed.count(1)
+        return None
+
+    def _fill_route(self, start: int, goal: int, parent: array, stride: int) -> List[int]:
+        """Every cell from start to goal, stepping along the straight or diagonal run between jump points."""
+        jump_points = [goal]
+        while jump_points[-1] != start:
+            jump_points.append(parent[jump_points[-1]])
+        jump_points.reverse()
+
+        route = [start]
+        for a, b in zip(jump_points, jump_points[1:]):
+            dx = (b // stride > a // stride) - (b // stride < a // stride)
+            dy = (b % stride > a % stride) - (b % stride < a % stride)
+            route.extend(range(a + dx * stride + dy, b + dx * stride + dy, dx * stride + dy))
+        return route
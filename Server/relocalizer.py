@@ -0,0 +1,168 @@
+"""Global relocalization against the saved static map.
+
+Finds the robot's pose from a few scans taken while it stands still, with no
+prior: every free cell of a min-pooled copy of the map is tried at a coarse
+heading step, and the best hypotheses are refined one pyramid level at a time
+down to full resolution. All scoring goes through
+pybreezyslam.distanceScanToMapBatch, which releases the GIL and spreads each
+batch of poses over native threads.
+"""
+import math
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from pybreezyslam import Map, MapPyramid, Scan, distanceScanToMapBatch
+
+# Cells this much brighter than BreezySLAM's unknown grey (127) have been seen
+# free, so the robot could be standing there.
+_FREE_MIN = 160
+
+# distanceScanToMap reports -1 when no scan point lands on the map.
+_NO_MATCH = np.iinfo(np.int64).max // 16
+
+
+@dataclass(frozen=True)
+class RelocalizationResult:
+    x_mm: float
+    y_mm: float
+    theta_deg: float
+    score: int
+    candidates: int
+    poses_scored: int
+    global_ms: float
+    refine_ms: float
+    threads: int
+
+    def as_dict(self) -> dict:
+        return {
+            "pose": {"x_mm": self.x_mm, "y_mm": self.y_mm, "theta_deg": self.theta_deg},
+            "score": self.score,
+            "candidates": self.candidates,
+            "poses_scored": self.poses_scored,
+            "global_ms": self.global_ms,
+            "refine_ms": self.refine_ms,
+            "threads": self.threads,
+        }
+
+
+class GlobalRelocalizer:
+    def __init__(
+        self,
+        mapbytes: bytearray,
+        map_pixels: int,
+        map_size_m: float,
+        laser,
+        hole_width_mm: float,
+        levels: int = 3,
+        theta_step_deg: float = 5.0,
+        keep: int = 64,
+        threads: int = 0,
+    ):
+        self.map_pixels = map_pixels
+        self.mm_per_pixel = (map_size_m * 1000) / map_pixels
+        self.levels = levels
+        self.theta_step_deg = theta_step_deg
+        self.keep = keep
+        self.threads = threads or os.cpu_count() or 1
+        self._laser = laser
+        self._hole_width_mm = hole_width_mm
+        self._mapbytes = bytearray(mapbytes)
+
+        # self._maps[k] halves the resolution k times; 0 is the map itself
+        full = Map(map_pixels, map_size_m, self._mapbytes)
+        pyramid = MapPyramid(full, levels)
+        self._maps = [full] + [
+            Map(map_pixels >> level, map_size_m, pyramid.get(level))
+            for level in range(1, levels + 1)
+        ]
+
+    def locate(self, scans_mm: list) -> RelocalizationResult:
+        """Best laser pose for scans taken from one spot, each a list or int32 array."""
+        scans = []
+        for distances_mm in scans_mm:
+            scan = Scan(self._laser, 1)
+            scan.update(scans_mm=distances_mm, hole_width_mm=self._hole_width_mm)
+            scans.append(scan)
+
+        t0 = time.perf_counter()
+        poses = self._global_candidates()
+        candidates = len(poses)
+        scores = self._score(self._maps[self.levels], scans, poses)
+        poses_scored = len(poses)
+        poses, scores = self._best(poses, scores)
+        t1 = time.perf_counter()
+
+        # Each round searches a 3x3x3 neighbourhood of every kept hypothesis on
+        # the next finer map, with steps matched to its cell size; a last round
+        # at half a pixel polishes the winner.
+        rounds = [(level, self.mm_per_pixel * (1 << level)) for level in range(self.levels - 1, -1, -1)]
+        rounds.append((0, self.mm_per_pixel / 2))
+        step_theta = self.theta_step_deg / 2
+        for level, step_xy in rounds:
+            poses = self._neighbourhood(poses, step_xy, step_theta)
+            scores = self._score(self._maps[level], scans, poses)
+            poses_scored += len(poses)
+            poses, scores = self._best(poses, scores)
+            step_theta /= 2
+        t2 = time.perf_counter()
+
+        x_mm, y_mm, theta_deg = poses[0]
+        return RelocalizationResult(
+            x_mm=float(x_mm),
+            y_mm=float(y_mm),
+            theta_deg=float(theta_deg % 360.0),
+            score=int(scores[0]),
+            candidates=candidates,
+            poses_scored=poses_scored,
+            global_ms=round((t1 - t0) * 1000.0, 1),
+            refine_ms=round((t2 - t1) * 1000.0, 1),
+            threads=self.threads,
+        )
+
+    def _global_candidates(self) -> np.ndarray:
+        # A coarse cell is a candidate if any map pixel inside it is free
+        factor = 1 << self.levels
+        cells = self.map_pixels >> self.levels
+        pixels = np.frombuffer(self._mapbytes, dtype=np.uint8).reshape(self.map_pixels, self.map_pixels)
+        pixels = pixels[: cells * factor, : cells * factor]
+        free = (pixels > _FREE_MIN).reshape(cells, factor, cells, factor).any(axis=(1, 3))
+
+        rows, cols = np.nonzero(free)
+        cell_mm = self.mm_per_pixel * factor
+        thetas = np.arange(0.0, 360.0, self.theta_step_deg)
+
+        poses = np.empty((len(rows), len(thetas), 3))
+        poses[:, :, 0] = ((cols + 0.5) * cell_mm)[:, None]
+        poses[:, :, 1] = ((rows + 0.5) * cell_mm)[:, None]
+        poses[:, :, 2] = thetas[None, :]
+        return poses.reshape(-1, 3)
+
+    def _neighbourhood(self, poses: np.ndarray, step_xy: float, step_theta: float) -> np.ndarray:
+        steps = np.array([-1.0, 0.0, 1.0])
+        offsets = np.stack(np.meshgrid(steps * step_xy, steps * step_xy, steps * step_theta,
+                                       indexing="ij"), axis=-1).reshape(-1, 3)
+        neighbours = (poses[:, None, :] + offsets[None, :, :]).reshape(-1, 3)
+        return np.unique(neighbours.round(3), axis=0)
+
+    def _score(self, slam_map: Map, scans: list, poses: np.ndarray) -> np.ndarray:
+        # Lower is better; the scans were taken from one spot, so their distances add up
+        total = np.zeros(len(poses), dtype=np.int64)
+        for scan in scans:
+            distances = np.asarray(distanceScanToMapBatch(slam_map, scan, poses, self.threads), dtype=np.int64)
+            total += np.where(distances < 0, _NO_MATCH, distances)
+        return total
+
+    def _best(self, poses: np.ndarray, scores: np.ndarray):
+        if len(poses) > self.keep:
+            kept = np.argpartition(scores, self.keep)[: self.keep]
+            poses, scores = poses[kept], scores[kept]
+        order = np.argsort(scores, kind="stable")
+        return poses[order], scores[order]
+
+
+def laser_to_robot(x_mm: float, y_mm: float, theta_deg: float, offset_mm: float):
+    """Robot pose for a laser pose, for a laser mounted offset_mm ahead of the robot's centre."""
+    theta = math.radians(theta_deg)
+    return x_mm - offset_mm * math.cos(theta), y_mm - offset_mm * math.sin(theta), theta_deg
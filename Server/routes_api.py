@@ -1,12 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from datetime import datetime, timezone
 import io
-import base64
+import gzip
 
 from .config import ROBOT_ID, TOPIC_JOB, TOPIC_TWIST, TOPIC_DONE, TOPIC_TELEMETRY, NAMED_LOCATIONS
 from .db import enqueue_job, list_jobs, get_active_job, claim_next_job, mark_done, list_places, save_place, delete_place
 from .mqtt_client import STATE, MqttBus
 from .admin import archive_db
+from .slam_service import MAP_FORMATS
 
 api = Blueprint("api", __name__)
 
@@ -39,7 +40,7 @@ def _try_start_motion(motion_executor, slam_service, job: dict):
         motion_executor.go()
 
 
-def bind_api(bus: MqttBus, slam_service=None, motion_executor=None):
+def bind_api(bus: MqttBus, slam_service=None, motion_executor=None, events=None):
     @api.get("/health")
     def health():
         return jsonify({"ok": True, "robot_id": ROBOT_ID})
@@ -192,30 +193,73 @@ def bind_api(bus: MqttBus, slam_service=None, motion_executor=None):
         if not slam_service:
             return jsonify({"error": "SLAM service not available"}), 503
 
-        pose = slam_service.get_pose()
+        pose = slam_service.get_pose_snapshot()
         return jsonify({
             "ok": True,
-            "x_mm": pose["x_mm"],
-            "y_mm": pose["y_mm"],
-            "theta_deg": pose["theta_deg"],
+            "x_mm": pose.x_mm,
+            "y_mm": pose.y_mm,
+            "theta_deg": pose.theta_deg,
+            "seq": pose.seq,
+            "ts": pose.ts,
             "ready": slam_service.is_ready(),
         })
 
     @api.get("/api/slam/map")
     def api_slam_map():
+        """Whole map as ?format=png (default), zlib (raw 8-bit pixels row by row, zlib-compressed) or json
+        (base64, as before). Encoded once per map version and sent with an ETag; If-None-Match gets a 304."""
         if not slam_service:
             return jsonify({"error": "SLAM service not available"}), 503
 
         if not slam_service.is_ready():
             return jsonify({"error": "SLAM not ready, no scans received yet"}), 503
 
-        mapbytes = slam_service.get_map()
-        return jsonify({
-            "ok": True,
-            "width": slam_service.map_pixels,
-            "height": slam_service.map_pixels,
-            "data": base64.b64encode(mapbytes).decode("utf-8"),
+        fmt = request.args.get("format", "png")
+        if fmt not in MAP_FORMATS:
+            return jsonify({"error": f"format must be one of {', '.join(MAP_FORMATS)}"}), 400
+
+        snapshot = slam_service.get_map_snapshot(fmt)
+        response = Response(snapshot.body, mimetype=snapshot.mimetype, headers={
+            "Cache-Control": "no-cache",
+            "X-Map-Width": str(slam_service.map_pixels),
+            "X-Map-Height": str(slam_service.map_pixels),
+            "X-Map-Version": str(snapshot.version),
         })
+        response.set_etag(snapshot.etag)
+        return response.make_conditional(request)
+
+    @api.get("/api/slam/map/tiles")
+    def api_slam_map_tiles():
+        """Map tiles changed since ?since=<version> as binary (see MapTiles.encode); 0 or absent gets them all."""
+        if not slam_service:
+            return jsonify({"error": "SLAM service not available"}), 503
+
+        if not slam_service.is_ready():
+            return jsonify({"error": "SLAM not ready, no scans received yet"}), 503
+
+        since = request.args.get("since", 0, type=int)
+        body = slam_service.get_map_tiles(max(0, since)).encode()
+        headers = {"Cache-Control": "no-store", "Vary": "Accept-Encoding"}
+        # Map pixels are long runs of a few values, so even the fastest level shrinks them several-fold
+        if len(body) > 1024 and "gzip" in request.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+        return Response(body, mimetype="application/octet-stream", headers=headers)
+
+    @api.get("/api/events")
+    def api_events():
+        """Server-Sent Events: pose, robot, autonomy, path and map (version) events, latest value per topic."""
+        if not events:
+            return jsonify({"error": "Event stream not available"}), 503
+
+        if not events.connect():
+            return jsonify({"error": "Too many event stream clients"}), 503
+
+        response = Response(events.stream(), mimetype="text/event-stream",
+                            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+        # Runs when the server closes the stream, whether or not it got going
+        response.call_on_close(events.disconnect)
+        return response
 
     @api.get("/api/slam/stats")
     def api_slam_stats():
@@ -246,6 +290,22 @@ def bind_api(bus: MqttBus, slam_service=None, motion_executor=None):
         result = slam_service.reset()
         return jsonify(result), (200 if result.get("ok") else 500)
 
+    @api.post("/api/slam/relocalize")
+    def api_slam_relocalize():
+        if not slam_service:
+            return jsonify({"error": "SLAM service not available"}), 503
+        data = request.get_json(silent=True) or {}
+        try:
+            num_scans = int(data["scans"]) if "scans" in data else None
+            timeout_s = float(data.get("timeout_s", 10.0))
+        except (ValueError, TypeError):
+            return jsonify({"ok": False, "error": "scans and timeout_s must be numbers"}), 400
+        # The pose is about to jump, so any plan made from the old one is void
+        if motion_executor:
+            motion_executor.cancel()
+        result = slam_service.relocalize(num_scans=num_scans, timeout_s=timeout_s)
+        return jsonify(result), (200 if result.get("ok") else 409)
+
     @api.post("/api/slam/save_map")
     def api_save_map():
         if not slam_service:
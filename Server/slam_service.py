@@ -1,13 +1,17 @@
 import math
 import threading
+import base64
 import json
 import struct
 import time
+import zlib
 from collections import deque
+from dataclasses import dataclass
 from typing import Optional
 import numpy as np
-from breezyslam.algorithms import RMHC_SLAM
+from breezyslam.algorithms import RMHC_SLAM, MultiResolution_SLAM, Correlative_SLAM
 from breezyslam.sensors import Laser
+from pybreezyslam import Position
 
 import sys
 from pathlib import Path
@@ -36,15 +40,166 @@ from .config import (
     ENCODER_RIGHT_SIGN,
     ODOM_THETA_SIGN,
     ODOM_MAX_DELTA_TICKS,
+    SCAN_QUEUE_MAXLEN,
+    SLAM_RMHC_CHAINS,
+    SLAM_RMHC_SPLIT_ITER,
+    SLAM_ALGORITHM,
+    SLAM_RELOCALIZE_SCANS,
+    SLAM_RELOCALIZE_THETA_STEP_DEG,
+    SLAM_RELOCALIZE_LEVELS,
+    SLAM_MCL_PARTICLES,
+    SLAM_KEYFRAME_DISTANCE_MM,
+    SLAM_KEYFRAME_ROTATION_DEG,
+    SLAM_KEYFRAME_INTERVAL_S,
 )
+from .localizer import MonteCarloLocalization
+from .pathfinder import Costmap
+from .relocalizer import GlobalRelocalizer, laser_to_robot
+
+# Scan matchers selectable through SLAM_ALGORITHM; all share the RMHC_SLAM interface.
+# "mcl" only localizes on the static map and never updates it.
+_SLAM_CLASSES = {
+    "rmhc": RMHC_SLAM,
+    "multires": MultiResolution_SLAM,
+    "correlative": Correlative_SLAM,
+    "mcl": MonteCarloLocalization,
+}
+
+# BreezySLAM stores 16-bit pixels; the displayed 8-bit value is the high byte.
+_MAP_HIGH_BYTE = 1 if sys.byteorder == "little" else 0
+
+
+def _composite(live: np.ndarray, static: np.ndarray) -> np.ndarray:
+    """Overlays the static map on live map pixels in place: static walls win, new walls show as transient."""
+    static_wall = static < 50
+    dynamic_hit = (~static_wall) & (live < 50)
+
+    live[static_wall] = static[static_wall]   # keep static walls
+    live[dynamic_hit] = 175                   # mark transient obstacles
+    return live
+
+
+@dataclass(frozen=True)
+class PoseSnapshot:
+    x_mm: float
+    y_mm: float
+    theta_deg: float
+    seq: int
+    ts: float
+
+    def as_dict(self) -> dict:
+        return {"x_mm": self.x_mm, "y_mm": self.y_mm, "theta_deg": self.theta_deg}
+
+
+@dataclass(frozen=True)
+class MapTiles:
+    """Tiles of the displayed map changed after some map version; see SlamService.get_map_tiles()."""
+    version: int
+    size_pixels: int
+    tile_size: int
+    tiles: list
+    data: bytes
+
+    def encode(self) -> bytes:
+        """Wire format: a little-endian header ("MT", uint16 size_pixels, uint32 version, uint16 tile_size,
+        uint16 tile count), the tile indices as uint16, then each tile's pixels row by row. Tile k starts at
+        column (k % tiles_per_side) * tile_size, row (k // tiles_per_side) * tile_size; edge tiles may be cut short."""
+        header = struct.pack("<2sHIHH", b"MT", self.size_pixels, self.version, self.tile_size, len(self.tiles))
+        return header + np.asarray(self.tiles, dtype="<u2").tobytes() + self.data
+
+
+@dataclass(frozen=True)
+class MapSnapshot:
+    """The displayed map at one map version, encoded once for every request; see SlamService.get_map_snapshot()."""
+    version: int
+    etag: str
+    body: bytes
+    mimetype: str
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _encode_png(pixels: np.ndarray, size: int) -> tuple:
+    """8-bit greyscale PNG; every row uses filter 0, as the map is long runs of a few values that deflate well."""
+    rows = np.zeros((size, size + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(size, size)
+    body = (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 0, 0, 0, 0))
+            + _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6))
+            + _png_chunk(b"IEND", b""))
+    return body, "image/png"
+
+
+def _encode_zlib(pixels: np.ndarray, size: int) -> tuple:
+    return zlib.compress(pixels.tobytes(), 6), "application/octet-stream"
+
+
+def _encode_json(pixels: np.ndarray, size: int) -> tuple:
+    body = json.dumps({
+        "ok": True,
+        "width": size,
+        "height": size,
+        "data": base64.b64encode(pixels.tobytes()).decode("utf-8"),
+    })
+    return body.encode("utf-8"), "application/json"
+
+
+# Encodings of SlamService.get_map_snapshot(): "png" for <img> and viewers, "zlib" for the raw 8-bit
+# pixels row by row, "json" for the original base64 response
+MAP_FORMATS = {
+    "png": _encode_png,
+    "zlib": _encode_zlib,
+    "json": _encode_json,
+}
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    obstacle: int
+    mode: int
+    mot_l: int
+    mot_r: int
+    scans_ok: int
+    seq: int
+    ts: float
+
+    def as_dict(self) -> dict:
+        return {
+            "obstacle": self.obstacle,
+            "mode":     self.mode,
+            "mot_l":    self.mot_l,
+            "mot_r":    self.mot_r,
+            "scans_ok": self.scans_ok,
+        }
 
 
 class SlamService:
-    def __init__(self, mqtt_bus):
+    def __init__(self, mqtt_bus, events=None):
         self.mqtt_bus = mqtt_bus
+        # Optional EventHub: pose, robot status and map version changes are pushed to it
+        self.events = events
+        self._published_map_version = None
         self._running = False
         self._thread = None
         self._lock = threading.Lock()
+        # Guards self.slam only, so odometry/status handlers on the MQTT thread
+        # never wait behind a scan match.
+        self._slam_lock = threading.Lock()
+
+        # Ingest stage: the MQTT callback only enqueues raw SCN3 payloads here and
+        # the worker in _run() drains it. Latest-wins — a full queue drops the oldest.
+        self._scan_queue = deque(maxlen=max(1, SCAN_QUEUE_MAXLEN))
+        self._scan_cond = threading.Condition()
+
+        # Relocalization: while _reloc_scans is a list, the worker parks parsed
+        # scans there instead of matching them, so the map isn't smeared at the
+        # wrong pose before the global search seeds the real one.
+        self._reloc_lock = threading.Lock()
+        self._reloc_cond = threading.Condition(self._lock)
+        self._reloc_scans: Optional[list] = None
+        self._reloc_wanted = 0
 
         # SLAM parameters — stored so reset() can recreate an identical instance
         MAP_SIZE_PIXELS = 800
@@ -59,11 +214,23 @@ class SlamService:
             sigma_xy_mm=200,
             sigma_theta_degrees=30,
             max_search_iter=2000,
+            num_chains=SLAM_RMHC_CHAINS,
+            split_search_iter=SLAM_RMHC_SPLIT_ITER,
         )
+        self._slam_kwargs_by_algorithm = {
+            "rmhc": self._rmhc_kwargs,
+            # Coarse-to-fine: the sigmas apply to the coarsest level and halve per level.
+            "multires": dict(random_seed=0xAB30, sigma_xy_mm=200, sigma_theta_degrees=30),
+            # Same reach as the RMHC sigmas, searched exhaustively on a fixed grid.
+            "correlative": dict(window_xy_mm=200, window_theta_degrees=30, step_theta_degrees=1),
+            "mcl": dict(num_particles=SLAM_MCL_PARTICLES, random_seed=0xAB30),
+        }
+        self.algorithm = SLAM_ALGORITHM if SLAM_ALGORITHM in _SLAM_CLASSES else "rmhc"
+        if self.algorithm != SLAM_ALGORITHM:
+            print(f"[SLAM] Unknown SLAM_ALGORITHM {SLAM_ALGORITHM!r} — using 'rmhc'")
 
         # Create laser and SLAM
-        laser = Laser(*self._laser_args)
-        self.slam = RMHC_SLAM(laser, *self._slam_args, **self._rmhc_kwargs)
+        self.slam = self._new_slam()
 
         self.TICKS_PER_REV = TICKS_PER_REV
         self.WHEEL_DIAMETER_MM = WHEEL_DIAMETER_MM
@@ -80,18 +247,44 @@ class SlamService:
         self._last_lidar_ts = 0.0
 
         # State
-        self.mapbytes = bytearray(MAP_SIZE_PIXELS * MAP_SIZE_PIXELS)
         self.map_pixels = MAP_SIZE_PIXELS
         self.map_size_m = MAP_SIZE_METERS
-        self.current_pose = {"x_mm": 0, "y_mm": 0, "theta_deg": 0}
+        # Pose and robot status are published as immutable snapshots and swapped
+        # in with a single attribute assignment, so readers never take a lock.
+        self._pose = PoseSnapshot(0, 0, 0, seq=0, ts=0.0)
+
+        # Displayed map tiles, versioned across SLAM resets and static map changes:
+        # _tile_versions[k] is the _map_version that last changed tile k. Synced
+        # lazily from the SLAM map's own tile versions by _sync_map_version().
+        self._map_version = 0
+        self._tile_versions = np.zeros(self.slam.map.tiles_per_side ** 2, dtype=np.int64)
+        self._synced_live_version = 0
+        self._synced_static_version = -1
+
+        # Encoded get_map() images by format, each for the _map_version it was taken at.
+        # _map_epoch keeps ETags from repeating across restarts, where _map_version starts over.
+        self._map_snapshots = {}
+        self._map_snapshot_lock = threading.Lock()
+        self._map_epoch = int(time.time())
+
+        # Planning costmaps by (robot radius, clearance), all built from the planning map
+        # identified by _planning_grid_key; see get_planning_grid(). _slam_generation
+        # counts resets, as a new SLAM map starts its versions over.
+        self._planning_grids = {}
+        self._planning_grid_key = None
+        self._planning_grid_lock = threading.Lock()
+        self._slam_generation = 0
 
         # Static map — saved snapshot used for planning and composite display
         self._static_map: Optional[bytearray] = None
+        self._static_map_version = 0
         self._static_map_path = STATIC_MAP_PATH
         self._try_load_static_map()  # restore from disk if available
+        if self.algorithm == "mcl" and self._static_map is None:
+            print("[SLAM] 'mcl' localizes on the static map, but none is saved — build one with 'rmhc' first")
 
         # Latest robot status message (from robot/r1/status topic)
-        self._robot_status = {"obstacle": 0, "mode": 0, "mot_l": 0, "mot_r": 0, "scans_ok": 0}
+        self._robot_status = StatusSnapshot(0, 0, 0, 0, 0, seq=0, ts=0.0)
 
         # Statistics
         self.stats = {
@@ -103,6 +296,18 @@ class SlamService:
             "last_odom": {"dxy_mm": 0.0, "dtheta_deg": 0.0, "dt_ms": 0},
             "slam_updates": 0,
             "last_update_ms": 0,
+            "scans_enqueued": 0,
+            "scans_dropped": 0,
+            "queue_depth": 0,
+            "queue_max_depth": 0,
+            "queue_capacity": self._scan_queue.maxlen,
+            "last_latency_ms": 0.0,
+            "max_latency_ms": 0.0,
+            "relocalizations": 0,
+            "map_updates": 0,
+            "map_updates_skipped": 0,
+            "planning_grids_built": 0,
+            "planning_grids_reused": 0,
         }
 
     def start(self):
@@ -119,16 +324,36 @@ class SlamService:
 
     def stop(self):
         self._running = False
+        with self._scan_cond:
+            self._scan_cond.notify_all()
         if self._thread:
             self._thread.join(timeout=5)
         print("[SLAM] SlamService stopped")
 
     def _on_lidar_message(self, payload_bytes, topic):
+        # Runs on the paho network thread — keep it O(1) so ACKs and encoder
+        # messages are never stuck behind a scan match.
+        with self._scan_cond:
+            if len(self._scan_queue) == self._scan_queue.maxlen:
+                self.stats["scans_dropped"] += 1
+            self._scan_queue.append((time.monotonic(), bytes(payload_bytes)))
+            depth = len(self._scan_queue)
+            self.stats["scans_enqueued"] += 1
+            self.stats["queue_depth"] = depth
+            self.stats["queue_max_depth"] = max(self.stats["queue_max_depth"], depth)
+            self._scan_cond.notify()
+
+    def _process_scan(self, payload_bytes, enqueued_at):
         try:
             if parse_scan is None:
                 return
 
-            parsed_scan = parse_scan(payload_bytes, reverse_scan=True, exclusion_zones=POST_EXCLUSION_ZONES or None)
+            parsed_scan = parse_scan(
+                payload_bytes,
+                reverse_scan=True,
+                exclusion_zones=POST_EXCLUSION_ZONES or None,
+                as_array=True,  # int32 array is handed to BreezySLAM without copying
+            )
             if parsed_scan is None:
                 self.stats["lidar_skipped"] += 1
                 return
@@ -139,12 +364,29 @@ class SlamService:
                 dt = now - self._last_lidar_ts if self._last_lidar_ts else 0.0
                 self._last_lidar_ts = now
                 pose_change = (self._pending_dxy_mm, self._pending_dtheta_deg, dt)
-                self.slam.update(parsed_scan.distances_mm, pose_change)
                 self._pending_dxy_mm = 0.0
                 self._pending_dtheta_deg = 0.0
+
+                if self._reloc_scans is not None:
+                    if len(self._reloc_scans) < self._reloc_wanted:
+                        self._reloc_scans.append(parsed_scan.distances_mm)
+                        self._reloc_cond.notify_all()
+                    return
+
+            with self._slam_lock:
+                self.slam.update(parsed_scan.distances_mm, pose_change)
                 self._update_pose()
+
+            latency_ms = (time.monotonic() - enqueued_at) * 1000.0
+            with self._lock:
                 self.stats["slam_updates"] += 1
+                self.stats["map_updates"] = self.slam.map_updates
+                self.stats["map_updates_skipped"] = self.slam.map_updates_skipped
                 self.stats["last_update_ms"] = int(time.time() * 1000)
+                self.stats["last_latency_ms"] = round(latency_ms, 1)
+                self.stats["max_latency_ms"] = round(max(self.stats["max_latency_ms"], latency_ms), 1)
+
+            self._publish_map_version()
 
         except Exception as e:
             print(f"[SLAM] LiDAR parse error: {e}")
@@ -153,14 +395,16 @@ class SlamService:
     def _on_status_message(self, payload_bytes, topic):
         try:
             data = json.loads(payload_bytes.decode("utf-8"))
-            with self._lock:
-                self._robot_status = {
-                    "obstacle": int(data.get("obstacle", 0)),
-                    "mode":     int(data.get("mode", 0)),
-                    "mot_l":    int(data.get("mot_l", 0)),
-                    "mot_r":    int(data.get("mot_r", 0)),
-                    "scans_ok": int(data.get("scans_ok", 0)),
-                }
+            self._robot_status = StatusSnapshot(
+                obstacle=int(data.get("obstacle", 0)),
+                mode=int(data.get("mode", 0)),
+                mot_l=int(data.get("mot_l", 0)),
+                mot_r=int(data.get("mot_r", 0)),
+                scans_ok=int(data.get("scans_ok", 0)),
+                seq=self._robot_status.seq + 1,
+                ts=time.time(),
+            )
+            self._publish("robot", self._robot_status.as_dict())
         except Exception:
             pass
 
@@ -220,33 +464,42 @@ class SlamService:
     def _update_pose(self):
         try:
             x, y, theta_deg = self.slam.getpos()
-            self.current_pose = {
-                "x_mm": x,
-                "y_mm": y,
-                "theta_deg": theta_deg,
-            }
+            self._pose = PoseSnapshot(x, y, theta_deg, seq=self._pose.seq + 1, ts=time.time())
+            self._publish("pose", {**self._pose.as_dict(), "seq": self._pose.seq})
         except Exception as e:
             print(f"[SLAM] getpos error: {e}")
 
     def _run(self):
         while self._running:
-            time.sleep(0.1)
+            with self._scan_cond:
+                while self._running and not self._scan_queue:
+                    self._scan_cond.wait(timeout=0.1)
+                if not self._scan_queue:
+                    continue
+                enqueued_at, payload = self._scan_queue.popleft()
+                self.stats["queue_depth"] = len(self._scan_queue)
+            self._process_scan(payload, enqueued_at)
 
     def get_pose(self):
-        with self._lock:
-            return dict(self.current_pose)
+        return self._pose.as_dict()
+
+    def get_pose_snapshot(self) -> PoseSnapshot:
+        return self._pose
 
     def save_static_map(self) -> dict:
+        with self._slam_lock:
+            snapshot = self.slam.getmapsnapshot()
         with self._lock:
-            snapshot = bytearray(self.map_pixels * self.map_pixels)
-            self.slam.getmap(snapshot)
             self._static_map = snapshot
+            self._static_map_version += 1
+        self._drop_planning_grids()
 
         try:
             self._static_map_path.parent.mkdir(parents=True, exist_ok=True)
             arr = np.frombuffer(self._static_map, dtype=np.uint8).copy()
             np.save(str(self._static_map_path), arr)
             print(f"[SLAM] Static map saved → {self._static_map_path}")
+            self._publish_map_version()
             return {"ok": True}
         except Exception as e:
             print(f"[SLAM] Map save error: {e}")
@@ -255,6 +508,9 @@ class SlamService:
     def clear_static_map(self) -> dict:
         with self._lock:
             self._static_map = None
+            self._static_map_version += 1
+        self._drop_planning_grids()
+        self._publish_map_version()
         try:
             if self._static_map_path.exists():
                 self._static_map_path.unlink()
@@ -273,20 +529,89 @@ class SlamService:
             if len(loaded) != expected:
                 print(f"[SLAM] Static map size mismatch ({len(loaded)} vs {expected}) — ignoring")
                 return
-            with self._lock:
+            with self._slam_lock, self._lock:
                 self._static_map = loaded
+                self._static_map_version += 1
                 self.slam.setmap(self._static_map)
             print(f"[SLAM] Static map loaded from {self._static_map_path}")
         except Exception as e:
             print(f"[SLAM] Could not load static map: {e}")
 
-    def reset(self) -> dict:
+    def relocalize(self, num_scans: Optional[int] = None, timeout_s: float = 10.0) -> dict:
+        """Find the pose on the static map from the next few scans; the robot must stand still."""
         with self._lock:
-            laser = Laser(*self._laser_args)
-            self.slam = RMHC_SLAM(laser, *self._slam_args, **self._rmhc_kwargs)
+            static_map = self._static_map
+        if static_map is None:
+            return {"ok": False, "error": "No static map saved — nothing to relocalize against"}
+        if not self._reloc_lock.acquire(blocking=False):
+            return {"ok": False, "error": "Relocalization already running"}
+
+        try:
+            num_scans = max(1, int(num_scans or SLAM_RELOCALIZE_SCANS))
+            t0 = time.monotonic()
+            with self._lock:
+                self._reloc_wanted = num_scans
+                self._reloc_scans = []
+                self._reloc_cond.wait_for(lambda: len(self._reloc_scans) >= num_scans, timeout=timeout_s)
+                scans = list(self._reloc_scans)
+            capture_ms = round((time.monotonic() - t0) * 1000.0, 1)
+            if len(scans) < num_scans:
+                return {"ok": False, "error": f"Only {len(scans)} of {num_scans} scans arrived within {timeout_s:g} s"}
+
+            relocalizer = GlobalRelocalizer(
+                static_map,
+                self.map_pixels,
+                self.map_size_m,
+                Laser(*self._laser_args),
+                self.slam.hole_width_mm,
+                levels=SLAM_RELOCALIZE_LEVELS,
+                theta_step_deg=SLAM_RELOCALIZE_THETA_STEP_DEG,
+            )
+            result = relocalizer.locate(scans)
+
+            # Restart from the clean static map at the found pose; scans that
+            # arrived meanwhile were parked, so nothing was matched at the old pose.
+            with self._slam_lock, self._lock:
+                x_mm, y_mm, theta_deg = laser_to_robot(
+                    result.x_mm, result.y_mm, result.theta_deg, self.slam.laser.offset_mm
+                )
+                self.slam.setmap(static_map)
+                # Forget the last keyframe pose, so the next scan is integrated at the new pose
+                self.slam.setkeyframes(SLAM_KEYFRAME_DISTANCE_MM, SLAM_KEYFRAME_ROTATION_DEG, SLAM_KEYFRAME_INTERVAL_S)
+                self.slam.position = Position(x_mm, y_mm, theta_deg)
+                self._pending_dxy_mm = 0.0
+                self._pending_dtheta_deg = 0.0
+                self._update_pose()
+                self.stats["relocalizations"] += 1
+            print(f"[SLAM] Relocalized to ({x_mm:.0f}, {y_mm:.0f}, {theta_deg:.1f}°) "
+                  f"in {result.global_ms + result.refine_ms:.0f} ms")
+            return {"ok": True, **result.as_dict(), "pose": self.get_pose(),
+                    "capture_ms": capture_ms, "scans": len(scans)}
+        finally:
+            with self._lock:
+                self._reloc_scans = None
+            self._reloc_lock.release()
+
+    def _new_slam(self):
+        laser = Laser(*self._laser_args)
+        slam_class = _SLAM_CLASSES[self.algorithm]
+        slam = slam_class(laser, *self._slam_args, **self._slam_kwargs_by_algorithm[self.algorithm])
+        slam.setkeyframes(SLAM_KEYFRAME_DISTANCE_MM, SLAM_KEYFRAME_ROTATION_DEG, SLAM_KEYFRAME_INTERVAL_S)
+        return slam
+
+    def reset(self) -> dict:
+        with self._scan_cond:
+            self._scan_queue.clear()
+            self.stats["queue_depth"] = 0
+        with self._slam_lock, self._lock:
+            self.slam = self._new_slam()
+            # The new map counts its versions from scratch
+            self._synced_live_version = 0
+            self._slam_generation += 1
             if self._static_map is not None:
                 self.slam.setmap(self._static_map)
-            self.current_pose = {"x_mm": 0, "y_mm": 0, "theta_deg": 0}
+            self._pose = PoseSnapshot(0, 0, 0, seq=self._pose.seq + 1, ts=time.time())
+            self._publish("pose", {**self._pose.as_dict(), "seq": self._pose.seq})
             self._pending_dxy_mm = 0.0
             self._pending_dtheta_deg = 0.0
             self._last_lidar_ts = 0.0
@@ -298,6 +623,16 @@ class SlamService:
             self.stats["encoder_baselined"] = False
             self.stats["encoder_dropped"] = 0
             self.stats["last_odom"] = {"dxy_mm": 0.0, "dtheta_deg": 0.0, "dt_ms": 0}
+            self.stats["scans_enqueued"] = 0
+            self.stats["scans_dropped"] = 0
+            self.stats["queue_max_depth"] = 0
+            self.stats["last_latency_ms"] = 0.0
+            self.stats["max_latency_ms"] = 0.0
+            self.stats["relocalizations"] = 0
+            self.stats["map_updates"] = 0
+            self.stats["map_updates_skipped"] = 0
+        self._drop_planning_grids()
+        self._publish_map_version()
         print("[SLAM] Map reset — awaiting first scan")
         return {"ok": True, "seeded_from_static": self._static_map is not None}
 
@@ -309,38 +644,163 @@ class SlamService:
         with self._lock:
             if self._static_map is not None:
                 return bytearray(self._static_map)
-            live = bytearray(self.map_pixels * self.map_pixels)
-            self.slam.getmap(live)
-            return live
+        with self._slam_lock:
+            return self.slam.getmapsnapshot()
+
+    def get_planning_grid(self, robot_radius_mm: float, clearance_mm: float) -> Costmap:
+        """Costmap of get_planning_map(), built once per planning map version, robot radius and
+        clearance and shared by every plan until the map changes. Callers must not modify it."""
+        with self._planning_grid_lock:
+            if self._planning_map_key() != self._planning_grid_key:
+                self._planning_grids = {}
+            grid = self._planning_grids.get((robot_radius_mm, clearance_mm))
+            if grid is not None:
+                with self._lock:
+                    self.stats["planning_grids_reused"] += 1
+                return grid
+
+            key, mapbytes = self._versioned_planning_map()
+            grid = Costmap(mapbytes, self.map_pixels, self.map_pixels, self.map_size_m,
+                           robot_radius_mm=robot_radius_mm, clearance_mm=clearance_mm)
+            if key != self._planning_grid_key:
+                self._planning_grids = {}
+                self._planning_grid_key = key
+            self._planning_grids[(robot_radius_mm, clearance_mm)] = grid
+            with self._lock:
+                self.stats["planning_grids_built"] += 1
+            return grid
 
-    def get_map(self):
+    def _planning_map_key(self) -> tuple:
+        """Identifies the get_planning_map() image: the static map version, or the live map's version."""
         with self._lock:
-            live = bytearray(self.map_pixels * self.map_pixels)
-            self.slam.getmap(live)
-
-            if self._static_map is None:
-                return live
+            if self._static_map is not None:
+                return ("static", self._static_map_version)
+        with self._slam_lock:
+            return ("live", self._slam_generation, self.slam.getmapversion())
 
-            # Vectorised composite — runs in <1 ms on 800×800
-            s = np.frombuffer(self._static_map, dtype=np.uint8)
-            c = np.frombuffer(live, dtype=np.uint8)
+    def _versioned_planning_map(self) -> tuple:
+        """(_planning_map_key(), get_planning_map()), consistent with each other."""
+        with self._lock:
+            if self._static_map is not None:
+                return ("static", self._static_map_version), bytearray(self._static_map)
+        with self._slam_lock:
+            return ("live", self._slam_generation, self.slam.getmapversion()), self.slam.getmapsnapshot()
+
+    def _drop_planning_grids(self):
+        """Frees the cached planning grids once the map they were built from is gone."""
+        with self._planning_grid_lock:
+            self._planning_grids = {}
+            self._planning_grid_key = None
+
+    def _live_map_view(self) -> np.ndarray:
+        """Zero-copy uint8 view of the live SLAM map. Caller must hold _slam_lock."""
+        pixels = np.asarray(self.slam.getmapview())
+        return pixels.view(np.uint8)[:, _MAP_HIGH_BYTE::2]
+
+    def get_map(self) -> bytes:
+        return self._versioned_map()[1].tobytes()
+
+    def get_map_snapshot(self, fmt: str = "png") -> MapSnapshot:
+        """get_map() encoded as one of MAP_FORMATS. Encoded again only once the map version has moved,
+        so polling an unchanged map costs a version check."""
+        encode = MAP_FORMATS[fmt]
+        with self._map_snapshot_lock:
+            snapshot = self._map_snapshots.get(fmt)
+            if snapshot is not None and snapshot.version == self.get_map_version():
+                return snapshot
+
+            version, pixels = self._versioned_map()
+            body, mimetype = encode(pixels, self.map_pixels)
+            snapshot = MapSnapshot(version, f"{self._map_epoch:x}-{version}-{fmt}", body, mimetype)
+            self._map_snapshots[fmt] = snapshot
+            return snapshot
+
+    def _versioned_map(self) -> tuple:
+        """(map version, get_map() pixels as a flat uint8 array), consistent with each other."""
+        # Single copy straight out of BreezySLAM's pixel buffer, taken under the
+        # lock so the frame is consistent; compositing happens outside it.
+        with self._slam_lock:
+            with self._lock:
+                static_map, static_version = self._static_map, self._static_map_version
+            self._sync_map_version(static_version)
+            version = self._map_version
+            c = self._live_map_view().copy().ravel()
 
-            result = c.copy()
-            static_wall = s < 50
-            dynamic_hit = (~static_wall) & (c < 50)
+        if static_map is None:
+            return version, c
 
-            result[static_wall] = s[static_wall]   # keep static walls
-            result[dynamic_hit] = 175               # mark transient obstacles
+        # Vectorised composite — runs in <1 ms on 800×800
+        return version, _composite(c, np.frombuffer(static_map, dtype=np.uint8))
 
-            return bytearray(result.tobytes())
+    def get_map_version(self) -> int:
+        """Version of the get_map() image; goes up whenever it changes, including across resets."""
+        with self._slam_lock:
+            with self._lock:
+                static_version = self._static_map_version
+            self._sync_map_version(static_version)
+            return self._map_version
+
+    def get_map_tiles(self, since: int = 0) -> MapTiles:
+        """Tiles of the get_map() image changed after map version since, for clients patching their copy.
+        since=0, or a version from before a server restart, returns every tile."""
+        with self._slam_lock:
+            with self._lock:
+                static_map, static_version = self._static_map, self._static_map_version
+            self._sync_map_version(static_version)
+            if since > self._map_version:
+                since = 0
+            tiles = np.flatnonzero(self._tile_versions > since).tolist()
+            data = self.slam.map.get_tiles(tiles)
+            version = self._map_version
+            tile_size = self.slam.map.tile_size
+
+        if static_map is not None and tiles:
+            # The tiles are concatenated row by row, so gather the static pixels in the same order
+            n = self.map_pixels
+            per_side = -(-n // tile_size)
+            s = np.frombuffer(static_map, dtype=np.uint8).reshape(n, n)
+            s = np.concatenate([
+                s[(k // per_side) * tile_size:(k // per_side + 1) * tile_size,
+                  (k % per_side) * tile_size:(k % per_side + 1) * tile_size].ravel()
+                for k in tiles
+            ])
+            data = _composite(np.frombuffer(data, dtype=np.uint8).copy(), s).tobytes()
+
+        return MapTiles(version, self.map_pixels, tile_size, tiles, data)
+
+    def _publish(self, topic: str, data: dict):
+        if self.events is not None:
+            self.events.publish(topic, data)
+
+    def _publish_map_version(self):
+        """Pushes a "map" event when the get_map() image has changed, so clients fetch the new tiles."""
+        if self.events is None:
+            return
+        version = self.get_map_version()
+        if version != self._published_map_version:
+            self._published_map_version = version
+            self.events.publish("map", {"version": version})
+
+    def _sync_map_version(self, static_version: int):
+        """Folds SLAM map and static map changes into the tile versions. Caller must hold _slam_lock."""
+        live_version, changed = self.slam.map.changed_tiles(self._synced_live_version)
+        if static_version != self._synced_static_version:
+            changed = slice(None)
+        if changed:
+            self._map_version += 1
+            self._tile_versions[changed] = self._map_version
+        self._synced_live_version = live_version
+        self._synced_static_version = static_version
 
     def get_stats(self):
         with self._lock:
-            return dict(self.stats)
+            stats = dict(self.stats)
+        stats["pose_seq"] = self._pose.seq
+        stats["algorithm"] = self.algorithm
+        return stats
 
     def is_ready(self):
         return self.stats["slam_updates"] > 0
 
     def get_robot_status(self) -> dict:
-        with self._lock:
-            return dict(self._robot_status)
+        return self._robot_status.as_dict()
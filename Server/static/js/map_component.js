@@ -15,6 +15,11 @@ class MapCanvas {
         this.mmPerPixel  = mapSizeMm / mapSizePixels;
         this.pixelPerMm  = mapSizePixels / mapSizeMm;
 
+        // Coloured map image kept between frames; see drawOccupancyGrid()
+        this._gridImage = null;
+        this._gridDark  = null;
+        this._gridLut   = null;
+
         this.isDarkTheme = document.documentElement.getAttribute('data-theme') === 'dark';
 
         const observer = new MutationObserver(() => {
@@ -50,6 +55,15 @@ class MapCanvas {
         };
     }
 
+    setMapSize(mapSizePixels) {
+        this.mapSizePixels = mapSizePixels;
+        this.canvas.width  = mapSizePixels;
+        this.canvas.height = mapSizePixels;
+        this.pixelPerMm    = mapSizePixels / this.mapSizeMm;
+        this.mmPerPixel    = this.mapSizeMm / mapSizePixels;
+        this._gridImage    = null;
+    }
+
     clearBackground() {
         const colors = this.getColors();
         this.ctx.save();
@@ -59,28 +73,48 @@ class MapCanvas {
         this.ctx.restore();
     }
 
+    // The coloured image is only rebuilt in full when the size or theme changes;
+    // updateOccupancyGrid() patches it as map tiles arrive.
     drawOccupancyGrid(mapBytes) {
-        const colors    = this.getColors();
-        const imageData = this.ctx.createImageData(this.mapSizePixels, this.mapSizePixels);
-        const data      = imageData.data;
-
-        for(let i = 0; i < mapBytes.length; i++) {
-            const srcX = i % this.mapSizePixels;
-            const srcY = Math.floor(i / this.mapSizePixels);
-            const dstY = this.flipY ? (this.mapSizePixels - 1 - srcY) : srcY;
-            const dstI = (dstY * this.mapSizePixels + srcX) * 4;
-            const v = mapBytes[i];
-            let [r, g, b] = v > 200  ? this._hex3(colors.freespace)  // free space
-                          : v >= 150 ? this._hex3(colors.dynamic)    // transient obstacle
-                          : v < 50   ? this._hex3(colors.occupied)   // wall / obstacle
-                                     : this._hex3(colors.unknown);   // unexplored
-            data[dstI]     = r;
-            data[dstI + 1] = g;
-            data[dstI + 2] = b;
-            data[dstI + 3] = 255;
+        if(!this._gridImage || this._gridDark !== this.isDarkTheme) {
+            this._gridImage = this.ctx.createImageData(this.mapSizePixels, this.mapSizePixels);
+            this._gridDark  = this.isDarkTheme;
+            this._gridLut   = this._pixelLut();
+            this.updateOccupancyGrid(mapBytes, 0, 0, this.mapSizePixels, this.mapSizePixels);
         }
 
-        this.ctx.putImageData(imageData, 0, 0);
+        this.ctx.putImageData(this._gridImage, 0, 0);
+    }
+
+    // Recolours the w x h block of map pixels at (x, y) in the kept image.
+    updateOccupancyGrid(mapBytes, x, y, w, h) {
+        if(!this._gridImage) return;
+        const size   = this.mapSizePixels;
+        const pixels = new Uint32Array(this._gridImage.data.buffer);
+        const lut    = this._gridLut;
+
+        for(let srcY = y; srcY < y + h; srcY++) {
+            const dstY = this.flipY ? (size - 1 - srcY) : srcY;
+            let src = srcY * size + x;
+            let dst = dstY * size + x;
+            for(let i = 0; i < w; i++) pixels[dst++] = lut[mapBytes[src++]];
+        }
+    }
+
+    // RGBA for every map byte value, laid out in memory as ImageData expects
+    _pixelLut() {
+        const colors = this.getColors();
+        const lut    = new Uint32Array(256);
+        const rgba   = new Uint8Array(lut.buffer);
+
+        for(let v = 0; v < 256; v++) {
+            const [r, g, b] = v > 200  ? this._hex3(colors.freespace)  // free space
+                            : v >= 150 ? this._hex3(colors.dynamic)    // transient obstacle
+                            : v < 50   ? this._hex3(colors.occupied)   // wall / obstacle
+                                       : this._hex3(colors.unknown);   // unexplored
+            rgba.set([r, g, b, 255], v * 4);
+        }
+        return lut;
     }
 
     drawRobot(xMm, yMm, thetaDeg) {
@@ -1,12 +1,18 @@
 class MapViewer {
-    constructor(canvasId) {
+    // events: optional EventSource on /api/events; pose, path and map changes then
+    // arrive pushed instead of being polled, until the stream closes for good.
+    constructor(canvasId, events = null) {
         this.mapCanvas  = new MapCanvas(canvasId);
+        this.events     = events;
         this.isRunning  = false;
 
         this.currentPose = { x_mm: 0, y_mm: 0, theta_deg: 0 };
         this.plannedPath = null;
         this.currentGoal = null;
         this.mapBuffer   = null;
+        this.mapVersion  = 0;
+        this._mapFetch   = null;
+        this._mapStale   = false;
         this.places      = [];
 
         this.mapUpdateInterval    = 500;
@@ -20,10 +26,19 @@ class MapViewer {
     start() {
         if(this.isRunning) return;
         this.isRunning = true;
+        if(this.events && this.events.readyState !== EventSource.CLOSED) {
+            this._subscribe();
+            this._fetchMapTiles();
+        } else {
+            this._startPolling();
+        }
+        this._placesLoop();
+    }
+
+    _startPolling() {
         this._poseLoop();
         this._mapLoop();
         this._pathLoop();
-        this._placesLoop();
     }
 
     stop() {
@@ -42,6 +57,48 @@ class MapViewer {
         });
     }
 
+    _subscribe() {
+        this.events.addEventListener('pose', e => {
+            if(!this.isRunning) return;
+            const data = JSON.parse(e.data);
+            this.currentPose = { x_mm: data.x_mm, y_mm: data.y_mm, theta_deg: data.theta_deg };
+            this._render();
+        });
+        this.events.addEventListener('path', e => {
+            if(!this.isRunning) return;
+            const data = JSON.parse(e.data);
+            this.plannedPath = data.path;
+            this.currentGoal = data.goal;
+            this._render();
+        });
+        this.events.addEventListener('map', e => {
+            if(!this.isRunning) return;
+            if(JSON.parse(e.data).version !== this.mapVersion) this._fetchMapTiles();
+        });
+        // EventSource never reconnects after a non-200 answer (503 when the server has
+        // no stream slot left), so poll from then on
+        this.events.addEventListener('error', () => {
+            if(this.isRunning && this.events.readyState === EventSource.CLOSED) this._startPolling();
+        });
+    }
+
+    // One tiles request at a time; a map event arriving meanwhile triggers one more
+    async _fetchMapTiles() {
+        if(this._mapFetch) {
+            this._mapStale = true;
+            return;
+        }
+        do {
+            this._mapStale = false;
+            this._mapFetch = fetch(`/api/slam/map/tiles?since=${this.mapVersion}`);
+            try {
+                const res = await this._mapFetch;
+                if(res.ok) this._applyMapTiles(await res.arrayBuffer());
+            } catch (e) { console.error('Map error:', e); }
+            this._mapFetch = null;
+        } while(this._mapStale && this.isRunning);
+    }
+
     async _poseLoop() {
         while(this.isRunning) {
             try {
@@ -60,33 +117,50 @@ class MapViewer {
 
     async _mapLoop() {
         while(this.isRunning) {
-            try {
-                const res = await fetch('/api/slam/map');
-                if(res.ok) {
-                    const data = await res.json();
-                    if(data.ok) {
-                        const bin = atob(data.data);
-                        const bytes = new Uint8Array(bin.length);
-                        for(let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
-
-                        // If the server reports a different map resolution, update to match
-                        if(data.width && data.width !== this.mapCanvas.mapSizePixels) {
-                            this.mapCanvas.mapSizePixels = data.width;
-                            this.mapCanvas.canvas.width  = data.width;
-                            this.mapCanvas.canvas.height = data.height || data.width;
-                            this.mapCanvas.pixelPerMm    = data.width  / this.mapCanvas.mapSizeMm;
-                            this.mapCanvas.mmPerPixel    = this.mapCanvas.mapSizeMm / data.width;
-                        }
-
-                        this.mapBuffer = bytes;
-                        this._render();
-                    }
-                }
-            } catch (e) { console.error('Map error:', e); }
+            // Only the tiles changed since the version we hold; the first request gets them all
+            await this._fetchMapTiles();
             await this._sleep(this.mapUpdateInterval);
         }
     }
 
+    // Body: little-endian header ("MT", uint16 size, uint32 version, uint16 tile size,
+    // uint16 tile count), the tile indices as uint16, then each tile's pixels row by row.
+    _applyMapTiles(buffer) {
+        const view     = new DataView(buffer);
+        const size     = view.getUint16(2, true);
+        const version  = view.getUint32(4, true);
+        const tileSize = view.getUint16(8, true);
+        const count    = view.getUint16(10, true);
+        const perSide  = Math.ceil(size / tileSize);
+
+        // If the server reports a different map resolution, update to match; only a full map can start it
+        if(!this.mapBuffer || size !== this.mapCanvas.mapSizePixels) {
+            if(count < perSide * perSide) {
+                this.mapVersion = 0;
+                return;
+            }
+            this.mapCanvas.setMapSize(size);
+            this.mapBuffer = new Uint8Array(size * size);
+        }
+
+        let offset = 12 + 2 * count;
+        for(let k = 0; k < count; k++) {
+            const tile = view.getUint16(12 + 2 * k, true);
+            const x    = (tile % perSide) * tileSize;
+            const y    = Math.floor(tile / perSide) * tileSize;
+            const w    = Math.min(tileSize, size - x);
+            const h    = Math.min(tileSize, size - y);
+            for(let row = 0; row < h; row++) {
+                this.mapBuffer.set(new Uint8Array(buffer, offset + row * w, w), (y + row) * size + x);
+            }
+            this.mapCanvas.updateOccupancyGrid(this.mapBuffer, x, y, w, h);
+            offset += w * h;
+        }
+
+        this.mapVersion = version;
+        if(count) this._render();
+    }
+
     async _pathLoop() {
         while(this.isRunning) {
             try {